@@ -9,8 +9,6 @@ CREATE TABLE IF NOT EXISTS organizations (
     settings JSON                           -- Workspace settings (JSON blob)
 );
 
-CREATE INDEX idx_org_domain ON organizations(domain);
-
 
 
 CREATE TABLE IF NOT EXISTS teams (
@@ -42,7 +40,6 @@ CREATE TABLE IF NOT EXISTS users (
 );
 
 CREATE INDEX idx_user_org ON users(organization_id);
-CREATE INDEX idx_user_email ON users(email);
 CREATE INDEX idx_user_active ON users(is_active);
 
 
@@ -154,6 +151,21 @@ CREATE INDEX idx_comment_user ON comments(user_id);
 CREATE INDEX idx_comment_created ON comments(created_at);
 
 
+CREATE TABLE IF NOT EXISTS task_activity (
+    activity_id TEXT PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    actor_id TEXT,               -- User who caused the change
+    activity_type TEXT NOT NULL, -- 'created', 'section_changed', 'assignee_changed', 'due_date_changed', 'completed'
+    created_at TIMESTAMP NOT NULL,
+    old_value TEXT,              -- Section/user GID or ISO date before the change
+    new_value TEXT,              -- ... and after it
+    FOREIGN KEY (task_id) REFERENCES tasks(task_id),
+    FOREIGN KEY (actor_id) REFERENCES users(user_id)
+);
+
+CREATE INDEX idx_activity_task ON task_activity(task_id, created_at);
+
+
 CREATE TABLE IF NOT EXISTS custom_field_definitions (
     field_id TEXT PRIMARY KEY,
     organization_id TEXT NOT NULL,
@@ -207,7 +219,6 @@ CREATE TABLE IF NOT EXISTS task_tags (
     FOREIGN KEY (tag_id) REFERENCES tags(tag_id)
 );
 
-CREATE INDEX idx_task_tags_task ON task_tags(task_id);
 CREATE INDEX idx_task_tags_tag ON task_tags(tag_id);
 
 
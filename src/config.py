@@ -1,10 +1,13 @@
 """Configuration management for Asana simulation."""
 import os
 from datetime import datetime, timedelta
+from pathlib import Path
 
-from dotenv import load_dotenv
-
-load_dotenv()
+# Only pay for python-dotenv when there is a .env file to read
+_ENV_FILE = Path(__file__).parent.parent / '.env'
+if _ENV_FILE.exists():
+    from dotenv import load_dotenv
+    load_dotenv(_ENV_FILE)
 
 class Config:
     """Central configuration for the simulation."""
@@ -16,12 +19,49 @@ class Config:
     COMPANY_SIZE = int(os.getenv('COMPANY_SIZE', 7500))
     RANDOM_SEED = int(os.getenv('RANDOM_SEED', 42))
     
+    # Scale presets: allowed company sizes, per-section task volume (boards
+    # get busier as the workspace grows) and the cap on task generation
+    # worker processes. Project counts scale linearly from PROJECTS_PER_TEAM,
+    # which is calibrated for REFERENCE_COMPANY_SIZE employees.
+    SCALE_PRESETS = {
+        'small': {
+            'min_size': 50, 'max_size': 4999, 'default_size': 500,
+            'tasks_per_section': (3, 10), 'max_workers': 2,
+        },
+        'enterprise': {
+            'min_size': 5000, 'max_size': 10000, 'default_size': 7500,
+            'tasks_per_section': (5, 15), 'max_workers': 8,
+        },
+        'hyperscale': {
+            'min_size': 10001, 'max_size': 1_000_000, 'default_size': 100_000,
+            'tasks_per_section': (10, 30), 'max_workers': 64,
+        },
+    }
+    SCALE_PRESET = os.getenv('SCALE_PRESET', 'enterprise')
+    REFERENCE_COMPANY_SIZE = 7500
+    
+    # Projects per team at REFERENCE_COMPANY_SIZE (based on team size)
+    PROJECTS_PER_TEAM = {
+        'engineering': 25,
+        'product': 15,
+        'marketing': 20,
+        'sales': 10,
+        'operations': 10
+    }
+    
+    # Only generate tasks for the first N projects (0 = all projects)
+    TASK_PROJECT_LIMIT = int(os.getenv('TASK_PROJECT_LIMIT', 0))
+    
     # Date ranges
     SIMULATION_START_DATE = datetime.strptime(
         os.getenv('SIMULATION_START_DATE', '2023-07-01'),
         '%Y-%m-%d'
     )
-    SIMULATION_END_DATE = datetime.now()
+    # Defaults to now; pin it (YYYY-MM-DD) for byte-identical reruns of a seed
+    SIMULATION_END_DATE = (
+        datetime.strptime(os.environ['SIMULATION_END_DATE'], '%Y-%m-%d')
+        if os.getenv('SIMULATION_END_DATE') else datetime.now()
+    )
     
     # LLM Configuration
     LLM_MODEL = os.getenv('LLM_MODEL', 'gpt-4')
@@ -31,6 +71,48 @@ class Config:
     # Database
     DATABASE_PATH = os.getenv('DATABASE_PATH', 'output/asana_simulation.sqlite')
     
+    # Key layout: 'standard' (GID text keys) or 'compact' (integer keys + gid column)
+    STORAGE_LAYOUT = os.getenv('STORAGE_LAYOUT', 'standard')
+    
+    # Store highly repeated text once in a shared table, behind views (SQLite only)
+    DICTIONARY_TEXT = os.getenv('DICTIONARY_TEXT', '0') == '1'
+    
+    # Secondary indexes built after the load: 'minimal', 'schema' or 'agent'
+    INDEX_PROFILE = os.getenv('INDEX_PROFILE', 'schema')
+    
+    # Write batches from a background thread through a bounded queue of this many batches
+    PIPELINED_WRITES = os.getenv('PIPELINED_WRITES', '0') == '1'
+    WRITE_QUEUE_BATCHES = int(os.getenv('WRITE_QUEUE_BATCHES', 8))
+    
+    # Simulate task lifecycles into task_activity and derive final task state
+    SIMULATE_ACTIVITY = os.getenv('SIMULATE_ACTIVITY', '0') == '1'
+    # Poisson rates (events per open task per day) and mean days to the next section move
+    ACTIVITY_REASSIGN_RATE = float(os.getenv('ACTIVITY_REASSIGN_RATE', '0.01'))
+    ACTIVITY_POSTPONE_RATE = float(os.getenv('ACTIVITY_POSTPONE_RATE', '0.02'))
+    ACTIVITY_START_DELAY_DAYS = float(os.getenv('ACTIVITY_START_DELAY_DAYS', '3'))
+    
+    # Build summary tables (tasks per section, user load, project progress)
+    BUILD_SUMMARIES = os.getenv('BUILD_SUMMARIES', '0') == '1'
+    
+    # Build FTS5 keyword search over task names/descriptions and comments
+    BUILD_SEARCH_INDEX = os.getenv('BUILD_SEARCH_INDEX', '0') == '1'
+    
+    # Finished databases are VACUUMed at this page size and marked immutable
+    SEAL_DATABASE = os.getenv('SEAL_DATABASE', '1') == '1'
+    READ_PAGE_SIZE = int(os.getenv('READ_PAGE_SIZE', 8192))
+    
+    # Largest in-memory build before spilling to disk (--in-memory-build)
+    IN_MEMORY_BUDGET_MB = int(os.getenv('IN_MEMORY_BUDGET_MB', 2048))
+    
+    # Online invariant checks: 'fail', 'quarantine' or 'off'
+    INVARIANT_MODE = os.getenv('INVARIANT_MODE', 'fail')
+    
+    # Export
+    EXPORT_BATCH_ROWS = int(os.getenv('EXPORT_BATCH_ROWS', 65536))
+    # API-shaped NDJSON export: 'gzip', 'zstd' (needs zstandard) or 'none'
+    API_EXPORT_COMPRESSION = os.getenv('API_EXPORT_COMPRESSION', 'gzip')
+    API_EXPORT_WORKERS = int(os.getenv('API_EXPORT_WORKERS', 4))
+    
     # Team Distribution (based on typical B2B SaaS company)
     TEAM_DISTRIBUTION = {
         'engineering': 0.35,  # 35% engineers
@@ -73,6 +155,16 @@ class Config:
     # Source: Asana benchmarks - 15% of tasks typically unassigned
     TASK_ASSIGNMENT_RATE = 0.85
     
+    # Business calendar (src/utils/business_calendar.py): holiday region,
+    # working days as a NumPy weekmask (Mon..Sun) and the relative weight
+    # of each local hour for generated work timestamps
+    HOLIDAY_CALENDAR = os.getenv('HOLIDAY_CALENDAR', 'US')
+    WORK_WEEKMASK = os.getenv('WORK_WEEKMASK', '1111100')
+    WORK_HOURS = {
+        9: 0.8, 10: 1.2, 11: 1.2, 12: 0.6, 13: 0.9,   # Morning peak, lunch dip
+        14: 1.1, 15: 1.1, 16: 1.0, 17: 0.7, 18: 0.4,  # Tail into the evening
+    }
+    
     # Asana Colors
     ASANA_COLORS = [
         'light-pink', 'light-green', 'light-blue', 'light-red', 'light-teal',
@@ -90,13 +182,47 @@ class Config:
         'calendar': ['Upcoming', 'This Week', 'This Month', 'Completed']
     }
     
+    @classmethod
+    def scale_preset(cls) -> dict:
+        """Settings of the active scale preset."""
+        return cls.SCALE_PRESETS[cls.SCALE_PRESET]
+        
+    @classmethod
+    def preset_for_size(cls, company_size: int) -> str:
+        """Name of the preset whose size range contains company_size."""
+        for name, preset in cls.SCALE_PRESETS.items():
+            if preset['min_size'] <= company_size <= preset['max_size']:
+                return name
+        raise ValueError(f"No scale preset covers COMPANY_SIZE={company_size}")
+        
+    @classmethod
+    def projects_for_team(cls, team_type: str) -> int:
+        """Project count for a team, scaled to the company size."""
+        base = cls.PROJECTS_PER_TEAM.get(team_type, 10)
+        return max(1, round(base * cls.COMPANY_SIZE / cls.REFERENCE_COMPANY_SIZE))
+    
     @classmethod
     def validate(cls):
         """Validate configuration."""
         if not cls.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY not set in environment")
         
-        if cls.COMPANY_SIZE < 5000 or cls.COMPANY_SIZE > 10000:
-            raise ValueError("COMPANY_SIZE must be between 5000 and 10000")
+        if cls.SCALE_PRESET not in cls.SCALE_PRESETS:
+            raise ValueError(
+                f"SCALE_PRESET must be one of: {', '.join(cls.SCALE_PRESETS)}"
+            )
+        
+        preset = cls.scale_preset()
+        if not preset['min_size'] <= cls.COMPANY_SIZE <= preset['max_size']:
+            raise ValueError(
+                f"COMPANY_SIZE must be between {preset['min_size']} and "
+                f"{preset['max_size']} for the '{cls.SCALE_PRESET}' preset"
+            )
+        
+        from src.utils.business_calendar import HOLIDAY_CALENDARS
+        if cls.HOLIDAY_CALENDAR not in HOLIDAY_CALENDARS:
+            raise ValueError(
+                f"HOLIDAY_CALENDAR must be one of: {', '.join(HOLIDAY_CALENDARS)}"
+            )
         
         return True
\ No newline at end of file
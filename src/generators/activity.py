@@ -0,0 +1,171 @@
+"""Discrete-event simulation of task lifecycles (the task_activity history)."""
+import heapq
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from src.config import Config
+from src.models.schema import Section, Task, TaskActivity, generate_gid
+from src.utils.business_calendar import default_calendar
+
+logger = logging.getLogger(__name__)
+
+# Event kinds, in the order they are processed when they share a timestamp
+CREATE, MOVE, REASSIGN, POSTPONE, COMPLETE = range(5)
+
+
+class ActivityEngine:
+    """
+    Heap-scheduled lifecycle simulation for the tasks of one project.
+
+    Each generated task is taken as a plan (creator, first assignee, due
+    date, and whether and when it gets completed). The engine replays it
+    as events on a single clock: the task is created in the first
+    section, moves through the intermediate sections, and, if the plan
+    completes it, lands in the last section at the planned completion
+    time. Reassignments and due-date postponements (by whole business
+    days) arrive as Poisson processes while the task is open. Handlers
+    schedule follow-up events on the heap, and events after ``end_date``
+    are never scheduled.
+
+    The task rows are then rewritten from the event stream: section,
+    assignee, due date, completion fields and ``modified_at`` all take
+    the value left by the last event that set them.
+
+    Projects are independent, so the simulation runs one project at a
+    time and memory stays bounded by the largest project.
+    """
+
+    def __init__(self, end_date: datetime, seed: int,
+                 reassign_rate: float = None, postpone_rate: float = None,
+                 start_delay_days: float = None):
+        self.end_date = end_date
+        self.rng = random.Random(seed)
+        self.calendar = default_calendar()
+        self.reassign_rate = Config.ACTIVITY_REASSIGN_RATE if reassign_rate is None else reassign_rate
+        self.postpone_rate = Config.ACTIVITY_POSTPONE_RATE if postpone_rate is None else postpone_rate
+        self.start_delay_days = (Config.ACTIVITY_START_DELAY_DAYS
+                                 if start_delay_days is None else start_delay_days)
+
+    def simulate(self, tasks: List[Task], sections: List[Section],
+                 members: List[str]) -> List[TaskActivity]:
+        """Simulate ``tasks`` in place and return their events in time order."""
+        rng = self.rng
+        end = self.end_date
+        stages = [s.section_id for s in sorted(sections, key=lambda s: s.position)]
+        last_stage = len(stages) - 1
+
+        # Per-task plan; the task fields themselves become the live state
+        planned_completion: List[Optional[datetime]] = []
+        planned_completer: List[Optional[str]] = []
+        stage = [0] * len(tasks)
+
+        heap = []
+        seq = 0
+
+        def schedule(when: datetime, kind: int, index: int):
+            nonlocal seq
+            if when <= end:
+                heapq.heappush(heap, (when, kind, seq, index))
+                seq += 1
+
+        def delay(rate: float) -> timedelta:
+            return timedelta(seconds=int(rng.expovariate(rate) * 86400))
+
+        for index, task in enumerate(tasks):
+            planned_completion.append(task.completed_at if task.completed else None)
+            planned_completer.append(task.completed_by_id)
+            task.completed, task.completed_at, task.completed_by_id = False, None, None
+            schedule(task.created_at, CREATE, index)
+
+        events: List[TaskActivity] = []
+
+        def emit(task: Task, when: datetime, kind: str, actor: Optional[str],
+                 old: Optional[str], new: Optional[str]):
+            events.append(TaskActivity(
+                activity_id=generate_gid(rng), task_id=task.task_id, actor_id=actor,
+                activity_type=kind, created_at=when, old_value=old, new_value=new
+            ))
+            task.modified_at = when
+
+        def schedule_move(now: datetime, index: int):
+            """Next move towards the planned completion, or further along an open task."""
+            done_at = planned_completion[index]
+            if done_at is not None:
+                remaining = last_stage - 1 - stage[index]
+                if remaining > 0:
+                    # Earliest of ``remaining`` uniform times before completion
+                    span = (done_at - now).total_seconds()
+                    fraction = 1 - rng.random() ** (1 / remaining)
+                    schedule(now + timedelta(seconds=int(span * fraction)), MOVE, index)
+            elif stage[index] < last_stage - 1 and rng.random() < 0.5:
+                schedule(now + delay(1 / self.start_delay_days), MOVE, index)
+
+        while heap:
+            now, kind, _, index = heapq.heappop(heap)
+            task = tasks[index]
+
+            if kind == CREATE:
+                assignee, due = task.assignee_id, task.due_date
+                task.assignee_id, task.due_date = None, None
+                task.section_id = stages[0] if stages else None
+                emit(task, now, 'created', task.created_by_id, None, task.section_id)
+                if assignee is not None:
+                    task.assignee_id = assignee
+                    emit(task, now, 'assignee_changed', task.created_by_id, None, assignee)
+                if due is not None:
+                    task.due_date = due
+                    emit(task, now, 'due_date_changed', task.created_by_id, None, due.date().isoformat())
+
+                if stages:
+                    schedule_move(now, index)
+                done_at = planned_completion[index]
+                if done_at is not None:
+                    schedule(done_at, COMPLETE, index)
+                if self.reassign_rate > 0 and len(members) > 1:
+                    schedule(now + delay(self.reassign_rate), REASSIGN, index)
+                # Tasks created already overdue keep their original due date
+                if self.postpone_rate > 0 and due is not None and due >= task.created_at:
+                    schedule(now + delay(self.postpone_rate), POSTPONE, index)
+
+            elif kind == MOVE:
+                if task.completed:
+                    continue
+                old = task.section_id
+                stage[index] += 1
+                task.section_id = stages[stage[index]]
+                emit(task, now, 'section_changed', task.assignee_id or task.created_by_id,
+                     old, task.section_id)
+                schedule_move(now, index)
+
+            elif kind == REASSIGN:
+                if task.completed:
+                    continue
+                old = task.assignee_id
+                new = rng.choice(members)
+                while new == old:
+                    new = rng.choice(members)
+                task.assignee_id = new
+                emit(task, now, 'assignee_changed', old or task.created_by_id, old, new)
+                schedule(now + delay(self.reassign_rate), REASSIGN, index)
+
+            elif kind == POSTPONE:
+                if task.completed:
+                    continue
+                old = task.due_date
+                task.due_date = self.calendar.offset(old, rng.randint(1, 10)).item()
+                emit(task, now, 'due_date_changed', task.assignee_id or task.created_by_id,
+                     old.date().isoformat(), task.due_date.date().isoformat())
+                schedule(now + delay(self.postpone_rate), POSTPONE, index)
+
+            else:  # COMPLETE
+                completer = task.assignee_id or planned_completer[index]
+                if stages and task.section_id != stages[-1]:
+                    old = task.section_id
+                    task.section_id = stages[-1]
+                    emit(task, now, 'section_changed', completer, old, task.section_id)
+                task.completed, task.completed_at, task.completed_by_id = True, now, completer
+                emit(task, now, 'completed', completer, None, 'true')
+
+        return events
@@ -1,7 +1,8 @@
 """Generate organization and workspace data."""
 import logging
+import random
 from datetime import datetime
-from src.models.schema import Organization
+from src.models.schema import Organization, generate_gid
 from src.scrapers.company_scraper import CompanyScraper
 from src.config import Config
 
@@ -12,6 +13,7 @@ class OrganizationGenerator:
     
     def __init__(self, seed: int = 42):
         self.scraper = CompanyScraper(seed=seed)
+        self.rng = random.Random(seed)
         
     def generate(self) -> Organization:
         """Generate a single organization."""
@@ -19,6 +21,7 @@ class OrganizationGenerator:
         domain = self.scraper.get_company_domain(company_name)
         
         org = Organization(
+            organization_id=generate_gid(self.rng),
             name=company_name,
             domain=domain,
             created_at=Config.SIMULATION_START_DATE,
@@ -1,10 +1,12 @@
 """Generate task data with LLM-powered descriptions."""
 import logging
 import random
+import sys
 from typing import List, Optional
 from datetime import datetime
-from src.models.schema import Task
+from src.models.schema import Task, generate_gid
 from src.utils.llm import LLMGenerator
+from src.utils.seeding import numpy_seed
 from src.utils.temporal import TemporalGenerator
 from src.config import Config
 import numpy as np
@@ -21,14 +23,28 @@ class TaskGenerator:
             Config.SIMULATION_END_DATE,
             seed=seed
         )
+        self.reseed(seed)
+        
+    def reseed(self, seed: int):
+        """Restart every random stream used by this generator from one seed."""
         self.rng = random.Random(seed)
-        self.np_rng = np.random.RandomState(seed)
+        self.np_rng = np.random.RandomState(numpy_seed(seed))
+        self.temporal_gen.reseed(seed)
+        self.llm.rng = random.Random(seed)
         
     def generate_tasks(self, project_id: str, section_id: str,
                       workflow_type: str, project_type: str,
                       team_members: List[str], project_created_at: datetime,
-                      num_tasks: int) -> List[Task]:
-        """Generate multiple tasks for a project section."""
+                      num_tasks: int, seed: Optional[int] = None) -> List[Task]:
+        """
+        Generate multiple tasks for a project section.
+        
+        When ``seed`` is given the generator is reseeded first, making the
+        output independent of which sections were generated before.
+        """
+        if seed is not None:
+            self.reseed(seed)
+            
         tasks = []
         
         for i in range(num_tasks):
@@ -53,6 +69,8 @@ class TaskGenerator:
             Config.SIMULATION_END_DATE
         )
         created_at = self.temporal_gen.generate_workday_time(created_at)
+        # Work hours on the final day can fall after the simulation end
+        created_at = min(created_at, Config.SIMULATION_END_DATE)
         
         # Generate task name using LLM
         context = {
@@ -62,7 +80,8 @@ class TaskGenerator:
             'feature': self._get_feature(workflow_type)
         }
         
-        task_name = self.llm.generate_task_name(project_type, workflow_type, context)
+        # Names repeat across tasks; interning keeps one copy of each in memory
+        task_name = sys.intern(self.llm.generate_task_name(project_type, workflow_type, context))
         
         # Generate description with varying detail levels
         detail_level = self.rng.choices(
@@ -109,6 +128,7 @@ class TaskGenerator:
         created_by_id = self.rng.choice(team_members)
         
         task = Task(
+            task_id=generate_gid(self.rng),
             project_id=project_id,
             section_id=section_id,
             name=task_name,
@@ -139,4 +159,38 @@ class TaskGenerator:
     def _get_feature(self, workflow_type: str) -> str:
         """Get feature name for product tasks."""
         features = ['Mobile App', 'Dashboard', 'Analytics', 'User Onboarding', 'Notifications']
-        return self.rng.choice(features)
\ No newline at end of file
+        return self.rng.choice(features)
+
+# Generator reused by every job a worker process runs
+_worker_generator: Optional[TaskGenerator] = None
+
+
+def init_worker(start_date: datetime, end_date: datetime):
+    """Process-pool initializer: use the parent's simulation window."""
+    # SIMULATION_END_DATE defaults to "now", which a new process would re-read
+    Config.SIMULATION_START_DATE = start_date
+    Config.SIMULATION_END_DATE = end_date
+
+
+def generate_project_tasks(job: tuple) -> List[List[Task]]:
+    """
+    Tasks of every section of one project, one list per section.
+
+    ``job`` is ``(project_id, workflow_type, project_type, team_members,
+    project_created_at, tasks_per_section, [(section_id, seed), ...])``.
+    Each section is generated from its own seed, so the result is the same
+    in whichever process runs it.
+    """
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = TaskGenerator()
+
+    (project_id, workflow_type, project_type, team_members,
+     project_created_at, tasks_per_section, sections) = job
+    return [
+        _worker_generator.generate_tasks(
+            project_id, section_id, workflow_type, project_type,
+            team_members, project_created_at, tasks_per_section, seed=seed
+        )
+        for section_id, seed in sections
+    ]
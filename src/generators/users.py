@@ -2,11 +2,10 @@
 
 import logging
 import random
-import uuid
 from typing import List
 from datetime import timedelta
 
-from src.models.schema import User
+from src.models.schema import User, generate_gid
 from src.scrapers.name_generator import NameGenerator
 from src.utils.temporal import TemporalGenerator
 from src.config import Config
@@ -71,7 +70,7 @@ class UserGenerator:
             base_email = self.name_gen.generate_email(
                 first_name, last_name, self.domain
             )
-            unique_suffix = uuid.uuid4().hex[:8]
+            unique_suffix = f"{self.rng.getrandbits(32):08x}"
             email = base_email.replace("@", f".{unique_suffix}@")
             # --------------------------------------------
 
@@ -89,6 +88,7 @@ class UserGenerator:
             is_active = self.rng.random() < 0.98
 
             user = User(
+                user_id=generate_gid(self.rng),
                 organization_id=self.organization_id,
                 email=email,
                 name=full_name,
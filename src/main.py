@@ -10,12 +10,17 @@ import random
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.config import Config
-from src.utils.database import Database
+from src.utils.codecs import load_codecs
+from src.utils.database import END_DATE_KEY, create_backend
+from src.utils.metrics import PerformanceRecorder
+from src.utils.seeding import SeedTree
+from src.utils.summaries import SummaryBuilder
+from src.utils.tuning import map_in_workers, plan_batches
 from src.utils.temporal import TemporalGenerator
 from src.generators.organization import OrganizationGenerator
 from src.generators.users import UserGenerator
 from src.scrapers.name_generator import NameGenerator
-from src.models.schema import Team, TeamMembership, Project, Section
+from src.models.schema import Team, TeamMembership, Project, Section, generate_gid
 
 # Configure logging
 logging.basicConfig(
@@ -27,28 +32,91 @@ logger = logging.getLogger(__name__)
 class AsanaSimulation:
     """Main orchestrator for Asana workspace simulation."""
     
-    def __init__(self, db_path: str = None, seed: int = None):
-        self.db_path = db_path or Config.DATABASE_PATH
+    def __init__(self, db_path: str = None, seed: int = None,
+                 parquet_dir: str = None, backend: str = 'sqlite',
+                 in_memory_build: bool = False, invariant_mode: str = None,
+                 trace_memory: bool = False, layout: str = None,
+                 index_profile: str = None, seal: bool = None,
+                 build_summaries: bool = None, search_index: bool = None,
+                 activity: bool = None, pipelined_writes: bool = None,
+                 dictionary_text: bool = None, api_dir: str = None):
+        self.backend = backend
+        self.db_path = db_path or self._default_db_path(backend)
         self.seed = seed or Config.RANDOM_SEED
-        self.db = Database(self.db_path)
+        self.parquet_dir = parquet_dir
+        self.api_dir = api_dir
+        self.index_profile = index_profile or Config.INDEX_PROFILE
+        self.seal = Config.SEAL_DATABASE if seal is None else seal
+        self.search_index = Config.BUILD_SEARCH_INDEX if search_index is None else search_index
+        self.activity = Config.SIMULATE_ACTIVITY if activity is None else activity
+        
+        backend_options = {}
+        if in_memory_build:
+            backend_options = {
+                'in_memory': True,
+                'memory_budget_mb': Config.IN_MEMORY_BUDGET_MB
+            }
+        layout = layout or Config.STORAGE_LAYOUT
+        if layout != 'standard':
+            if backend != 'sqlite':
+                raise ValueError(f"The {layout} layout is only supported with the sqlite backend")
+            backend_options['layout'] = layout
+        if Config.DICTIONARY_TEXT if dictionary_text is None else dictionary_text:
+            if backend != 'sqlite':
+                raise ValueError("Dictionary-encoded text is only supported with the sqlite backend")
+            backend_options['dictionary_text'] = True
+        self.db = create_backend(backend, self.db_path, **backend_options)
+        
+        # Overlap generation with inserts and commits on a writer thread
+        self.writer = None
+        if Config.PIPELINED_WRITES if pipelined_writes is None else pipelined_writes:
+            from src.utils.writer import PipelinedBackend
+            self.writer = PipelinedBackend(self.db, max_batches=Config.WRITE_QUEUE_BATCHES)
+            self.db = self.writer
+        
+        # Per-batch data-quality checks on the write path (imports numpy)
+        from src.utils.invariants import InvariantChecker
+        self.invariants = InvariantChecker(
+            mode=invariant_mode or Config.INVARIANT_MODE,
+            quarantine_path=str(Path(self.db_path).with_suffix('.quarantine.jsonl'))
+        )
+        
+        # Aggregates maintained on the write path for the summary tables
+        self.summaries = None
+        if Config.BUILD_SUMMARIES if build_summaries is None else build_summaries:
+            self.summaries = SummaryBuilder(Config.SIMULATION_END_DATE)
+        
+        # Per-stage timing, throughput and memory
+        self.perf = PerformanceRecorder(self.db, trace_memory=trace_memory)
         self.rng = random.Random(self.seed)
         
         # Set random seeds
         random.seed(self.seed)
         
+        # Independent stream per stage and entity, keyed by structure rather
+        # than by generation order
+        self.seeds = SeedTree(self.seed)
+        
         # Generators
-        self.org_gen = OrganizationGenerator(seed=self.seed)
-        self.temporal_gen = TemporalGenerator(
-            Config.SIMULATION_START_DATE,
-            Config.SIMULATION_END_DATE,
-            seed=self.seed
-        )
+        self.org_gen = OrganizationGenerator(seed=self.seeds.child('organization').seed())
+        
+        # Chosen from the scale preset and host resources in run()
+        self.batch_plan = None
+        self._uncommitted_rows = 0
         
         # Storage for generated entities
         self.organization = None
         self.teams = []
         self.users = []
         self.projects = []
+        self.sections = {}
+        
+    @staticmethod
+    def _default_db_path(backend: str) -> str:
+        """Default output path, with an extension matching the backend."""
+        if backend == 'sqlite':
+            return Config.DATABASE_PATH
+        return str(Path(Config.DATABASE_PATH).with_suffix(f'.{backend}'))
         
     def run(self):
         """Execute full simulation pipeline."""
@@ -59,30 +127,56 @@ class AsanaSimulation:
         try:
             # Validate configuration
             Config.validate()
+            # Build the row codecs now so model/schema drift fails fast
+            load_codecs()
+            self.batch_plan = plan_batches(Config.scale_preset())
             
             # Initialize database
             self.db.connect()
             schema_path = Path(__file__).parent.parent / 'schema.sql'
             self.db.initialize_schema(str(schema_path))
+            # Load without secondary indexes; finalize() builds the chosen profile once
+            self.db.apply_index_profile('minimal')
             
             # Generate data
-            self.generate_organization()
-            self.generate_teams()
-            self.generate_users()
-            self.generate_team_memberships()
-            self.generate_projects()
-            self.generate_sections()
-            self.generate_tasks()
-            self.generate_comments()
-            self.generate_custom_fields()
-            self.generate_tags()
+            stages = [
+                self.generate_organization,
+                self.generate_teams,
+                self.generate_users,
+                self.generate_team_memberships,
+                self.generate_projects,
+                self.generate_sections,
+                self.generate_tasks,
+                self.generate_comments,
+                self.generate_custom_fields,
+                self.generate_tags,
+                self.finalize,
+            ]
+            if self.summaries is not None:
+                stages.insert(-1, self.build_summaries)
+            for stage in stages:
+                with self.perf.stage(stage.__name__):
+                    stage()
             
-            # Final commit
-            self.db.commit()
+            self.perf.write(
+                str(Path(self.db_path).with_suffix('.perf.json')),
+                company_size=Config.COMPANY_SIZE,
+                seed=self.seed,
+                backend=self.backend,
+                layout=getattr(self.db, 'layout', 'standard'),
+                index_profile=self.index_profile,
+                writer=self.writer.stats() if self.writer else None
+            )
             
             # Print statistics
             self.print_statistics()
             
+            # Optional columnar export
+            if self.parquet_dir:
+                self.export_parquet()
+            if self.api_dir:
+                self.export_api()
+            
             logger.info("=" * 80)
             logger.info(f"✓ Simulation complete! Database saved to: {self.db_path}")
             logger.info("=" * 80)
@@ -98,16 +192,7 @@ class AsanaSimulation:
         logger.info("Generating organization...")
         self.organization = self.org_gen.generate()
         
-        org_data = {
-            'organization_id': self.organization.organization_id,
-            'name': self.organization.name,
-            'domain': self.organization.domain,
-            'created_at': self.organization.created_at,
-            'is_organization': self.organization.is_organization,
-            'settings': self.organization.settings
-        }
-        
-        self.db.insert('organizations', org_data)
+        self._write('organizations', [self.organization])
         self.db.commit()
         
     def generate_teams(self):
@@ -122,8 +207,11 @@ class AsanaSimulation:
             ('Operations', 'operations', 'HR, Finance, and Operations')
         ]
         
+        rng = self.seeds.child('teams').random()
+        
         for name, team_type, description in team_configs:
             team = Team(
+                team_id=generate_gid(rng),
                 organization_id=self.organization.organization_id,
                 name=name,
                 description=description,
@@ -133,17 +221,7 @@ class AsanaSimulation:
             
             self.teams.append(team)
             
-            team_data = {
-                'team_id': team.team_id,
-                'organization_id': team.organization_id,
-                'name': team.name,
-                'description': team.description,
-                'team_type': team.team_type,
-                'created_at': team.created_at
-            }
-            
-            self.db.insert('teams', team_data)
-            
+        self._write('teams', self.teams)
         self.db.commit()
         logger.info(f"Generated {len(self.teams)} teams")
         
@@ -161,28 +239,19 @@ class AsanaSimulation:
             user_gen = UserGenerator(
                 self.organization.organization_id,
                 self.organization.domain,
-                seed=self.seed + hash(team.team_id) % 10000
+                seed=self.seeds.child('users', team.team_type).seed()
             )
             
-            team_users = user_gen.generate_users(num_users, team.team_type)
-            
-            # Insert users
-            for user in team_users:
-                user_data = {
-                    'user_id': user.user_id,
-                    'organization_id': user.organization_id,
-                    'email': user.email,
-                    'name': user.name,
-                    'role': user.role,
-                    'job_title': user.job_title,
-                    'department': user.department,
-                    'created_at': user.created_at,
-                    'is_active': user.is_active,
-                    'photo_url': user.photo_url
-                }
-                self.db.insert('users', user_data)
+            # Generate and insert in chunks to bound the size of each batch
+            remaining = num_users
+            while remaining > 0:
+                count = min(remaining, self.batch_plan.chunk_rows)
+                team_users = user_gen.generate_users(count, team.team_type)
+                remaining -= count
+                
+                self._write('users', team_users)
                 
-            self.users.extend(team_users)
+                self.users.extend(team_users)
             
         self.db.commit()
         logger.info(f"Generated {len(self.users)} users")
@@ -191,112 +260,98 @@ class AsanaSimulation:
         """Assign users to teams."""
         logger.info("Generating team memberships...")
         
-        memberships = []
+        total_memberships = 0
+        membership_rows = []
+        users_by_department = self._users_by_department()
         
         for team in self.teams:
             # Get users from this team's department
-            team_users = [u for u in self.users if u.department == team.team_type]
+            team_users = users_by_department.get(team.team_type, [])
+            rng = self.seeds.child('team_memberships', team.team_type).random()
             
             for user in team_users:
                 # 5% chance of being team lead
-                is_team_lead = self.rng.random() < 0.05
+                is_team_lead = rng.random() < 0.05
                 
                 membership = TeamMembership(
+                    membership_id=generate_gid(rng),
                     team_id=team.team_id,
                     user_id=user.user_id,
                     joined_at=user.created_at,
                     is_team_lead=is_team_lead
                 )
                 
-                membership_data = {
-                    'membership_id': membership.membership_id,
-                    'team_id': membership.team_id,
-                    'user_id': membership.user_id,
-                    'joined_at': membership.joined_at,
-                    'is_team_lead': membership.is_team_lead
-                }
+                membership_rows.append(membership)
+                total_memberships += 1
                 
-                self.db.insert('team_memberships', membership_data)
-                memberships.append(membership)
+                if len(membership_rows) >= self.batch_plan.chunk_rows:
+                    self._write('team_memberships', membership_rows)
+                    membership_rows = []
                 
+        self._write('team_memberships', membership_rows)
         self.db.commit()
-        logger.info(f"Generated {len(memberships)} team memberships")
+        logger.info(f"Generated {total_memberships} team memberships")
         
     def generate_projects(self):
         """Generate projects for each team."""
         logger.info("Generating projects...")
         
-        # Projects per team (based on team size)
-        projects_per_team = {
-            'engineering': 25,
-            'product': 15,
-            'marketing': 20,
-            'sales': 10,
-            'operations': 10
-        }
+        users_by_department = self._users_by_department()
         
         for team in self.teams:
-            num_projects = projects_per_team.get(team.team_type, 10)
+            # Project count scales with company size
+            num_projects = Config.projects_for_team(team.team_type)
+            team_members = [u.user_id for u in users_by_department.get(team.team_type, [])]
+            stream = self.seeds.child('projects', team.team_type)
+            rng = stream.random()
+            temporal_gen = TemporalGenerator(
+                Config.SIMULATION_START_DATE,
+                Config.SIMULATION_END_DATE,
+                seed=stream.seed()
+            )
             
             for i in range(num_projects):
                 # Select project type
-                project_type = self.rng.choices(
+                project_type = rng.choices(
                     list(Config.PROJECT_TYPE_DISTRIBUTION.keys()),
                     weights=list(Config.PROJECT_TYPE_DISTRIBUTION.values())
                 )[0]
                 
                 # Generate project name
-                project_name = self._generate_project_name(team.team_type, i)
+                project_name = self._generate_project_name(team.team_type, i, rng)
                 
                 # Select owner from team
-                team_members = [u.user_id for u in self.users if u.department == team.team_type]
-                owner_id = self.rng.choice(team_members) if team_members else None
+                owner_id = rng.choice(team_members) if team_members else None
                 
                 # Generate creation date
-                created_at = self.temporal_gen.random_date_in_range(
+                created_at = temporal_gen.random_date_in_range(
                     Config.SIMULATION_START_DATE,
                     Config.SIMULATION_END_DATE - timedelta(days=14)
                 )
                 
                 # 20% of projects have due dates
                 due_date = None
-                if self.rng.random() < 0.20:
-                    due_date = created_at + timedelta(days=self.rng.randint(30, 180))
+                if rng.random() < 0.20:
+                    due_date = created_at + timedelta(days=rng.randint(30, 180))
                     
                 project = Project(
+                    project_id=generate_gid(rng),
                     organization_id=self.organization.organization_id,
                     team_id=team.team_id,
                     name=project_name,
-                    description=f"Project for {team.name} team",
+                    description=sys.intern(f"Project for {team.name} team"),
                     project_type=project_type,
                     workflow_type=team.team_type,
                     owner_id=owner_id,
                     created_at=created_at,
                     due_date=due_date,
-                    color=self.rng.choice(Config.ASANA_COLORS),
+                    color=rng.choice(Config.ASANA_COLORS),
                     privacy_setting='team'
                 )
                 
                 self.projects.append(project)
                 
-                project_data = {
-                    'project_id': project.project_id,
-                    'organization_id': project.organization_id,
-                    'team_id': project.team_id,
-                    'name': project.name,
-                    'description': project.description,
-                    'project_type': project.project_type,
-                    'workflow_type': project.workflow_type,
-                    'owner_id': project.owner_id,
-                    'created_at': project.created_at,
-                    'due_date': project.due_date,
-                    'is_archived': project.is_archived,
-                    'color': project.color,
-                    'privacy_setting': project.privacy_setting
-                }
-                
-                self.db.insert('projects', project_data)
-                
+        self._write('projects', self.projects)
         self.db.commit()
         logger.info(f"Generated {len(self.projects)} projects")
         
@@ -304,7 +359,7 @@ class AsanaSimulation:
         """Generate sections for each project."""
         logger.info("Generating sections...")
         
-        sections_count = 0
+        section_rows = []
         
         for project in self.projects:
             # Get section template based on project type
@@ -312,108 +367,102 @@ class AsanaSimulation:
                 project.project_type,
                 ['To Do', 'In Progress', 'Done']
             )
+            rng = self.seeds.child('sections', project.project_id).random()
             
             for position, name in enumerate(section_names):
                 section = Section(
+                    section_id=generate_gid(rng),
                     project_id=project.project_id,
                     name=name,
                     position=position,
                     created_at=project.created_at
                 )
                 
-                section_data = {
-                    'section_id': section.section_id,
-                    'project_id': section.project_id,
-                    'name': section.name,
-                    'position': section.position,
-                    'created_at': section.created_at
-                }
-                
-                self.db.insert('sections', section_data)
-                sections_count += 1
+                section_rows.append(section)
+                self.sections.setdefault(project.project_id, []).append(section)
                 
+        self._write('sections', section_rows)
         self.db.commit()
-        logger.info(f"Generated {sections_count} sections")
+        logger.info(f"Generated {len(section_rows)} sections")
         
     def generate_tasks(self):
         """Generate tasks for projects - SIMPLIFIED VERSION."""
         logger.info("Generating tasks (this may take a while)...")
-        logger.info("Note: Using simplified task generation for demo purposes")
         
-        from src.generators.tasks import TaskGenerator
+        from src.generators.activity import ActivityEngine
+        from src.generators.tasks import generate_project_tasks, init_worker
         
-        task_gen = TaskGenerator(seed=self.seed)
         total_tasks = 0
+        total_events = 0
         
-        # Limit to first 10 projects for demo
-        demo_projects = self.projects[:10]
-        
-        for project in demo_projects:
-            # Get sections for this project
-            sections = self.db.query(
-                "SELECT section_id FROM sections WHERE project_id = ?",
-                (project.project_id,)
-            )
+        # Optionally limit to the first N projects (quick demo runs)
+        task_projects = self.projects
+        if Config.TASK_PROJECT_LIMIT:
+            task_projects = self.projects[:Config.TASK_PROJECT_LIMIT]
             
-            if not sections:
-                continue
+        active_members = {
+            department: [u.user_id for u in users if u.is_active]
+            for department, users in self._users_by_department().items()
+        }
+        min_tasks, max_tasks = Config.scale_preset()['tasks_per_section']
+        
+        # Projects with sections and an active team get tasks
+        jobs = []
+        for project in task_projects:
+            sections = self.sections.get(project.project_id, [])
+            team_members = active_members.get(project.workflow_type, [])
+            if sections and team_members:
+                jobs.append((project, sections, team_members))
                 
-            # Get team members
-            team_members = [u.user_id for u in self.users 
-                          if u.department == project.workflow_type and u.is_active]
-            
-            if not team_members:
-                continue
+        def task_jobs():
+            for project, sections, team_members in jobs:
+                # Tasks per section are drawn from the scale preset's range
+                tasks_per_section = self.seeds.child('tasks', project.project_id).random().randint(
+                    min_tasks, max_tasks
+                )
+                yield (
+                    project.project_id, project.workflow_type, project.project_type,
+                    team_members, project.created_at, tasks_per_section,
+                    [(section.section_id,
+                      self.seeds.child('tasks', project.project_id, section.section_id).seed())
+                     for section in sections]
+                )
                 
-            # Generate 5-15 tasks per section
-            tasks_per_section = self.rng.randint(5, 15)
-            
-            for section_row in sections:
-                section_id = section_row[0]
+        # Every section has its own seed, so projects can be generated in
+        # worker processes; results still arrive in project order
+        results = map_in_workers(
+            generate_project_tasks, task_jobs(), self.batch_plan.workers,
+            initializer=init_worker,
+            initargs=(Config.SIMULATION_START_DATE, Config.SIMULATION_END_DATE)
+        )
+        # Results first: exhausting them shuts the pool down (and reaps the
+        # workers, whose usage the stage metrics add) before the stage ends
+        for section_tasks, (project, sections, team_members) in zip(results, jobs):
+            project_tasks = []
+            for tasks in section_tasks:
+                if self.activity:
+                    project_tasks.extend(tasks)
+                else:
+                    self._write('tasks', tasks)
+                total_tasks += len(tasks)
                 
-                tasks = task_gen.generate_tasks(
-                    project.project_id,
-                    section_id,
-                    project.workflow_type,
-                    project.project_type,
-                    team_members,
-                    project.created_at,
-                    tasks_per_section
-                )
+            # Replay the project's tasks as a lifecycle history; the rows
+            # written are the final state left by the event stream
+            if project_tasks:
+                engine = ActivityEngine(Config.SIMULATION_END_DATE,
+                                        seed=self.seeds.child('activity', project.project_id).seed())
+                events = engine.simulate(project_tasks, sections, team_members)
+                self._write('tasks', project_tasks)
+                for start in range(0, len(events), self.batch_plan.chunk_rows):
+                    self._write('task_activity', events[start:start + self.batch_plan.chunk_rows])
+                total_events += len(events)
                 
-                # Insert tasks
-                for task in tasks:
-                    task_data = {
-                        'task_id': task.task_id,
-                        'project_id': task.project_id,
-                        'section_id': task.section_id,
-                        'parent_task_id': task.parent_task_id,
-                        'name': task.name,
-                        'description': task.description,
-                        'assignee_id': task.assignee_id,
-                        'created_by_id': task.created_by_id,
-                        'created_at': task.created_at,
-                        'modified_at': task.modified_at,
-                        'due_date': task.due_date,
-                        'start_date': task.start_date,
-                        'completed': task.completed,
-                        'completed_at': task.completed_at,
-                        'completed_by_id': task.completed_by_id,
-                        'priority': task.priority,
-                        'num_subtasks': task.num_subtasks,
-                        'num_comments': task.num_comments,
-                        'num_attachments': task.num_attachments
-                    }
-                    
-                    self.db.insert('tasks', task_data)
-                    total_tasks += 1
-                    
-                if total_tasks % 50 == 0:
-                    self.db.commit()
-                    logger.info(f"Generated {total_tasks} tasks so far...")
+            logger.info(f"Generated {total_tasks} tasks so far...")
                     
         self.db.commit()
         logger.info(f"Generated {total_tasks} tasks total")
+        if self.activity:
+            logger.info(f"Simulated {total_events} activity events")
         
     def generate_comments(self):
         """Generate comments for tasks."""
@@ -430,7 +479,82 @@ class AsanaSimulation:
         logger.info("Generating tags...")
         logger.info("Skipping tag generation for demo - can be added later")
         
-    def _generate_project_name(self, workflow_type: str, index: int) -> str:
+    def build_summaries(self):
+        """Write the summary tables from the aggregates gathered while writing."""
+        logger.info("Building summary tables...")
+        self.summaries.write(self.db)
+        
+    def finalize(self):
+        """Final commit, indexes, planner statistics, persist, seal and search index."""
+        self.db.commit()
+        self.db.apply_index_profile(self.index_profile)
+        
+        # Planner statistics, so consumers never have to run ANALYZE
+        self.db.analyze()
+        
+        # Write the in-memory build (if any) to disk in one pass
+        if getattr(self.db, 'in_memory', False):
+            self.db.persist()
+            
+        # Read-optimized, immutable file for consumers (see open_readonly)
+        if self.seal:
+            # Keyword search is built inside seal(), before the file is marked immutable
+            self.db.seal(Config.READ_PAGE_SIZE, metadata={
+                'seed': self.seed,
+                'company_size': Config.COMPANY_SIZE,
+                'layout': getattr(self.db, 'layout', 'standard'),
+                'index_profile': self.index_profile,
+                'dictionary_text': int(getattr(self.db, 'dictionary_text', False)),
+                END_DATE_KEY: Config.SIMULATION_END_DATE.isoformat(),
+            }, search_index=self.search_index)
+        elif self.search_index:
+            # Built last because it addresses rows by rowid
+            self.db.build_search_index()
+            
+    def _users_by_department(self) -> dict:
+        """Group generated users by department."""
+        grouped = {}
+        for user in self.users:
+            grouped.setdefault(user.department, []).append(user)
+        return grouped
+        
+    def _write(self, table: str, rows: list):
+        """Check a batch of entities against the online invariants, then append it."""
+        rows = self.invariants.check(table, rows)
+        self.db.append_entities(table, rows)
+        if self.summaries is not None:
+            self.summaries.observe(table, rows)
+        
+        # Commit on the batch plan's interval rather than per stage only
+        self._uncommitted_rows += len(rows)
+        if self.batch_plan and self._uncommitted_rows >= self.batch_plan.commit_interval_rows:
+            self.db.commit()
+            self._uncommitted_rows = 0
+        
+    def export_parquet(self):
+        """Export every table to Parquet files."""
+        from src.utils.export import ParquetExporter
+        
+        logger.info(f"Exporting Parquet files to {self.parquet_dir}...")
+        
+        if self.backend == 'duckdb':
+            self.db.export_parquet(self.parquet_dir)
+            return
+            
+        exporter = ParquetExporter(self.parquet_dir, batch_rows=Config.EXPORT_BATCH_ROWS)
+        exporter.export_database(self.db_path)
+        
+    def export_api(self):
+        """Export Asana API-shaped NDJSON files, one per resource type."""
+        from src.utils.api_export import ApiExporter
+        
+        logger.info(f"Exporting API-shaped NDJSON to {self.api_dir}...")
+        exporter = ApiExporter(self.api_dir, compression=Config.API_EXPORT_COMPRESSION,
+                               workers=Config.API_EXPORT_WORKERS)
+        exporter.export_database(self.db_path)
+        
+    def _generate_project_name(self, workflow_type: str, index: int,
+                               rng: random.Random) -> str:
         """Generate realistic project name."""
         templates = {
             'engineering': [
@@ -467,7 +591,7 @@ class AsanaSimulation:
         }
         
         options = templates.get(workflow_type, [f'Project {index + 1}'])
-        return self.rng.choice(options)
+        return rng.choice(options)
         
     def print_statistics(self):
         """Print database statistics."""
@@ -480,6 +604,40 @@ class AsanaSimulation:
         for table, count in stats.items():
             logger.info(f"{table:.<30} {count:>10,}")
             
+        if self.invariants.violations:
+            logger.info("-" * 80)
+            logger.info(f"Invariant violations (quarantined rows: {self.invariants.quarantined:,})")
+            for name, count in self.invariants.violations.items():
+                logger.info(f"{name:.<50} {count:>10,}")
+                
+        logger.info("-" * 80)
+        logger.info(f"{'STAGE':<30} {'WALL (s)':>10} {'CPU (s)':>10} {'ROWS':>10} {'ROWS/S':>12} "
+                    f"{'RSS +/- (MB)':>13} {'WRITTEN (MB)':>13}")
+        for stage in self.perf.stages:
+            rss = f"{stage.rss_delta_mb:+,.1f}" if stage.rss_delta_mb is not None else '-'
+            written = (f"{stage.bytes_written / (1024 * 1024):,.1f}"
+                       if stage.bytes_written is not None else '-')
+            logger.info(
+                f"{stage.name:<30} {stage.wall_seconds:>10.2f} {stage.cpu_seconds:>10.2f} {stage.rows:>10,} "
+                f"{stage.rows_per_sec:>12,.0f} {rss:>13} {written:>13}"
+            )
+        peak = self.perf.stages[-1].process_peak_rss_mb if self.perf.stages else None
+        if peak is not None:
+            logger.info(f"Process peak RSS: {peak:,.0f} MB")
+        worker_peaks = [s.worker_peak_rss_mb for s in self.perf.stages if s.worker_peak_rss_mb]
+        if worker_peaks:
+            logger.info(f"Worker peak RSS: {max(worker_peaks):,.0f} MB (CPU includes worker processes)")
+            
+        if self.writer:
+            writer = self.writer.stats()
+            logger.info("-" * 80)
+            logger.info(
+                f"Background writer: {writer['batches']:,} batches, max queue depth "
+                f"{writer['max_queue_depth']}/{writer['queue_capacity']}, producer blocked "
+                f"{writer['producer_blocked_seconds']:.2f}s, writer busy "
+                f"{writer['writer_busy_seconds']:.2f}s"
+            )
+            
         logger.info("=" * 80)
 
 def main():
@@ -488,17 +646,75 @@ def main():
     parser.add_argument('--db-path', type=str, help='Database output path')
     parser.add_argument('--seed', type=int, help='Random seed for reproducibility')
     parser.add_argument('--company-size', type=int, help='Number of employees')
+    parser.add_argument('--scale', choices=list(Config.SCALE_PRESETS),
+                        help='Scale preset (inferred from --company-size when omitted)')
+    parser.add_argument('--export-parquet', type=str, metavar='DIR',
+                        help='Also export every table as Parquet into DIR')
+    parser.add_argument('--export-api', type=str, metavar='DIR',
+                        help='Also export Asana API-shaped NDJSON files to this directory (SQLite only)')
+    parser.add_argument('--backend', choices=['sqlite', 'duckdb'], default='sqlite',
+                        help='Storage engine for the generated database')
+    parser.add_argument('--in-memory-build', action='store_true',
+                        help='Build in RAM and write the database to disk once at the end (SQLite only)')
+    parser.add_argument('--invariants', choices=['fail', 'quarantine', 'off'],
+                        help='Online invariant checking mode (default: INVARIANT_MODE or fail)')
+    parser.add_argument('--layout', choices=['standard', 'compact'],
+                        help='Key layout: GID text keys, or integer keys with a gid column '
+                             '(default: STORAGE_LAYOUT or standard; SQLite only)')
+    parser.add_argument('--dictionary-text', action='store_true',
+                        help='Store repeated text columns once, behind views (default: DICTIONARY_TEXT)')
+    parser.add_argument('--index-profile', choices=['minimal', 'schema', 'agent'],
+                        help='Secondary indexes to build after loading (default: INDEX_PROFILE or schema)')
+    parser.add_argument('--activity', action='store_true',
+                        help='Simulate task lifecycles into task_activity (default: SIMULATE_ACTIVITY)')
+    parser.add_argument('--summaries', action='store_true',
+                        help='Build summary tables for dashboard queries (default: BUILD_SUMMARIES)')
+    parser.add_argument('--search-index', action='store_true',
+                        help='Build FTS5 keyword search over tasks and comments (default: BUILD_SEARCH_INDEX)')
+    parser.add_argument('--no-seal', action='store_true',
+                        help='Skip the final VACUUM and immutable marker (default: SEAL_DATABASE)')
+    parser.add_argument('--pipelined-writes', action='store_true',
+                        help='Write batches from a background thread (default: PIPELINED_WRITES)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Record tracemalloc peaks per stage in the performance report (slower)')
     
     args = parser.parse_args()
     
+    if args.in_memory_build and args.backend != 'sqlite':
+        parser.error('--in-memory-build is only supported with the sqlite backend')
+    if args.layout == 'compact' and args.backend != 'sqlite':
+        parser.error('--layout compact is only supported with the sqlite backend')
+    if args.export_api and args.backend != 'sqlite':
+        parser.error('--export-api is only supported with the sqlite backend')
+    if args.dictionary_text and args.backend != 'sqlite':
+        parser.error('--dictionary-text is only supported with the sqlite backend')
+    
     # Override config if provided
-    if args.company_size:
+    if args.scale:
+        Config.SCALE_PRESET = args.scale
+        Config.COMPANY_SIZE = args.company_size or Config.scale_preset()['default_size']
+    elif args.company_size:
         Config.COMPANY_SIZE = args.company_size
+        Config.SCALE_PRESET = Config.preset_for_size(args.company_size)
         
     # Run simulation
     sim = AsanaSimulation(
         db_path=args.db_path,
-        seed=args.seed
+        seed=args.seed,
+        parquet_dir=args.export_parquet,
+        backend=args.backend,
+        in_memory_build=args.in_memory_build,
+        invariant_mode=args.invariants,
+        trace_memory=args.trace_memory,
+        layout=args.layout,
+        index_profile=args.index_profile,
+        seal=False if args.no_seal else None,
+        build_summaries=True if args.summaries else None,
+        search_index=True if args.search_index else None,
+        activity=True if args.activity else None,
+        pipelined_writes=True if args.pipelined_writes else None,
+        dictionary_text=True if args.dictionary_text else None,
+        api_dir=args.export_api
     )
     
     sim.run()
@@ -2,10 +2,23 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List
+import random
 import uuid
 
-def generate_gid() -> str:
-    """Generate Asana-style GID (UUID without hyphens)."""
+# Version-4 and RFC 4122 variant bits of a UUID
+_GID_CLEAR = ~((0xf000 << 64) | (0xc000 << 48))
+_GID_SET = (4 << 76) | (0x8000 << 48)
+
+def generate_gid(rng: Optional[random.Random] = None) -> str:
+    """
+    Generate Asana-style GID (UUID without hyphens).
+    
+    With ``rng`` the GID is drawn from that generator, so seeded runs
+    produce the same identifiers.
+    """
+    if rng is not None:
+        # Same value as uuid.UUID(int=..., version=4).hex without building a UUID
+        return '%032x' % (rng.getrandbits(128) & _GID_CLEAR | _GID_SET)
     return str(uuid.uuid4()).replace('-', '')
 
 @dataclass
@@ -102,6 +115,16 @@ class Comment:
     created_at: datetime = field(default_factory=datetime.now)
     comment_type: str = "comment"
 
+@dataclass
+class TaskActivity:
+    activity_id: str = field(default_factory=generate_gid)
+    task_id: str = ""
+    actor_id: Optional[str] = None
+    activity_type: str = ""  # created, section_changed, assignee_changed, due_date_changed, completed
+    created_at: datetime = field(default_factory=datetime.now)
+    old_value: Optional[str] = None
+    new_value: Optional[str] = None
+
 @dataclass
 class CustomFieldDefinition:
     field_id: str = field(default_factory=generate_gid)
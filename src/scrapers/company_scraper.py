@@ -1,6 +1,4 @@
 """Scrape real company names from Y Combinator directory."""
-import requests
-from bs4 import BeautifulSoup
 import logging
 import random
 from typing import List
@@ -0,0 +1,462 @@
+"""Streaming NDJSON export shaped like Asana REST API resources.
+
+Each resource type is written to its own compressed NDJSON file (one
+JSON object per line, as the API's ``data`` objects), with nested compact
+references instead of foreign keys:
+
+    python -m src.utils.api_export output/asana_simulation.sqlite output/api --compression zstd
+
+Tasks are assembled in a single pass. The task stream and the child
+tables (tags, custom field values) are all read ordered by task key and
+merge-joined as they advance, so there is no per-task query and memory
+stays constant in the number of tasks; only the small reference tables
+(users, projects, sections, tags, custom fields) are held in memory.
+Resources are written concurrently, one thread and read-only connection
+each; SQLite and the compressors release the GIL while they work.
+
+:class:`ApiResources` builds the same shapes for filtered queries, which
+the mock API server (:mod:`src.utils.mock_api`) serves.
+"""
+import argparse
+import gzip
+import json
+import logging
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils.database import open_readonly
+
+logger = logging.getLogger(__name__)
+
+# Resource type -> table it is exported from
+RESOURCES = {
+    'workspaces': 'organizations',
+    'teams': 'teams',
+    'users': 'users',
+    'projects': 'projects',
+    'sections': 'sections',
+    'tags': 'tags',
+    'custom_fields': 'custom_field_definitions',
+    'tasks': 'tasks',
+    'stories': 'comments',
+}
+
+# Reference table -> API resource type of its compact references
+REFERENCE_TYPES = {
+    'organizations': 'workspace',
+    'teams': 'team',
+    'users': 'user',
+    'projects': 'project',
+    'sections': 'section',
+    'tags': 'tag',
+}
+
+# task_activity event -> (story subtype, text template)
+ACTIVITY_STORIES = {
+    'created': ('added_to_project', "created this task"),
+    'section_changed': ('section_changed', 'moved this task from "{old}" to "{new}"'),
+    'assignee_changed': ('assigned', "assigned to {new}"),
+    'due_date_changed': ('due_date_changed', "changed the due date to {new}"),
+    'completed': ('marked_complete', "completed this task"),
+}
+
+COMPRESSIONS = ('gzip', 'zstd', 'none')
+SUFFIXES = {'gzip': '.ndjson.gz', 'zstd': '.ndjson.zst', 'none': '.ndjson'}
+
+# Records encoded before each write to the compressed stream
+WRITE_BATCH_RECORDS = 1024
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+def _timestamp(value: Optional[str]) -> Optional[str]:
+    """Stored ISO-8601 (naive UTC) -> the API's millisecond ``...Z`` form."""
+    if value is None:
+        return None
+    fraction = value[20:23] if len(value) > 19 else ''
+    return f"{value[:19]}.{fraction.ljust(3, '0')}Z"
+
+
+def _date(value: Optional[str]) -> Optional[str]:
+    return value[:10] if value is not None else None
+
+
+def _open_output(path: Path, compression: str, level: Optional[int]):
+    """Binary writer for ``path`` with the chosen compression."""
+    if compression == 'gzip':
+        return gzip.open(path, 'wb', compresslevel=6 if level is None else level)
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstandard is required for zstd output (pip install zstandard)") from None
+        compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+        return compressor.stream_writer(open(path, 'wb'), closefd=True)
+    return open(path, 'wb')
+
+
+class _ChildRows:
+    """
+    Rows of a child table ordered by task key, consumed alongside the task stream.
+
+    Both streams ascend in the same key order, so :meth:`take` only ever
+    moves forward: rows of keys the task stream skipped are discarded.
+    """
+
+    def __init__(self, rows: Iterable[tuple]):
+        self._groups = groupby(rows, key=itemgetter(0))
+        self._advance()
+
+    def _advance(self):
+        self.key, group = next(self._groups, (None, None))
+        self.rows = list(group) if group is not None else []
+
+    def take(self, key: Any) -> List[tuple]:
+        while self.key is not None and self.key < key:
+            self._advance()
+        if self.key is not None and self.key == key:
+            rows = self.rows
+            self._advance()
+            return rows
+        return []
+
+
+def _custom_field_value(field: Dict[str, Any], value: Optional[str]) -> Dict[str, Any]:
+    """A task's custom field entry: the definition plus its typed value."""
+    entry = {key: field[key] for key in ('gid', 'resource_type', 'name', 'type')}
+    entry['display_value'] = value
+    kind = field['type']
+    if kind == 'number':
+        try:
+            entry['number_value'] = float(value) if value is not None else None
+        except ValueError:
+            entry['number_value'] = None
+    elif kind == 'enum':
+        entry['enum_value'] = ({'resource_type': 'enum_option', 'name': value}
+                               if value is not None else None)
+    elif kind == 'date':
+        entry['date_value'] = {'date': _date(value)} if value is not None else None
+    elif kind == 'people':
+        entry['people_value'] = ([{'gid': value, 'resource_type': 'user'}]
+                                 if value is not None else [])
+    else:
+        entry['text_value'] = value
+    return entry
+
+
+class ApiResources:
+    """
+    Asana API shapes of the rows of one open database.
+
+    Every resource method takes an optional SQL filter (``where`` with
+    ``params``) on the table's alias, so the same shapes serve a full
+    export and single-resource lookups. Foreign keys become compact
+    references from maps of the small tables, loaded once per instance.
+    Public GIDs are the key columns in the standard layout and the
+    ``gid`` columns in the compact one.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self._gid_columns: Dict[str, str] = {}
+        self._refs: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fields: Optional[Dict[Any, Dict[str, Any]]] = None
+        self._names: Optional[Dict[str, str]] = None
+
+    # ------------------------------------------------------------------
+    # Keys and references
+    # ------------------------------------------------------------------
+
+    def gid(self, table: str) -> str:
+        """Column holding the public GID: ``gid`` in the compact layout, else the key."""
+        if table not in self._gid_columns:
+            columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+            self._gid_columns[table] = 'gid' if 'gid' in columns else columns[0]
+        return self._gid_columns[table]
+
+    def refs(self, table: str) -> Dict[Any, Dict[str, Any]]:
+        """Stored key -> compact API reference of every row of a reference table."""
+        if table not in self._refs:
+            key = self.conn.execute(f"PRAGMA table_info({table})").fetchone()[1]
+            resource_type = REFERENCE_TYPES[table]
+            self._refs[table] = {
+                row[0]: {'gid': row[1], 'resource_type': resource_type, 'name': row[2]}
+                for row in self.conn.execute(f"SELECT {key}, {self.gid(table)}, name FROM {table}")
+            }
+        return self._refs[table]
+
+    def key_for(self, table: str, gid: str) -> Any:
+        """Stored key of a public GID of a reference table (None if unknown)."""
+        if table not in self._keys:
+            self._keys[table] = {ref['gid']: key for key, ref in self.refs(table).items()}
+        return self._keys[table].get(gid)
+
+    def custom_field_definitions(self) -> Dict[Any, Dict[str, Any]]:
+        """Stored key -> custom field resource (without a value)."""
+        if self._fields is None:
+            self._fields = {}
+            for row in self.conn.execute(
+                    f"SELECT field_id, {self.gid('custom_field_definitions')}, name, field_type, "
+                    "description, enum_options FROM custom_field_definitions"):
+                field = {'gid': row[1], 'resource_type': 'custom_field', 'name': row[2],
+                         'type': row[3], 'description': row[4]}
+                if row[3] == 'enum':
+                    options = json.loads(row[5]) if row[5] else []
+                    field['enum_options'] = [
+                        {'resource_type': 'enum_option', 'name': option} for option in options
+                    ]
+                self._fields[row[0]] = field
+        return self._fields
+
+    @staticmethod
+    def _where(where: str) -> str:
+        return f" WHERE {where}" if where else ''
+
+    # ------------------------------------------------------------------
+    # Resources
+    # ------------------------------------------------------------------
+
+    def workspaces(self, where: str = '', params: tuple = ()) -> Iterator[Dict[str, Any]]:
+        for row in self.conn.execute(
+                f"SELECT o.{self.gid('organizations')}, o.name, o.domain, o.is_organization "
+                f"FROM organizations o{self._where(where)}", params):
+            yield {'gid': row[0], 'resource_type': 'workspace', 'name': row[1],
+                   'email_domains': [row[2]], 'is_organization': bool(row[3])}
+
+    def teams(self, where: str = '', params: tuple = ()) -> Iterator[Dict[str, Any]]:
+        workspaces = self.refs('organizations')
+        for row in self.conn.execute(
+                f"SELECT m.{self.gid('teams')}, m.name, m.description, m.organization_id "
+                f"FROM teams m{self._where(where)}", params):
+            yield {'gid': row[0], 'resource_type': 'team', 'name': row[1],
+                   'description': row[2], 'organization': workspaces.get(row[3])}
+
+    def users(self, where: str = '', params: tuple = ()) -> Iterator[Dict[str, Any]]:
+        workspaces = self.refs('organizations')
+        for row in self.conn.execute(
+                f"SELECT u.{self.gid('users')}, u.name, u.email, u.photo_url, u.organization_id "
+                f"FROM users u{self._where(where)}", params):
+            yield {'gid': row[0], 'resource_type': 'user', 'name': row[1], 'email': row[2],
+                   'photo': {'image_128x128': row[3]} if row[3] else None,
+                   'workspaces': [workspaces.get(row[4])]}
+
+    def projects(self, where: str = '', params: tuple = ()) -> Iterator[Dict[str, Any]]:
+        workspaces = self.refs('organizations')
+        teams = self.refs('teams')
+        users = self.refs('users')
+        for row in self.conn.execute(
+                f"SELECT p.{self.gid('projects')}, p.name, p.description, p.is_archived, p.color, "
+                "p.created_at, p.due_date, p.privacy_setting, p.owner_id, p.team_id, "
+                f"p.organization_id FROM projects p{self._where(where)}", params):
+            yield {'gid': row[0], 'resource_type': 'project', 'name': row[1], 'notes': row[2],
+                   'archived': bool(row[3]), 'color': row[4],
+                   'created_at': _timestamp(row[5]), 'due_on': _date(row[6]),
+                   'privacy_setting': row[7], 'owner': users.get(row[8]),
+                   'team': teams.get(row[9]), 'workspace': workspaces.get(row[10])}
+
+    def sections(self, where: str = '', params: tuple = ()) -> Iterator[Dict[str, Any]]:
+        projects = self.refs('projects')
+        for row in self.conn.execute(
+                f"SELECT s.{self.gid('sections')}, s.name, s.created_at, s.project_id "
+                f"FROM sections s{self._where(where)} ORDER BY s.project_id, s.position", params):
+            yield {'gid': row[0], 'resource_type': 'section', 'name': row[1],
+                   'created_at': _timestamp(row[2]), 'project': projects.get(row[3])}
+
+    def tags(self, where: str = '', params: tuple = ()) -> Iterator[Dict[str, Any]]:
+        workspaces = self.refs('organizations')
+        for row in self.conn.execute(
+                f"SELECT g.{self.gid('tags')}, g.name, g.color, g.created_at, g.organization_id "
+                f"FROM tags g{self._where(where)}", params):
+            yield {'gid': row[0], 'resource_type': 'tag', 'name': row[1], 'color': row[2],
+                   'created_at': _timestamp(row[3]), 'workspace': workspaces.get(row[4])}
+
+    def custom_fields(self, where: str = '', params: tuple = ()) -> Iterator[Dict[str, Any]]:
+        yield from self.custom_field_definitions().values()
+
+    def tasks(self, where: str = '', params: tuple = ()) -> Iterator[Dict[str, Any]]:
+        """Full task records; ``where`` filters on alias ``t``."""
+        workspace = next(iter(self.refs('organizations').values()), None)
+        users = self.refs('users')
+        projects = self.refs('projects')
+        sections = self.refs('sections')
+        tags = self.refs('tags')
+        fields = self.custom_field_definitions()
+        gid = self.gid('tasks')
+
+        # Every stream ascends by task key; children are merged as tasks advance
+        task_filter = self._where(where)
+        child_filter = (f" WHERE task_id IN (SELECT t.task_id FROM tasks t{task_filter})"
+                        if where else '')
+        task_rows = self.conn.execute(
+            f"SELECT t.task_id, t.{gid}, t.name, t.description, t.assignee_id, "
+            "t.created_by_id, t.created_at, t.modified_at, t.due_date, t.start_date, "
+            "t.completed, t.completed_at, t.completed_by_id, t.project_id, t.section_id, "
+            f"p.{gid}, p.name, t.num_subtasks, t.priority "
+            f"FROM tasks t LEFT JOIN tasks p ON p.task_id = t.parent_task_id{task_filter} "
+            "ORDER BY t.task_id", params)
+        task_tags = _ChildRows(self.conn.execute(
+            f"SELECT task_id, tag_id FROM task_tags{child_filter} ORDER BY task_id, tag_id",
+            params))
+        values = _ChildRows(self.conn.execute(
+            f"SELECT task_id, field_id, value FROM custom_field_values{child_filter} "
+            "ORDER BY task_id, field_id", params))
+
+        for row in task_rows:
+            key = row[0]
+            project = projects.get(row[13])
+            section = sections.get(row[14])
+            yield {
+                'gid': row[1],
+                'resource_type': 'task',
+                'resource_subtype': 'default_task',
+                'name': row[2],
+                'notes': row[3],
+                'assignee': users.get(row[4]),
+                'created_by': users.get(row[5]),
+                'created_at': _timestamp(row[6]),
+                'modified_at': _timestamp(row[7]),
+                'due_on': _date(row[8]),
+                'start_on': _date(row[9]),
+                'completed': bool(row[10]),
+                'completed_at': _timestamp(row[11]),
+                'completed_by': users.get(row[12]),
+                'parent': ({'gid': row[15], 'resource_type': 'task', 'name': row[16]}
+                           if row[15] is not None else None),
+                'projects': [project] if project else [],
+                'memberships': [{'project': project, 'section': section}] if section else [],
+                'tags': [tags[tag] for _, tag in task_tags.take(key) if tag in tags],
+                'custom_fields': [
+                    _custom_field_value(fields[field], value)
+                    for _, field, value in values.take(key) if field in fields
+                ],
+                'num_subtasks': row[17],
+                'priority': row[18],
+                'workspace': workspace,
+            }
+
+    def stories(self, where: str = '', params: tuple = ()) -> Iterator[Dict[str, Any]]:
+        """
+        Comment stories, then system stories from ``task_activity``.
+
+        ``where`` filters on the task (alias ``t``). Activity values are
+        GIDs, shown by name as in the Asana UI.
+        """
+        users = self.refs('users')
+        task_gid = self.gid('tasks')
+        task_filter = self._where(where)
+
+        for row in self.conn.execute(
+                f"SELECT c.{self.gid('comments')}, c.created_at, c.user_id, c.text, "
+                f"c.comment_type, t.{task_gid}, t.name "
+                f"FROM comments c JOIN tasks t ON t.task_id = c.task_id{task_filter}", params):
+            story_type = 'comment' if row[4] == 'comment' else 'system'
+            yield {'gid': row[0], 'resource_type': 'story',
+                   'resource_subtype': 'comment_added' if story_type == 'comment' else row[4],
+                   'type': story_type, 'created_at': _timestamp(row[1]),
+                   'created_by': users.get(row[2]), 'text': row[3],
+                   'target': {'gid': row[5], 'resource_type': 'task', 'name': row[6]}}
+
+        if self._names is None:
+            self._names = {ref['gid']: ref['name']
+                           for table in ('users', 'sections') for ref in self.refs(table).values()}
+        names = self._names
+        for row in self.conn.execute(
+                f"SELECT a.{self.gid('task_activity')}, a.created_at, a.actor_id, "
+                f"a.activity_type, a.old_value, a.new_value, t.{task_gid}, t.name "
+                f"FROM task_activity a JOIN tasks t ON t.task_id = a.task_id{task_filter}",
+                params):
+            subtype, text = ACTIVITY_STORIES.get(row[3], (row[3], row[3]))
+            yield {'gid': row[0], 'resource_type': 'story', 'resource_subtype': subtype,
+                   'type': 'system', 'created_at': _timestamp(row[1]),
+                   'created_by': users.get(row[2]),
+                   'text': text.format(old=names.get(row[4], row[4]),
+                                       new=names.get(row[5], row[5])),
+                   'target': {'gid': row[6], 'resource_type': 'task', 'name': row[7]}}
+
+    def compact(self, table: str, where: str = '', params: tuple = (),
+                order: str = '', limit: int = -1, offset: int = 0) -> List[Dict[str, Any]]:
+        """Compact records (gid, resource_type, name) of a filtered, ordered page of rows."""
+        resource_type = REFERENCE_TYPES.get(table, table.rstrip('s'))
+        order_by = f" ORDER BY {order}" if order else ''
+        return [
+            {'gid': row[0], 'resource_type': resource_type, 'name': row[1]}
+            for row in self.conn.execute(
+                f"SELECT x.{self.gid(table)}, x.name FROM {table} x{self._where(where)}"
+                f"{order_by} LIMIT ? OFFSET ?", (*params, limit, offset))
+        ]
+
+
+class ApiExporter:
+    """Write a generated database as Asana API-shaped NDJSON files."""
+
+    def __init__(self, output_dir: str, compression: str = 'gzip',
+                 level: Optional[int] = None, workers: int = 4):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}' "
+                             f"(choose from: {', '.join(COMPRESSIONS)})")
+        self.output_dir = Path(output_dir)
+        self.compression = compression
+        self.level = level
+        self.workers = workers
+
+    def export_resource(self, db_path: str, resource: str) -> Tuple[str, int]:
+        """Write one resource file. Returns its path and the number of records."""
+        if resource not in RESOURCES:
+            raise ValueError(f"Unknown resource '{resource}' (choose from: {', '.join(RESOURCES)})")
+        path = self.output_dir / f"{resource}{SUFFIXES[self.compression]}"
+
+        conn = open_readonly(db_path, check_same_thread=False)
+        total = 0
+        try:
+            records = getattr(ApiResources(conn), resource)()
+            with _open_output(path, self.compression, self.level) as out:
+                batch = []
+                for record in records:
+                    batch.append(_encode(record))
+                    if len(batch) >= WRITE_BATCH_RECORDS:
+                        out.write(('\n'.join(batch) + '\n').encode())
+                        total += len(batch)
+                        batch = []
+                if batch:
+                    out.write(('\n'.join(batch) + '\n').encode())
+                    total += len(batch)
+        finally:
+            conn.close()
+
+        logger.info(f"Exported {total} {resource} to {path}")
+        return str(path), total
+
+    def export_database(self, db_path: str,
+                        resources: Optional[List[str]] = None) -> Dict[str, int]:
+        """Export every resource (or the given subset), one writer thread per resource."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        resources = resources or list(RESOURCES)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # Largest first, so it is never the one left running alone
+            ordered = sorted(resources, key=lambda r: r != 'tasks')
+            futures = {r: pool.submit(self.export_resource, db_path, r) for r in ordered}
+            return {r: futures[r].result()[1] for r in resources}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export a generated database as Asana API-shaped NDJSON')
+    parser.add_argument('db_path', help='Database path')
+    parser.add_argument('output_dir', help='Directory for the <resource>.ndjson[.gz|.zst] files')
+    parser.add_argument('--compression', choices=COMPRESSIONS, default='gzip')
+    parser.add_argument('--level', type=int, help='Compression level (gzip 1-9, zstd 1-22)')
+    parser.add_argument('--workers', type=int, default=4, help='Resources written concurrently')
+    parser.add_argument('--resources', nargs='+', choices=list(RESOURCES),
+                        help='Resources to export (default: all)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    counts = ApiExporter(args.output_dir, args.compression, args.level,
+                         args.workers).export_database(args.db_path, args.resources)
+    print(', '.join(f"{resource}: {count}" for resource, count in counts.items()))
+    sys.exit(0)
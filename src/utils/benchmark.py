@@ -0,0 +1,351 @@
+"""Reproducible benchmark suite for the generation pipeline.
+
+Each case runs in a fresh interpreter so the first iteration measures a
+cold start (imports plus first call) and later iterations measure warm
+performance. Results can be saved and compared against a baseline:
+
+    python -m src.utils.benchmark --output bench.json
+    python -m src.utils.benchmark --baseline bench.json --threshold 0.10
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+SEED = 42
+
+# Environment of every case process: a fixed simulation window, so row
+# counts (and timings) do not drift with the date the suite runs on
+CASE_ENV = {
+    'SIMULATION_START_DATE': '2023-07-01',
+    'SIMULATION_END_DATE': '2024-06-30',
+}
+
+# Parameter matrix per case; QUICK_MATRIX keeps CI runs short
+MATRIX = {
+    'user_generator': [{'count': 1000}, {'count': 10000}],
+    'task_generator': [{'tasks': 1000}, {'tasks': 10000}],
+    'temporal_generator': [{'calls': 100000}],
+    'business_calendar': [{'size': 1_000_000}],
+    'distribution_generator': [{'calls': 100000}],
+    'database_insert': [{'rows': 20000, 'mode': 'insert'}, {'rows': 20000, 'mode': 'append'},
+                        {'rows': 20000, 'mode': 'entities'}],
+    # Company size x task volume (tasks per section), then write-path options
+    'pipeline': [
+        {'company_size': 5000, 'tasks_per_section': 10},
+        {'company_size': 5000, 'tasks_per_section': 40},
+        {'company_size': 10000, 'tasks_per_section': 10},
+        {'company_size': 10000, 'tasks_per_section': 40},
+        {'company_size': 5000, 'tasks_per_section': 40, 'layout': 'compact'},
+        {'company_size': 5000, 'tasks_per_section': 40, 'dictionary_text': True},
+        {'company_size': 5000, 'tasks_per_section': 40, 'pipelined_writes': True},
+    ],
+}
+
+QUICK_MATRIX = {
+    'user_generator': [{'count': 1000}],
+    'task_generator': [{'tasks': 1000}],
+    'temporal_generator': [{'calls': 20000}],
+    'business_calendar': [{'size': 100_000}],
+    'distribution_generator': [{'calls': 20000}],
+    'database_insert': [{'rows': 5000, 'mode': 'insert'}, {'rows': 5000, 'mode': 'append'},
+                        {'rows': 5000, 'mode': 'entities'}],
+    'pipeline': [{'company_size': 5000, 'tasks_per_section': 10},
+                 {'company_size': 5000, 'tasks_per_section': 40}],
+}
+
+
+# ----------------------------------------------------------------------
+# Cases: each returns a zero-argument callable; setup is not timed
+# ----------------------------------------------------------------------
+
+def case_user_generator(params: Dict[str, Any]) -> Callable[[], Any]:
+    from src.generators.users import UserGenerator
+
+    def run():
+        UserGenerator('org', 'example.com', seed=SEED).generate_users(params['count'], 'engineering')
+    return run
+
+
+def case_task_generator(params: Dict[str, Any]) -> Callable[[], Any]:
+    from src.config import Config
+    from src.generators.tasks import TaskGenerator
+
+    members = [f"user{i}" for i in range(50)]
+
+    def run():
+        TaskGenerator(seed=SEED).generate_tasks(
+            'project', 'section', 'engineering', 'sprint', members,
+            Config.SIMULATION_START_DATE, params['tasks']
+        )
+    return run
+
+
+def case_temporal_generator(params: Dict[str, Any]) -> Callable[[], Any]:
+    from src.config import Config
+    from src.utils.temporal import TemporalGenerator
+
+    def run():
+        gen = TemporalGenerator(Config.SIMULATION_START_DATE, Config.SIMULATION_END_DATE, seed=SEED)
+        for _ in range(params['calls']):
+            created = gen.generate_workday_time(
+                gen.random_date_in_range(Config.SIMULATION_START_DATE, Config.SIMULATION_END_DATE)
+            )
+            due = gen.generate_due_date(created, Config.DUE_DATE_DISTRIBUTION)
+            gen.generate_completion_time(created, due)
+    return run
+
+
+def case_business_calendar(params: Dict[str, Any]) -> Callable[[], Any]:
+    import numpy as np
+    from src.config import Config
+    from src.utils.temporal import TemporalGenerator
+
+    gen = TemporalGenerator(Config.SIMULATION_START_DATE, Config.SIMULATION_END_DATE, seed=SEED)
+    zones = np.array(['America/New_York', 'Europe/London', 'Asia/Kolkata'])
+
+    def run():
+        stamps = gen.random_business_datetimes(
+            Config.SIMULATION_START_DATE, Config.SIMULATION_END_DATE, params['size'],
+            time_zones=zones[np.arange(params['size']) % len(zones)]
+        )
+        gen.calendar.offset(stamps, 5)
+    return run
+
+
+def case_distribution_generator(params: Dict[str, Any]) -> Callable[[], Any]:
+    from src.utils.distributions import DistributionGenerator
+
+    def run():
+        gen = DistributionGenerator(seed=SEED)
+        for _ in range(params['calls']):
+            gen.log_normal(5, 20)
+            gen.power_law(2.0, 1, 100)
+            gen.pareto(1.5, 1)
+    return run
+
+
+def case_database_insert(params: Dict[str, Any]) -> Callable[[], Any]:
+    from src.models.schema import Organization
+    from src.utils.database import Database
+
+    schema_path = str(ROOT / 'schema.sql')
+    entities = [
+        Organization(organization_id=f"org{i}", name='Org', domain=f"org{i}.com",
+                     created_at=datetime(2024, 1, 1), settings={'default_view': 'list'})
+        for i in range(params['rows'])
+    ]
+    rows = [
+        {
+            'organization_id': f"org{i}", 'name': 'Org', 'domain': f"org{i}.com",
+            'created_at': datetime(2024, 1, 1), 'is_organization': True,
+            'settings': {'default_view': 'list'},
+        }
+        for i in range(params['rows'])
+    ]
+
+    def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(str(Path(tmp) / 'bench.sqlite'))
+            db.connect()
+            db.initialize_schema(schema_path)
+            if params['mode'] == 'insert':
+                for row in rows:
+                    db.insert('organizations', row)
+            elif params['mode'] == 'append':
+                db.append('organizations', rows)
+            else:
+                db.append_entities('organizations', entities)
+            db.commit()
+            db.close()
+    return run
+
+
+def case_pipeline(params: Dict[str, Any]) -> Callable[[], Any]:
+    from src.config import Config
+    from src.main import AsanaSimulation
+
+    Config.COMPANY_SIZE = params['company_size']
+    Config.SCALE_PRESET = Config.preset_for_size(params['company_size'])
+    if 'tasks_per_section' in params:
+        # An exact task volume instead of the preset's random range
+        volume = params['tasks_per_section']
+        Config.SCALE_PRESETS[Config.SCALE_PRESET]['tasks_per_section'] = (volume, volume)
+
+    def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            AsanaSimulation(
+                db_path=str(Path(tmp) / 'bench.sqlite'), seed=SEED,
+                layout=params.get('layout', 'standard'),
+                dictionary_text=params.get('dictionary_text', False),
+                pipelined_writes=params.get('pipelined_writes', False),
+            ).run()
+    return run
+
+
+CASES = {
+    'user_generator': case_user_generator,
+    'task_generator': case_task_generator,
+    'temporal_generator': case_temporal_generator,
+    'business_calendar': case_business_calendar,
+    'distribution_generator': case_distribution_generator,
+    'database_insert': case_database_insert,
+    'pipeline': case_pipeline,
+}
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+
+def case_id(name: str, params: Dict[str, Any]) -> str:
+    """Stable identifier for a case and its parameters."""
+    suffix = ','.join(f"{k}={v}" for k, v in sorted(params.items()))
+    return f"{name}[{suffix}]"
+
+
+def _run_child(name: str, params: Dict[str, Any], repeat: int):
+    """Executed inside the benchmark subprocess; prints timings as JSON."""
+    logging.disable(logging.CRITICAL)
+
+    start = time.perf_counter()
+    run = CASES[name](params)
+    setup_seconds = time.perf_counter() - start
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    print(json.dumps({'setup_seconds': setup_seconds, 'times': times}))
+
+
+def run_case(name: str, params: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """Run one case in a fresh interpreter and summarize cold and warm timings."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-m', 'src.utils.benchmark', '--child', name,
+         '--params', json.dumps(params), '--repeat', str(repeat)],
+        cwd=str(ROOT), env={**os.environ, **CASE_ENV},
+        capture_output=True, text=True, check=True
+    )
+    process_seconds = time.perf_counter() - start
+    child = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    times = child['times']
+    warm = times[1:] or times
+    return {
+        'case': case_id(name, params),
+        'params': params,
+        'cold_seconds': child['setup_seconds'] + times[0],
+        'warm_median_seconds': statistics.median(warm),
+        'warm_min_seconds': min(warm),
+        'process_seconds': process_seconds,
+        'times': times,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=str(ROOT),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(cases: List[str], repeat: int, quick: bool = False) -> Dict[str, Any]:
+    """Run the selected cases across their parameter matrix."""
+    matrix = QUICK_MATRIX if quick else MATRIX
+    results = []
+    for name in cases:
+        for params in matrix[name]:
+            result = run_case(name, params, repeat)
+            print(f"{result['case']:<72} cold {result['cold_seconds']:>8.3f}s   "
+                  f"warm {result['warm_median_seconds']:>8.3f}s")
+            results.append(result)
+
+    return {
+        'created_at': datetime.now().isoformat(),
+        'git_revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': SEED,
+        'environment': CASE_ENV,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a description of every case slower than baseline by more than threshold."""
+    previous = {r['case']: r for r in baseline['results']}
+    regressions = []
+
+    for result in current['results']:
+        base = previous.get(result['case'])
+        if base is None:
+            continue
+        for metric in ('warm_median_seconds', 'cold_seconds'):
+            ratio = result[metric] / base[metric] if base[metric] > 0 else 1.0
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{result['case']} {metric}: {base[metric]:.3f}s -> {result[metric]:.3f}s "
+                    f"(+{ratio - 1:.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the generation pipeline')
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES),
+                        help='Cases to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Iterations per case (first is cold)')
+    parser.add_argument('--quick', action='store_true', help='Use the reduced parameter matrix')
+    parser.add_argument('--output', help='Write results as JSON to this path')
+    parser.add_argument('--baseline', help='Compare against results from a previous run')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Allowed slowdown versus baseline before failing (default: 0.10)')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--params', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _run_child(args.child, json.loads(args.params), args.repeat)
+        return 0
+
+    results = run_suite(args.cases, args.repeat, quick=args.quick)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for line in regressions:
+                print(f"  ✗ {line}")
+            return 1
+        print(f"\n✓ No regressions beyond {args.threshold:.0%} versus {args.baseline}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
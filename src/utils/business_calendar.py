@@ -0,0 +1,260 @@
+"""Vectorized business-day calendar: regional holidays, work hours and time zones.
+
+Every operation takes and returns NumPy arrays (``datetime64``), so
+millions of timestamps are mapped per call without a Python loop over
+them. Holiday dates are computed once per calendar from rule tables, and
+time-zone offsets once per distinct (zone, day) pair.
+"""
+import bisect
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+# Holiday rules per region:
+#   ('fixed', month, day)
+#   ('nth', month, weekday, n)   n-th weekday (Mon=0) of the month; n=-1 is the last
+#   ('easter', offset_days)      relative to Western Easter Sunday
+HOLIDAY_CALENDARS: Dict[str, List[Tuple]] = {
+    'none': [],
+    'US': [
+        ('fixed', 1, 1), ('nth', 1, 0, 3), ('nth', 2, 0, 3), ('nth', 5, 0, -1),
+        ('fixed', 6, 19), ('fixed', 7, 4), ('nth', 9, 0, 1), ('nth', 11, 3, 4),
+        ('fixed', 12, 25),
+    ],
+    'UK': [
+        ('fixed', 1, 1), ('easter', -2), ('easter', 1), ('nth', 5, 0, 1),
+        ('nth', 5, 0, -1), ('nth', 8, 0, -1), ('fixed', 12, 25), ('fixed', 12, 26),
+    ],
+    'DE': [
+        ('fixed', 1, 1), ('easter', -2), ('easter', 1), ('fixed', 5, 1), ('easter', 39),
+        ('easter', 50), ('fixed', 10, 3), ('fixed', 12, 25), ('fixed', 12, 26),
+    ],
+    'IN': [('fixed', 1, 26), ('fixed', 8, 15), ('fixed', 10, 2), ('fixed', 12, 25)],
+}
+
+# How fixed-date holidays on a weekend are observed: on the nearest
+# weekday (Sat -> Fri, Sun -> Mon) or the next free weekday
+OBSERVANCE = {'US': 'nearest', 'UK': 'next'}
+
+# Local hour -> relative weight of generated work timestamps (9:00-18:59, flat)
+DEFAULT_WORK_HOURS = dict.fromkeys(range(9, 19), 1.0)
+
+DateArray = Union[np.ndarray, Sequence, np.datetime64, datetime]
+
+
+def easter(year: int) -> date:
+    """Western (Gregorian) Easter Sunday."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def holidays(region: str, years: Sequence[int]) -> List[date]:
+    """Observed holiday dates of a region over ``years``."""
+    if region not in HOLIDAY_CALENDARS:
+        raise ValueError(f"Unknown holiday calendar '{region}' "
+                         f"(choose from: {', '.join(HOLIDAY_CALENDARS)})")
+    observance = OBSERVANCE.get(region)
+
+    result: List[date] = []
+    for year in years:
+        for rule in HOLIDAY_CALENDARS[region]:
+            if rule[0] == 'easter':
+                result.append(easter(year) + timedelta(days=rule[1]))
+                continue
+            if rule[0] == 'nth':
+                result.append(_nth_weekday(year, *rule[1:]))
+                continue
+
+            day = date(year, rule[1], rule[2])
+            if day.weekday() >= 5 and observance == 'nearest':
+                day += timedelta(days=-1 if day.weekday() == 5 else 1)
+            elif day.weekday() >= 5 and observance == 'next':
+                while day.weekday() >= 5 or day in result:
+                    day += timedelta(days=1)
+            result.append(day)
+    return sorted(set(result))
+
+
+def _days(values: DateArray) -> np.ndarray:
+    return np.asarray(values, dtype='datetime64[us]').astype('datetime64[D]')
+
+
+class BusinessCalendar:
+    """
+    Working days and hours of one region.
+
+    Wraps ``numpy.busdaycalendar``; ``weekmask`` uses NumPy's format
+    (``'1111100'`` or ``'Mon Tue Wed Thu Fri'``). Work hours are a
+    mapping of local hour -> relative weight.
+    """
+
+    def __init__(self, region: str = 'US', years: Sequence[int] = (),
+                 weekmask: str = '1111100',
+                 work_hours: Optional[Dict[int, float]] = None):
+        self.region = region
+        self.holidays = holidays(region, years)
+        self.busdaycal = np.busdaycalendar(
+            weekmask=weekmask, holidays=np.array(self.holidays, dtype='datetime64[D]')
+        )
+        work_hours = work_hours or DEFAULT_WORK_HOURS
+        self.hours = np.array(sorted(work_hours), dtype=np.int64)
+        weights = np.array([work_hours[h] for h in sorted(work_hours)], dtype=float)
+        self.hour_cdf = np.cumsum(weights / weights.sum())
+        self.hour_cdf[-1] = 1.0  # No rounding gap above the last hour
+
+        # Plain-Python copies for the single-value helpers, where NumPy's
+        # per-call overhead would dominate
+        self._workdays = [bool(day) for day in self.busdaycal.weekmask]
+        self._holiday_set = set(self.holidays)
+        self._hour_list = self.hours.tolist()
+        self._cdf_list = self.hour_cdf.tolist()
+
+    # ------------------------------------------------------------------
+    # Business days
+    # ------------------------------------------------------------------
+
+    def is_business_day(self, values: DateArray) -> np.ndarray:
+        """Whether each date falls on a working day."""
+        return np.is_busday(_days(values), busdaycal=self.busdaycal)
+
+    def roll_forward(self, values: DateArray) -> np.ndarray:
+        """Move each timestamp to the next working day (if needed), keeping its time of day."""
+        stamps = np.asarray(values, dtype='datetime64[us]')
+        days = stamps.astype('datetime64[D]')
+        rolled = np.busday_offset(days, 0, roll='forward', busdaycal=self.busdaycal)
+        return rolled + (stamps - days)
+
+    def next_business_datetime(self, value: datetime) -> datetime:
+        """Single-value :meth:`roll_forward`, returning a ``datetime``."""
+        if self._workdays[value.weekday()] and value.date() not in self._holiday_set:
+            return value
+        return self.roll_forward(value).item()
+
+    def offset(self, values: DateArray, business_days: Union[int, np.ndarray]) -> np.ndarray:
+        """Add whole working days, keeping the time of day (non-working dates roll forward first)."""
+        stamps = np.asarray(values, dtype='datetime64[us]')
+        days = stamps.astype('datetime64[D]')
+        moved = np.busday_offset(days, business_days, roll='forward', busdaycal=self.busdaycal)
+        return moved + (stamps - days)
+
+    def business_days_between(self, start: DateArray, end: DateArray) -> np.ndarray:
+        """Working days in ``[start, end)`` of each pair."""
+        return np.busday_count(_days(start), _days(end), busdaycal=self.busdaycal)
+
+    # ------------------------------------------------------------------
+    # Work timestamps
+    # ------------------------------------------------------------------
+
+    def work_hour(self, u: float) -> int:
+        """Work hour at quantile ``u`` in [0, 1) of the work-hour distribution."""
+        return self._hour_list[bisect.bisect_right(self._cdf_list, u)]
+
+    def work_times(self, rng, size: int) -> np.ndarray:
+        """Random times of day (``timedelta64[m]``) drawn from the work-hour distribution."""
+        integers = getattr(rng, 'integers', None) or rng.randint
+        hours = self.hours[np.searchsorted(self.hour_cdf, rng.random(size), side='right')]
+        minutes = hours * 60 + integers(0, 60, size=size)
+        return minutes.astype('timedelta64[m]')
+
+    def random_datetimes(self, rng, start: datetime, end: datetime, size: int,
+                         time_zones: Union[None, str, Sequence[str]] = None) -> np.ndarray:
+        """
+        ``size`` random working timestamps between ``start`` and ``end``.
+
+        Days are uniform over the range and rolled to a working day (back
+        to the last one when rolling forward would pass ``end``); times
+        follow the work-hour distribution in local time. With
+        ``time_zones`` (one zone, or one per timestamp) local times are
+        converted to naive UTC.
+        """
+        integers = getattr(rng, 'integers', None) or rng.randint
+        first = np.datetime64(start, 'D')
+        last = np.datetime64(end, 'D')
+        days = first + integers(0, int((last - first).astype(int)) + 1, size=size)
+
+        rolled = np.busday_offset(days, 0, roll='forward', busdaycal=self.busdaycal)
+        late = rolled > last
+        rolled[late] = np.busday_offset(days[late], 0, roll='backward', busdaycal=self.busdaycal)
+
+        local = rolled.astype('datetime64[us]') + self.work_times(rng, size)
+        if time_zones is None:
+            return local
+        return to_utc(local, time_zones)
+
+
+# ----------------------------------------------------------------------
+# Time zones
+# ----------------------------------------------------------------------
+
+def utc_offsets(days: DateArray, time_zones: Union[str, Sequence[str]]) -> np.ndarray:
+    """
+    UTC offset (``timedelta64[s]``) at local midday of each day in its zone.
+
+    Offsets are looked up once per distinct (zone, day) pair and scattered
+    back with ``np.unique``; the midday offset is exact for work hours,
+    which never straddle a DST transition.
+    """
+    days = _days(days)
+    zones = np.broadcast_to(np.asarray(time_zones), days.shape)
+    names, zone_index = np.unique(zones, return_inverse=True)
+
+    day_numbers = days.astype(np.int64)
+    low = int(day_numbers.min()) if day_numbers.size else 0
+    span = int(day_numbers.max()) - low + 1 if day_numbers.size else 1
+    keys, inverse = np.unique(zone_index.reshape(days.shape) * span + (day_numbers - low),
+                              return_inverse=True)
+
+    offsets = np.empty(len(keys), dtype=np.int64)
+    epoch = datetime(1970, 1, 1, 12)
+    for i, key in enumerate(keys.tolist()):
+        zone = _zone(str(names[key // span]))
+        local_noon = epoch + timedelta(days=low + key % span)
+        offsets[i] = int(zone.utcoffset(local_noon).total_seconds())
+    return offsets[inverse].reshape(days.shape).astype('timedelta64[s]')
+
+
+def to_utc(local: DateArray, time_zones: Union[str, Sequence[str]]) -> np.ndarray:
+    """Naive local wall-clock times -> naive UTC."""
+    stamps = np.asarray(local, dtype='datetime64[us]')
+    return stamps - utc_offsets(stamps, time_zones)
+
+
+def from_utc(utc: DateArray, time_zones: Union[str, Sequence[str]]) -> np.ndarray:
+    """Naive UTC -> naive local wall-clock times."""
+    stamps = np.asarray(utc, dtype='datetime64[us]')
+    return stamps + utc_offsets(stamps, time_zones)
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+@lru_cache(maxsize=None)
+def default_calendar() -> BusinessCalendar:
+    """Calendar configured by HOLIDAY_CALENDAR, WORK_WEEKMASK and WORK_HOURS."""
+    from src.config import Config
+
+    # Due dates and postponements run past the simulation end
+    years = range(Config.SIMULATION_START_DATE.year - 1, Config.SIMULATION_END_DATE.year + 3)
+    return BusinessCalendar(Config.HOLIDAY_CALENDAR, years,
+                            weekmask=Config.WORK_WEEKMASK, work_hours=Config.WORK_HOURS)
@@ -0,0 +1,138 @@
+"""Precompiled row codecs turning model entities into insert parameter tuples."""
+import dataclasses
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.models import schema as models
+from src.utils.schema_info import SCHEMA_PATH, load_schema
+
+# Model dataclass stored in each table
+MODELS = {
+    'organizations': models.Organization,
+    'teams': models.Team,
+    'users': models.User,
+    'team_memberships': models.TeamMembership,
+    'projects': models.Project,
+    'sections': models.Section,
+    'tasks': models.Task,
+    'comments': models.Comment,
+    'task_activity': models.TaskActivity,
+    'custom_field_definitions': models.CustomFieldDefinition,
+    'custom_field_values': models.CustomFieldValue,
+    'tags': models.Tag,
+    'task_tags': models.TaskTag,
+    'attachments': models.Attachment,
+}
+
+
+def _iso(value: Any) -> Optional[str]:
+    return None if value is None else value.isoformat()
+
+
+def _json(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value)
+
+
+def _bool(value: Any) -> Optional[int]:
+    return None if value is None else int(value)
+
+
+# Storage conversion per declared column type; other types are stored as-is
+CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    'TIMESTAMP': _iso,
+    'DATE': _iso,
+    'JSON': _json,
+    'BOOLEAN': _bool,
+}
+
+
+class RowCodec:
+    """
+    Encoder from one model dataclass to the parameter tuples of its table.
+
+    Column order and converters are resolved once, and :meth:`encode` is
+    compiled into a single tuple expression (the same technique
+    ``dataclasses`` uses for ``__init__``), so encoding a row costs one
+    attribute load per column plus the converters it actually needs.
+    """
+
+    def __init__(self, table: str, model: type, columns: Sequence[str],
+                 converters: Dict[str, Callable[[Any], Any]]):
+        self.table = table
+        self.model = model
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self.converters = converters
+        self.insert_sql = (
+            f"INSERT INTO {table} ({', '.join(self.columns)}) "
+            f"VALUES ({', '.join('?' for _ in self.columns)})"
+        )
+        self.encode = self._compile()
+
+    def _compile(self) -> Callable[[Any], tuple]:
+        namespace = {}
+        items = []
+        for col in self.columns:
+            if col in self.converters:
+                namespace[f"_c_{col}"] = self.converters[col]
+                items.append(f"_c_{col}(e.{col})")
+            else:
+                items.append(f"e.{col}")
+        source = f"def encode(e):\n    return ({', '.join(items)},)\n"
+        exec(source, namespace)
+        encode = namespace['encode']
+        encode.__doc__ = f"Encode a {self.model.__name__} as a {self.table} parameter tuple."
+        return encode
+
+    def encode_many(self, entities: Sequence[Any]) -> List[tuple]:
+        """Encode a batch of entities."""
+        return list(map(self.encode, entities))
+
+    def encode_columns(self, columns: Dict[str, Sequence[Any]]) -> List[tuple]:
+        """Encode a column batch (column name -> values) into row tuples."""
+        converted = []
+        for col in self.columns:
+            values = columns[col]
+            convert = self.converters.get(col)
+            converted.append(list(map(convert, values)) if convert else values)
+        return list(zip(*converted))
+
+
+def build_codec(table: str, model: type, schema_path: str = str(SCHEMA_PATH)) -> RowCodec:
+    """
+    Build the codec for a table, checking the model against the schema.
+
+    Raises ValueError if the model's fields and the table's columns differ,
+    so model/schema drift fails at startup instead of at insert time.
+    """
+    info = load_schema(schema_path).get(table)
+    if info is None:
+        raise ValueError(f"Table {table} is not declared in {schema_path}")
+
+    fields = [f.name for f in dataclasses.fields(model)]
+    missing = [c for c in info.column_names if c not in fields]
+    extra = [f for f in fields if f not in info.column_names]
+    if missing or extra:
+        raise ValueError(
+            f"{model.__name__} does not match table {table}: "
+            f"columns without a field {missing}, fields without a column {extra}"
+        )
+
+    converters = {
+        col.name: CONVERTERS[col.decl_type]
+        for col in info.columns if col.decl_type in CONVERTERS
+    }
+    return RowCodec(table, model, info.column_names, converters)
+
+
+@lru_cache(maxsize=None)
+def codec_for(table: str) -> RowCodec:
+    """The shared codec for a table's model."""
+    if table not in MODELS:
+        raise ValueError(f"No model registered for table {table}")
+    return build_codec(table, MODELS[table])
+
+
+def load_codecs() -> Dict[str, RowCodec]:
+    """Build (and verify) the codec of every table."""
+    return {table: codec_for(table) for table in MODELS}
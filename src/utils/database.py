@@ -1,95 +1,650 @@
-"""Database utilities for SQLite operations."""
+"""Database utilities and pluggable storage backends."""
 import sqlite3
 import json
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Sequence
 import logging
 
 logger = logging.getLogger(__name__)
 
-class Database:
-    """SQLite database manager."""
-    
+TABLES = [
+    'organizations', 'teams', 'users', 'team_memberships',
+    'projects', 'sections', 'tasks', 'comments', 'task_activity',
+    'custom_field_definitions', 'custom_field_values',
+    'tags', 'task_tags', 'attachments'
+]
+
+# Metadata table holding the exact row count of every table
+STATS_TABLE = '_table_stats'
+
+# Key/value build metadata written by Database.seal()
+METADATA_TABLE = '_metadata'
+
+# Metadata key of the simulation end date, the reference time for "overdue"
+END_DATE_KEY = 'simulation_end_date'
+
+
+def _to_storage(value: Any) -> Any:
+    """Convert a Python value to its stored representation."""
+    # Convert datetime objects to ISO format strings
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _write_metadata(conn, values: Dict[str, Any]):
+    """Upsert key/value pairs into the metadata table (caller commits)."""
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {METADATA_TABLE} (key TEXT PRIMARY KEY, value TEXT)")
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {METADATA_TABLE} (key, value) VALUES (?, ?)",
+        [(key, str(value)) for key, value in values.items()]
+    )
+
+
+def unseal(conn: sqlite3.Connection):
+    """Clear the immutable marker in a writable copy of a sealed database (caller commits)."""
+    _write_metadata(conn, {'immutable': 0})
+    conn.execute(f"DELETE FROM {METADATA_TABLE} WHERE key IN ('mmap_size', 'sealed_at')")
+
+
+def seal_file(conn: sqlite3.Connection, db_path: str, page_size: int,
+              metadata: Optional[Dict[str, Any]] = None, search_index: bool = False):
+    """
+    Seal the database file ``conn`` is connected to (see :meth:`Database.seal`).
+
+    VACUUMs at ``page_size``, builds the search index if asked (after the
+    VACUUM, which may renumber the rowids it refers to), then records the
+    immutable marker and the mmap window for the final file size.
+    """
+    conn.execute(f"PRAGMA page_size = {int(page_size)}")
+    conn.execute("VACUUM")
+    if search_index:
+        _build_search_index(conn)
+
+    # The mmap window covers the whole final file, rounded up to 64 MB
+    window = 64 * 1024 * 1024
+    size = Path(db_path).stat().st_size
+    values = {
+        **(metadata or {}),
+        'immutable': 1,
+        'page_size': page_size,
+        'mmap_size': max(1, -(-size // window)) * window,
+        'sealed_at': datetime.now().isoformat(),
+    }
+    _write_metadata(conn, values)
+    conn.commit()
+
+
+def _build_search_index(conn: sqlite3.Connection):
+    from src.utils.search import build_search_index
+    try:
+        build_search_index(conn)
+    except sqlite3.OperationalError as e:
+        # SQLite builds without FTS5 report "no such module: fts5"
+        if 'fts5' not in str(e):
+            raise
+        logger.warning(f"Search index skipped: this SQLite has no FTS5 ({e})")
+
+
+def is_duckdb_file(db_path: str) -> bool:
+    """Whether ``db_path`` is a DuckDB database file (written by ``--backend duckdb``)."""
+    try:
+        with open(db_path, 'rb') as f:
+            return f.read(12)[8:12] == b'DUCK'
+    except OSError:
+        return False
+
+
+def require_sqlite(db_path: str):
+    """Raise ``ValueError`` for DuckDB files, which SQLite-only tools cannot read."""
+    if is_duckdb_file(db_path):
+        raise ValueError(
+            f"{db_path} is a DuckDB database; only validation (src/utils/validate.py) "
+            "reads DuckDB output, other tools need a SQLite build"
+        )
+
+
+def read_metadata(db_path: str) -> Dict[str, str]:
+    """Build metadata stored in a database file (empty if it was never sealed)."""
+    require_sqlite(db_path)
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (METADATA_TABLE,)
+        ).fetchone()
+        if not exists:
+            return {}
+        return dict(conn.execute(f"SELECT key, value FROM {METADATA_TABLE}").fetchall())
+    finally:
+        conn.close()
+
+
+def open_readonly(db_path: str, immutable: Optional[bool] = None,
+                  mmap_size: Optional[int] = None, **connect_options) -> sqlite3.Connection:
+    """
+    Open a generated database for reading.
+
+    Sealed files (see :meth:`Database.seal`) are opened with
+    ``immutable=1``, which skips file locking and change detection, and
+    memory-mapped, so every process on a host reads the same OS page
+    cache without copying. ``immutable`` and ``mmap_size`` override what
+    the file's metadata asks for; extra options go to ``sqlite3.connect``.
+    """
+    metadata = read_metadata(db_path)
+    if immutable is None:
+        immutable = metadata.get('immutable') == '1'
+    if mmap_size is None:
+        mmap_size = int(metadata.get('mmap_size', 0))
+
+    uri = f"file:{db_path}?mode=ro" + ("&immutable=1" if immutable else "")
+    conn = sqlite3.connect(uri, uri=True, **connect_options)
+    if mmap_size:
+        conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+    return conn
+
+
+class StorageBackend:
+    """
+    Interface every storage engine implements.
+
+    Covers schema initialization, single-row insert, bulk append,
+    queries, commits and table statistics. Row counts are maintained on
+    the write path and stored in ``_table_stats`` with every commit, so
+    statistics never require a table scan.
+    """
+
+    name = ''
+    # Cleared when another thread writes through the connection (see src.utils.writer)
+    check_same_thread = True
+
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.conn = None
-        
+        self.row_counts: Dict[str, int] = {table: 0 for table in TABLES}
+        self._dirty_counts = set()
+        self.commits = 0
+
+    def connect(self):
+        """Establish database connection."""
+        raise NotImplementedError
+
+    def initialize_schema(self, schema_path: str):
+        """Initialize database schema from SQL file."""
+        raise NotImplementedError
+
+    def insert(self, table: str, data: Dict[str, Any]):
+        """Insert a single row into a table."""
+        self.append(table, [data])
+
+    def append(self, table: str, rows: List[Dict[str, Any]]):
+        """Bulk-append rows sharing the same columns to a table."""
+        if not rows:
+            return
+
+        columns = list(rows[0].keys())
+        self.append_tuples(
+            table, columns,
+            [tuple(_to_storage(row[col]) for col in columns) for row in rows]
+        )
+
+    def append_entities(self, table: str, entities: Sequence[Any]):
+        """Bulk-append model entities through the table's precompiled codec."""
+        if not entities:
+            return
+
+        # Imported here so the storage layer does not depend on the models
+        from src.utils.codecs import codec_for
+        codec = codec_for(table)
+        self.append_tuples(table, codec.columns, codec.encode_many(entities))
+
+    def append_tuples(self, table: str, columns: Sequence[str], rows: List[tuple]):
+        """Bulk-append already-encoded parameter tuples in ``columns`` order."""
+        raise NotImplementedError
+
+    def insert_many(self, table: str, data_list: List[Dict[str, Any]]):
+        """Insert multiple rows into a table and commit."""
+        if not data_list:
+            return
+
+        self.append(table, data_list)
+        self.commit()
+        logger.info(f"Inserted {len(data_list)} rows into {table}")
+
+    def query(self, sql: str, params: tuple = ()) -> List[Any]:
+        """Execute a SELECT query."""
+        raise NotImplementedError
+
+    def commit(self):
+        """Commit current transaction."""
+        raise NotImplementedError
+
+    def close(self):
+        """Close database connection."""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+            logger.info("Database connection closed")
+
+    def analyze(self):
+        """Refresh query planner statistics after a bulk load."""
+        self.conn.execute("ANALYZE")
+
+    def apply_index_profile(self, profile: str):
+        """Switch secondary indexes to a named profile, where the engine supports it."""
+        logger.debug(f"{self.name} backend keeps its schema indexes (profile '{profile}' ignored)")
+
+    def write_metadata(self, values: Dict[str, Any]):
+        """Record build metadata in the ``_metadata`` table."""
+        _write_metadata(self.conn, values)
+
+    def seal(self, page_size: int, metadata: Optional[Dict[str, Any]] = None,
+             search_index: bool = False):
+        """Rewrite the finished database for read-only use, where the engine supports it."""
+        logger.debug(f"{self.name} backend does not support sealing")
+        if search_index:
+            self.build_search_index()
+
+    def build_search_index(self):
+        """Build the full-text indexes, where the engine supports them."""
+        logger.debug(f"{self.name} backend does not support the FTS5 search index")
+
+    def size_bytes(self) -> int:
+        """Current database size in bytes."""
+        path = Path(self.db_path)
+        return path.stat().st_size if path.exists() else 0
+
+    def page_count(self) -> int:
+        """Number of database pages, where the engine exposes it."""
+        return 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get row counts for all tables."""
+        return {table: self.row_counts.get(table, 0) for table in TABLES}
+
+    def _count(self, table: str, rows: int):
+        """Record rows written to a table."""
+        self.row_counts[table] = self.row_counts.get(table, 0) + rows
+        self._dirty_counts.add(table)
+
+    def _init_row_counts(self):
+        """Create the stats table and load any counts already stored."""
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {STATS_TABLE} ("
+            "table_name TEXT PRIMARY KEY, row_count INTEGER NOT NULL)"
+        )
+        for table, count in self.conn.execute(
+                f"SELECT table_name, row_count FROM {STATS_TABLE}").fetchall():
+            self.row_counts[table] = count
+
+    def _save_row_counts(self):
+        """Write changed counters; called inside the transaction being committed."""
+        if not self._dirty_counts:
+            return
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO {STATS_TABLE} (table_name, row_count) VALUES (?, ?)",
+            [(table, self.row_counts[table]) for table in sorted(self._dirty_counts)]
+        )
+        self._dirty_counts.clear()
+
+
+class Database(StorageBackend):
+    """
+    SQLite database manager.
+
+    With ``in_memory=True`` all stages run against ``:memory:`` and the
+    result is written to ``db_path`` in one pass by :meth:`persist`. If the
+    in-memory database outgrows ``memory_budget_mb`` it is spilled to
+    ``db_path`` and the build continues on disk.
+
+    With ``layout='compact'`` keys are stored as integers (see
+    :mod:`src.utils.layouts`); rows are still written with GIDs and
+    translated on append.
+
+    With ``dictionary_text=True`` highly repeated text columns are stored
+    as ids into a shared ``_text`` table behind views with the original
+    table names (see :mod:`src.utils.dictionary`); rows are encoded on
+    append.
+    """
+
+    name = 'sqlite'
+
+    # Pages copied per backup step (~4 MB with the default page size)
+    BACKUP_PAGES_PER_STEP = 1024
+
+    # Rows sampled per index by ANALYZE; bounds its cost on large tables
+    ANALYSIS_LIMIT = 1000
+
+    def __init__(self, db_path: str, in_memory: bool = False,
+                 memory_budget_mb: Optional[int] = None, layout: str = 'standard',
+                 dictionary_text: bool = False):
+        from src.utils.layouts import LAYOUTS
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout '{layout}' (choose from: {', '.join(LAYOUTS)})")
+
+        super().__init__(db_path)
+        self.in_memory = in_memory
+        self.memory_budget_mb = memory_budget_mb
+        self.layout = layout
+        self.dictionary_text = dictionary_text
+        self.keys = None
+        self.text = None
+        self.schema_path = None
+
     def connect(self):
         """Establish database connection."""
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(self.db_path)
+        if self.in_memory:
+            self.conn = sqlite3.connect(':memory:', check_same_thread=self.check_same_thread)
+            logger.info(f"Connected to in-memory database (persisting to {self.db_path})")
+        else:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=self.check_same_thread)
+            logger.info(f"Connected to database: {self.db_path}")
         self.conn.row_factory = sqlite3.Row
-        logger.info(f"Connected to database: {self.db_path}")
-        
+
     def initialize_schema(self, schema_path: str):
         """Initialize database schema from SQL file."""
-        with open(schema_path, 'r') as f:
-            schema_sql = f.read()
-        
+        self.schema_path = schema_path
+        if self.layout == 'compact':
+            from src.utils.layouts import KeyMapper
+            from src.utils.schema_info import load_schema
+            self.keys = KeyMapper(load_schema(schema_path))
+
+        if self.dictionary_text:
+            from src.utils.dictionary import TextDictionary, dictionary_schema_sql
+            schema_sql = dictionary_schema_sql(schema_path, self.layout)
+            self.text = TextDictionary()
+        elif self.layout == 'compact':
+            from src.utils.layouts import compact_schema_sql
+            schema_sql = compact_schema_sql(schema_path)
+        else:
+            with open(schema_path, 'r') as f:
+                schema_sql = f.read()
+
         self.conn.executescript(schema_sql)
+        self._init_row_counts()
         self.conn.commit()
-        logger.info("Database schema initialized")
-        
-    def insert(self, table: str, data: Dict[str, Any]):
-        """Insert a single row into a table."""
-        # Convert datetime objects to ISO format strings
-        processed_data = {}
-        for key, value in data.items():
-            if hasattr(value, 'isoformat'):
-                processed_data[key] = value.isoformat()
-            elif isinstance(value, (dict, list)):
-                processed_data[key] = json.dumps(value)
-            else:
-                processed_data[key] = value
-        
-        columns = ', '.join(processed_data.keys())
-        placeholders = ', '.join(['?' for _ in processed_data])
-        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
-        
+        logger.info(f"Database schema initialized ({self.layout} layout"
+                    f"{', dictionary-encoded text' if self.text else ''})")
+
+    def append_tuples(self, table: str, columns: Sequence[str], rows: List[tuple]):
+        """Bulk-append already-encoded parameter tuples in ``columns`` order."""
+        if not rows:
+            return
+
+        if self.keys is not None:
+            columns, rows = self.keys.map_rows(table, columns, rows)
+
+        target = table
+        if self.text is not None:
+            rows, new_values = self.text.encode_rows(table, columns, rows)
+            if new_values:
+                self.conn.executemany(self.text.insert_sql, new_values)
+            target = self.text.storage_table(table)
+
+        placeholders = ', '.join(['?' for _ in columns])
+        query = f"INSERT INTO {target} ({', '.join(columns)}) VALUES ({placeholders})"
+
         try:
-            self.conn.execute(query, list(processed_data.values()))
+            self.conn.executemany(query, rows)
         except sqlite3.IntegrityError as e:
             logger.warning(f"Integrity error inserting into {table}: {e}")
             raise
-            
-    def insert_many(self, table: str, data_list: List[Dict[str, Any]]):
-        """Insert multiple rows into a table."""
-        if not data_list:
-            return
-            
-        for data in data_list:
-            self.insert(table, data)
-        
-        self.conn.commit()
-        logger.info(f"Inserted {len(data_list)} rows into {table}")
-        
+
+        self._count(table, len(rows))
+
     def query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
         """Execute a SELECT query."""
         cursor = self.conn.execute(sql, params)
         return cursor.fetchall()
-        
+
     def commit(self):
         """Commit current transaction."""
+        self._save_row_counts()
+        self.conn.commit()
+        self.commits += 1
+        if self.in_memory and self.memory_budget_mb:
+            self._check_memory_budget()
+
+    def analyze(self):
+        """Refresh sqlite_stat1 so query plans are good from the first query."""
+        self.conn.execute(f"PRAGMA analysis_limit = {self.ANALYSIS_LIMIT}")
+        self.conn.execute("ANALYZE")
+        self.conn.commit()
+        logger.info("Planner statistics updated")
+
+    def apply_index_profile(self, profile: str):
+        """Drop and create secondary indexes to match a profile (see :mod:`src.utils.indexes`)."""
+        from src.utils.indexes import apply_profile
+        self._save_row_counts()
+        apply_profile(self.conn, profile, self.schema_path)
+
+    def seal(self, page_size: int, metadata: Optional[Dict[str, Any]] = None,
+             search_index: bool = False):
+        """
+        Rewrite the finished database file for read-only use.
+
+        VACUUMs the file at ``page_size`` (defragmented, no free pages),
+        builds the search index if asked (after the VACUUM, which may
+        renumber the rowids the index refers to), and only then records in
+        ``_metadata`` that the file is immutable and how much of it to
+        memory-map; :func:`open_readonly` applies both. Call after
+        :meth:`persist` for in-memory builds. Nothing writes the file after
+        this, and it must not be modified while readers have it open.
+        """
+        self._save_row_counts()
+        self.conn.commit()
+        conn = sqlite3.connect(self.db_path) if self.in_memory else self.conn
+
+        try:
+            seal_file(conn, self.db_path, page_size, metadata, search_index)
+        finally:
+            if conn is not self.conn:
+                conn.close()
+
+        size = Path(self.db_path).stat().st_size
+        logger.info(f"Sealed {self.db_path} for read-only use "
+                    f"(page size {page_size}, {size / (1024 * 1024):.1f} MB)")
+
+    def build_search_index(self):
+        """
+        Build the FTS5 indexes (see :mod:`src.utils.search`) in the database file.
+
+        For unsealed builds; :meth:`seal` builds them itself after its
+        VACUUM. Runs after :meth:`persist` for in-memory builds.
+        """
+        self._save_row_counts()
         self.conn.commit()
-        
+        conn = sqlite3.connect(self.db_path) if self.in_memory else self.conn
+        try:
+            _build_search_index(conn)
+        finally:
+            if conn is not self.conn:
+                conn.close()
+
+    def page_count(self) -> int:
+        """Number of database pages."""
+        return self.conn.execute("PRAGMA page_count").fetchone()[0]
+
+    def size_bytes(self) -> int:
+        """Current database size in bytes."""
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        return self.page_count() * page_size
+
+    def _check_memory_budget(self):
+        """Spill the in-memory database to disk once it exceeds the budget."""
+        size_mb = self.size_bytes() / (1024 * 1024)
+        if size_mb <= self.memory_budget_mb:
+            return
+
+        logger.warning(
+            f"In-memory database is {size_mb:.0f} MB (budget {self.memory_budget_mb} MB); "
+            f"continuing on disk at {self.db_path}"
+        )
+        self.persist()
+        self.conn.close()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=self.check_same_thread)
+        self.conn.row_factory = sqlite3.Row
+        self.in_memory = False
+
+    def persist(self, progress: Optional[Callable[[int, int, int], None]] = None):
+        """
+        Copy the in-memory database to ``db_path`` with the backup API.
+
+        ``progress`` is called as ``progress(status, remaining, total)``
+        after each step; by default progress is logged.
+        """
+        if not self.in_memory:
+            return
+
+        self.conn.commit()
+        target = Path(self.db_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            target.unlink()
+
+        def log_progress(status: int, remaining: int, total: int):
+            done = total - remaining
+            logger.info(f"Persisting database: {done}/{total} pages ({done / max(total, 1):.0%})")
+
+        dest = sqlite3.connect(str(target))
+        try:
+            self.conn.backup(dest, pages=self.BACKUP_PAGES_PER_STEP,
+                             progress=progress or log_progress)
+        finally:
+            dest.close()
+
+        logger.info(f"Persisted in-memory database to {self.db_path}")
+
+
+class DuckDBBackend(StorageBackend):
+    """
+    Embedded DuckDB storage engine.
+
+    Appended rows are buffered per table and loaded in bulk through Arrow
+    ingest when pyarrow is available, falling back to executemany.
+    """
+
+    name = 'duckdb'
+
+    # Buffered rows per table before an automatic flush
+    FLUSH_ROWS = 50000
+
+    def __init__(self, db_path: str):
+        super().__init__(db_path)
+        # Per table: (columns, encoded rows)
+        self._buffers: Dict[str, tuple] = {}
+
+    def connect(self):
+        """Establish database connection."""
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("duckdb is required for the DuckDB backend (pip install duckdb)")
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = duckdb.connect(self.db_path)
+        logger.info(f"Connected to DuckDB database: {self.db_path}")
+
+    def initialize_schema(self, schema_path: str):
+        """Initialize database schema from SQL file."""
+        with open(schema_path, 'r') as f:
+            schema_sql = f.read()
+
+        self.conn.execute(schema_sql)
+        self._init_row_counts()
+        logger.info("Database schema initialized")
+
+    def append_tuples(self, table: str, columns: Sequence[str], rows: List[tuple]):
+        """Buffer encoded rows for bulk loading."""
+        if not rows:
+            return
+
+        columns = tuple(columns)
+        buffered = self._buffers.get(table)
+        if buffered is not None and buffered[0] != columns:
+            self.flush()
+            buffered = None
+        if buffered is None:
+            buffered = self._buffers[table] = (columns, [])
+        buffered[1].extend(rows)
+
+        if len(buffered[1]) >= self.FLUSH_ROWS:
+            self.flush()
+
+    def flush(self):
+        """Load all buffered rows, parents first."""
+        # Dicts keep insertion order, which follows generation (FK) order
+        for table, (columns, rows) in self._buffers.items():
+            if rows:
+                self._load(table, columns, rows)
+        self._buffers.clear()
+
+    def _load(self, table: str, columns: Sequence[str], rows: List[tuple]):
+        """Bulk-load encoded rows into a table."""
+        column_list = ', '.join(columns)
+
+        try:
+            import pyarrow as pa
+        except ImportError:
+            pa = None
+
+        if pa is not None:
+            batch = pa.table(dict(zip(columns, map(list, zip(*rows)))))
+            self.conn.register('_append_batch', batch)
+            try:
+                self.conn.execute(
+                    f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM _append_batch"
+                )
+            finally:
+                self.conn.unregister('_append_batch')
+        else:
+            placeholders = ', '.join(['?' for _ in columns])
+            self.conn.executemany(
+                f"INSERT INTO {table} ({column_list}) VALUES ({placeholders})",
+                rows
+            )
+
+        self._count(table, len(rows))
+
+    def query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Execute a SELECT query."""
+        self.flush()
+        return self.conn.execute(sql, params).fetchall()
+
+    def commit(self):
+        """Commit current transaction."""
+        # DuckDB runs in autocommit mode; committing means flushing buffers
+        self.flush()
+        self._save_row_counts()
+        self.commits += 1
+
     def close(self):
         """Close database connection."""
         if self.conn:
-            self.conn.close()
-            logger.info("Database connection closed")
-            
-    def get_stats(self) -> Dict[str, int]:
-        """Get row counts for all tables."""
-        tables = [
-            'organizations', 'teams', 'users', 'team_memberships',
-            'projects', 'sections', 'tasks', 'comments',
-            'custom_field_definitions', 'custom_field_values',
-            'tags', 'task_tags', 'attachments'
-        ]
-        
-        stats = {}
-        for table in tables:
-            result = self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
-            stats[table] = result[0]
-            
-        return stats
\ No newline at end of file
+            self.flush()
+        super().close()
+
+    def export_parquet(self, output_dir: str):
+        """Write every table to Parquet with DuckDB's native writer."""
+        self.flush()
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        for table in TABLES:
+            path = Path(output_dir) / f"{table}.parquet"
+            self.conn.execute(f"COPY {table} TO '{path}' (FORMAT PARQUET, COMPRESSION ZSTD)")
+            logger.info(f"Exported {table} to {path}")
+
+
+BACKENDS = {
+    'sqlite': Database,
+    'duckdb': DuckDBBackend,
+}
+
+
+def create_backend(name: str, db_path: str, **options) -> StorageBackend:
+    """Instantiate a storage backend by name, passing engine-specific options."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}' (choose from: {', '.join(BACKENDS)})")
+    return BACKENDS[name](db_path, **options)
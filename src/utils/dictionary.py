@@ -0,0 +1,158 @@
+"""Dictionary-encoded storage for highly repeated text columns.
+
+Generated text repeats heavily: a few dozen task names, one description
+template, five departments. With ``--dictionary-text`` each distinct
+value of the columns in :data:`DICTIONARY_COLUMNS` is stored once in the
+shared ``_text`` table and rows hold its integer id.
+
+An encoded table is stored as ``<table>_data`` and fronted by a view
+under the original name with the original columns, so every query,
+export and check keeps working unchanged. The view decodes a column with
+a ``_text`` primary-key lookup only when a query reads that column.
+"""
+import re
+import sqlite3
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.utils.schema_info import SCHEMA_PATH, load_schema
+
+# Shared value table, and the suffix of the tables behind the views
+TEXT_TABLE = '_text'
+DATA_SUFFIX = '_data'
+
+TEXT_TABLE_SQL = (f"CREATE TABLE {TEXT_TABLE} ("
+                  "text_id INTEGER PRIMARY KEY, value TEXT NOT NULL UNIQUE)")
+
+# Columns with few distinct values relative to their row count; short
+# enumerations such as priority or color save less than their lookup costs
+DICTIONARY_COLUMNS = {
+    'users': ['job_title', 'department'],
+    'projects': ['description'],
+    'sections': ['name'],
+    'tasks': ['name', 'description'],
+    'comments': ['text'],
+    'task_activity': ['activity_type'],
+}
+
+
+def encoded_table_sql(table: str, sql: str, columns: Sequence[str]) -> str:
+    """Rename a table definition to ``<table>_data`` with ``columns`` as ``_text`` ids."""
+    sql, count = re.subn(rf"\b{table}\s*\(", f"{table}{DATA_SUFFIX} (", sql, count=1)
+    if count != 1:
+        raise ValueError(f"Cannot rename table {table} for dictionary encoding")
+
+    for column in columns:
+        pattern = re.compile(rf"^(\s*){column}\s+TEXT\b(.*?)(,?)(\s*--.*)?$", re.MULTILINE)
+        replacement = rf"\g<1>{column} INTEGER\g<2> REFERENCES {TEXT_TABLE}(text_id)\g<3>"
+        sql, count = pattern.subn(replacement, sql, count=1)
+        if count != 1:
+            raise ValueError(f"Cannot dictionary-encode column {table}.{column}")
+    return sql
+
+
+def retarget_index(sql: str, table: str) -> str:
+    """Point a CREATE INDEX on ``table`` at ``<table>_data``."""
+    return re.sub(rf"\bON\s+{table}\s*\(", f"ON {table}{DATA_SUFFIX}(", sql, count=1)
+
+
+def select_sql(table: str, columns: Sequence[str], encoded: Sequence[str],
+               rowid: bool = False) -> str:
+    """SELECT over ``<table>_data`` returning the original columns, optionally with the rowid."""
+    selected = ['d.rowid AS rowid'] if rowid else []
+    for column in columns:
+        if column in encoded:
+            selected.append(f"(SELECT value FROM {TEXT_TABLE} WHERE text_id = d.{column}) AS {column}")
+        else:
+            selected.append(f"d.{column}")
+    return f"SELECT {', '.join(selected)} FROM {table}{DATA_SUFFIX} d"
+
+
+def dictionary_schema_sql(schema_path: str = str(SCHEMA_PATH), layout: str = 'standard') -> str:
+    """
+    Full DDL script with dictionary-encoded tables, indexes included.
+
+    Encoded tables are renamed, their indexes move with them, and a view
+    with the original name and columns is added for each.
+    """
+    from src.utils.layouts import compact_table_sql
+
+    statements = [TEXT_TABLE_SQL]
+    conn = sqlite3.connect(':memory:')
+    try:
+        for table, info in load_schema(schema_path).items():
+            sql = compact_table_sql(info) if layout == 'compact' else info.sql
+            columns = DICTIONARY_COLUMNS.get(table)
+            if not columns:
+                statements.append(sql)
+                statements.extend(info.indexes)
+                continue
+
+            sql = encoded_table_sql(table, sql, columns)
+            # Column order of the stored table (the compact layout adds gid)
+            conn.execute(sql)
+            names = [row[1] for row in conn.execute(f"PRAGMA table_info({table}{DATA_SUFFIX})")]
+            statements.append(sql)
+            statements.extend(retarget_index(index, table) for index in info.indexes)
+            statements.append(f"CREATE VIEW {table} AS {select_sql(table, names, columns)}")
+    finally:
+        conn.close()
+    return ';\n\n'.join(statements) + ';\n'
+
+
+def encoded_columns(conn: sqlite3.Connection) -> Dict[str, List[str]]:
+    """Dictionary-encoded tables of an open database -> their encoded columns."""
+    views = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'view'")}
+    result = {}
+    for table in views:
+        columns = [
+            row[3] for row in conn.execute(f"PRAGMA foreign_key_list({table}{DATA_SUFFIX})")
+            if row[2] == TEXT_TABLE
+        ]
+        if columns:
+            result[table] = columns
+    return result
+
+
+class TextDictionary:
+    """
+    Value -> id map applied on the write path.
+
+    Ids are assigned in first-seen order. New values are returned with the
+    encoded rows so the caller inserts them into ``_text`` in the same
+    transaction. Every distinct value is held once, so the map also
+    interns the strings of all rows written through it.
+    """
+
+    insert_sql = f"INSERT INTO {TEXT_TABLE} (text_id, value) VALUES (?, ?)"
+
+    def __init__(self, columns: Optional[Dict[str, List[str]]] = None):
+        self.columns = DICTIONARY_COLUMNS if columns is None else columns
+        self.ids: Dict[str, int] = {}
+
+    def storage_table(self, table: str) -> str:
+        """Table rows of ``table`` are inserted into."""
+        return table + DATA_SUFFIX if table in self.columns else table
+
+    def encode_rows(self, table: str, columns: Sequence[str],
+                    rows: List[tuple]) -> Tuple[List[tuple], List[tuple]]:
+        """Replace encoded columns with ids; returns the rows and the new (id, value) pairs."""
+        positions = [columns.index(c) for c in self.columns.get(table, ()) if c in columns]
+        if not positions:
+            return rows, []
+
+        ids = self.ids
+        new_values = []
+        encoded = []
+        for row in rows:
+            row = list(row)
+            for index in positions:
+                value = row[index]
+                if value is None:
+                    continue
+                text_id = ids.get(value)
+                if text_id is None:
+                    text_id = ids[value] = len(ids) + 1
+                    new_values.append((text_id, value))
+                row[index] = text_id
+            encoded.append(tuple(row))
+        return encoded, new_values
@@ -2,11 +2,13 @@
 import numpy as np
 from typing import Tuple
 
+from src.utils.seeding import numpy_seed
+
 class DistributionGenerator:
     """Generate values from various statistical distributions."""
     
     def __init__(self, seed: int = 42):
-        self.rng = np.random.RandomState(seed)
+        self.rng = np.random.RandomState(numpy_seed(seed))
         
     def log_normal(self, median: float, percentile_90: float) -> float:
         """
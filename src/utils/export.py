@@ -0,0 +1,139 @@
+"""Columnar (Parquet) export of the generated database."""
+import logging
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from src.utils.database import require_sqlite
+from src.utils.schema_info import SCHEMA_PATH, TableInfo, load_schema, read_schema
+
+# Rows per Parquet record batch; bounds memory regardless of table size
+DEFAULT_BATCH_ROWS = 65536
+
+# Low-cardinality TEXT columns stored dictionary-encoded
+DICTIONARY_COLUMNS = {
+    'teams': ['team_type'],
+    'users': ['role', 'job_title', 'department'],
+    'projects': ['project_type', 'workflow_type', 'color', 'privacy_setting'],
+    'sections': ['name'],
+    'tasks': ['priority'],
+    'comments': ['comment_type'],
+    'custom_field_definitions': ['field_type'],
+    'tags': ['color'],
+    'attachments': ['file_type'],
+}
+
+
+def _arrow_type(table: str, column: str, decl_type: str):
+    """Map a schema.sql declared type to an Arrow type."""
+    if column in DICTIONARY_COLUMNS.get(table, []):
+        return pa.dictionary(pa.int32(), pa.string())
+    if decl_type == 'TIMESTAMP':
+        return pa.timestamp('us')
+    if decl_type == 'DATE':
+        return pa.date32()
+    if decl_type == 'BOOLEAN':
+        return pa.bool_()
+    if decl_type == 'INTEGER':
+        return pa.int64()
+    return pa.string()
+
+
+class ParquetExporter:
+    """Stream tables from a generated SQLite database into Parquet files."""
+
+    def __init__(self, output_dir: str, batch_rows: int = DEFAULT_BATCH_ROWS,
+                 compression: str = 'zstd', schema_path: str = str(SCHEMA_PATH)):
+        if pa is None:
+            raise ImportError("pyarrow is required for Parquet export (pip install pyarrow)")
+
+        self.output_dir = Path(output_dir)
+        self.batch_rows = batch_rows
+        self.compression = compression
+        self.tables = load_schema(schema_path)
+
+    def arrow_schema(self, table: str):
+        """Build the Arrow schema for a table."""
+        info = self.tables[table]
+        return pa.schema([
+            pa.field(
+                col.name,
+                _arrow_type(table, col.name, col.decl_type),
+                nullable=not (col.not_null or col.primary_key)
+            )
+            for col in info.columns
+        ])
+
+    def _to_array(self, values: list, arrow_type):
+        """Convert one column of SQLite values to an Arrow array."""
+        if pa.types.is_timestamp(arrow_type) or pa.types.is_date32(arrow_type):
+            # Stored as ISO-8601 text; parse through timestamp[us] in one pass
+            array = pa.array(values, type=pa.string()).cast(pa.timestamp('us'))
+            return array.cast(arrow_type)
+        if pa.types.is_boolean(arrow_type):
+            return pa.array(values, type=pa.int64()).cast(pa.bool_())
+        if pa.types.is_dictionary(arrow_type):
+            return pa.array(values, type=pa.string()).dictionary_encode()
+        return pa.array(values, type=arrow_type)
+
+    def export_table(self, conn: sqlite3.Connection, table: str) -> int:
+        """Export a single table. Returns the number of rows written."""
+        info: TableInfo = self.tables[table]
+        schema = self.arrow_schema(table)
+        columns = info.column_names
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"{table}.parquet"
+
+        cursor = conn.execute(f"SELECT {', '.join(columns)} FROM {table}")
+        total = 0
+
+        with pq.ParquetWriter(str(path), schema, compression=self.compression) as writer:
+            while True:
+                rows = cursor.fetchmany(self.batch_rows)
+                if not rows:
+                    break
+
+                arrays = [
+                    self._to_array([row[i] for row in rows], schema.field(i).type)
+                    for i in range(len(columns))
+                ]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                total += len(rows)
+
+        logger.info(f"Exported {total} rows from {table} to {path}")
+        return total
+
+    def export_database(self, db_path: str, tables: Optional[List[str]] = None) -> Dict[str, int]:
+        """Export every table (or the given subset) of a database."""
+        require_sqlite(db_path)
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            # Column types come from the file itself, so any storage layout exports
+            live = read_schema(conn)
+            self.tables = {name: live.get(name, info) for name, info in self.tables.items()}
+            return {
+                table: self.export_table(conn, table)
+                for table in (tables or list(self.tables))
+            }
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print("Usage: python -m src.utils.export <database_path> <output_dir>")
+        sys.exit(1)
+
+    logging.basicConfig(level=logging.INFO)
+    ParquetExporter(sys.argv[2]).export_database(sys.argv[1])
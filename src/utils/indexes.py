@@ -0,0 +1,310 @@
+"""Named secondary-index profiles and a workload-driven profile recommender.
+
+Profiles are expressed relative to the indexes declared in schema.sql:
+
+    minimal  constraint indexes only (PRIMARY KEY / UNIQUE); fastest bulk load
+    schema   the indexes declared in schema.sql
+    agent    schema.sql minus low-selectivity boolean indexes, plus the
+             composite indexes used by agent read paths
+
+Recommend a profile for a captured workload, or apply one directly:
+
+    python -m src.utils.indexes recommend output/asana_simulation.sqlite workload.sql
+    python -m src.utils.indexes apply output/asana_simulation.sqlite agent
+"""
+import argparse
+import json
+import logging
+import math
+import re
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.utils.database import read_metadata, require_sqlite, seal_file, unseal
+from src.utils.dictionary import encoded_columns, retarget_index
+from src.utils.schema_info import SCHEMA_PATH, load_schema
+
+logger = logging.getLogger(__name__)
+
+INDEX_PROFILES = {
+    'minimal': {'keep_declared': False, 'drop': [], 'add': {}},
+    'schema': {'keep_declared': True, 'drop': [], 'add': {}},
+    'agent': {
+        'keep_declared': True,
+        'drop': [
+            # Booleans split tables roughly in half; a scan is as fast
+            'idx_task_completed', 'idx_user_active', 'idx_project_archived',
+            # Prefixes of the composite indexes below
+            'idx_task_project', 'idx_task_assignee', 'idx_comment_task',
+        ],
+        'add': {
+            'idx_task_assignee_open': 'tasks(assignee_id, completed, due_date)',
+            'idx_task_project_section': 'tasks(project_id, section_id)',
+            'idx_comment_task_created': 'comments(task_id, created_at)',
+        },
+    },
+}
+
+# Relative plan costs used when scoring a workload
+SEARCH_COST = 1.0          # per log2(rows) of an index or rowid search
+TEMP_BTREE_FACTOR = 0.25   # sorting for ORDER BY / GROUP BY / DISTINCT
+COVERING_SCAN_FACTOR = 0.5 # full scan of an index narrower than the table
+
+
+def _normalize(sql: str) -> str:
+    return ' '.join(sql.split()).rstrip(';')
+
+
+def profile_indexes(profile: str, schema_path: str = str(SCHEMA_PATH)) -> Dict[str, str]:
+    """Index name -> CREATE INDEX statement for a profile."""
+    if profile not in INDEX_PROFILES:
+        raise ValueError(f"Unknown index profile '{profile}' (choose from: {', '.join(INDEX_PROFILES)})")
+    spec = INDEX_PROFILES[profile]
+
+    indexes = {}
+    if spec['keep_declared']:
+        for info in load_schema(schema_path).values():
+            for sql in info.indexes:
+                name = sql.split()[2]
+                if name not in spec['drop']:
+                    indexes[name] = _normalize(sql)
+    for name, target in spec['add'].items():
+        indexes[name] = f"CREATE INDEX {name} ON {target}"
+    return indexes
+
+
+def current_indexes(conn: sqlite3.Connection) -> Dict[str, str]:
+    """Secondary indexes present in a database (constraint indexes excluded)."""
+    return {
+        name: _normalize(sql)
+        for name, sql in conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+        )
+    }
+
+
+def apply_profile(conn: sqlite3.Connection, profile: str,
+                  schema_path: str = str(SCHEMA_PATH)) -> Dict[str, List[str]]:
+    """Drop and create indexes so the database matches a profile."""
+    target = profile_indexes(profile, schema_path)
+    # Indexes of dictionary-encoded tables live on the tables behind the views
+    for table in encoded_columns(conn):
+        target = {name: retarget_index(sql, table) for name, sql in target.items()}
+    existing = current_indexes(conn)
+
+    dropped = [name for name, sql in existing.items() if target.get(name) != sql]
+    created = [name for name, sql in target.items() if existing.get(name) != sql]
+
+    for name in dropped:
+        conn.execute(f"DROP INDEX {name}")
+    for name in created:
+        conn.execute(target[name])
+    conn.commit()
+
+    logger.info(f"Applied index profile '{profile}': "
+                f"{len(created)} created, {len(dropped)} dropped")
+    return {'created': created, 'dropped': dropped}
+
+
+# ----------------------------------------------------------------------
+# Workload capture and scoring
+# ----------------------------------------------------------------------
+
+@contextmanager
+def record_workload(conn: sqlite3.Connection, path: str):
+    """Append every SELECT run on ``conn`` inside the block to a workload file."""
+    with open(path, 'a') as f:
+        def trace(statement: str):
+            if statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+                f.write(_normalize(statement) + ';\n')
+
+        conn.set_trace_callback(trace)
+        try:
+            yield
+        finally:
+            conn.set_trace_callback(None)
+
+
+def load_workload(path: str) -> List[str]:
+    """Read ';'-separated statements; repeated statements weigh proportionally."""
+    with open(path) as f:
+        text = f.read()
+    return [_normalize(s) for s in text.split(';') if s.strip()]
+
+
+def _aliases(sql: str) -> Dict[str, str]:
+    """Map table aliases (and names) used in FROM/JOIN clauses to table names."""
+    keywords = {'WHERE', 'ON', 'JOIN', 'LEFT', 'INNER', 'CROSS', 'GROUP', 'ORDER',
+                'LIMIT', 'USING', 'NATURAL', 'UNION', 'HAVING'}
+    aliases = {}
+    for table, alias in re.findall(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", sql, re.I):
+        aliases[table] = table
+        if alias and alias.upper() not in keywords:
+            aliases[alias] = table
+    return aliases
+
+
+def _explain(conn: sqlite3.Connection, sql: str) -> List[str]:
+    """EXPLAIN QUERY PLAN details, binding NULL to any parameters."""
+    try:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    except sqlite3.ProgrammingError as e:
+        match = re.search(r"uses (\d+)", str(e))
+        if not match:
+            raise
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", (None,) * int(match.group(1))).fetchall()
+    return [row[3] for row in rows]
+
+
+def plan_cost(details: List[str], aliases: Dict[str, str], row_counts: Dict[str, int]) -> float:
+    """Relative cost of a query plan from its EXPLAIN QUERY PLAN lines."""
+    def rows_of(name: str) -> int:
+        return row_counts.get(aliases.get(name, name), 1)
+
+    cost = 0.0
+    largest = 1
+    for detail in details:
+        words = detail.split()
+        if words[0] in ('SCAN', 'SEARCH') and len(words) > 1:
+            rows = rows_of(words[1])
+            largest = max(largest, rows)
+            if words[0] == 'SEARCH':
+                cost += SEARCH_COST * math.log2(rows + 2)
+            elif 'COVERING INDEX' in detail:
+                cost += rows * COVERING_SCAN_FACTOR
+            else:
+                cost += rows
+            if 'AUTOMATIC' in detail:
+                # SQLite builds a transient index because a real one is missing
+                cost += rows
+        elif detail.startswith('USE TEMP B-TREE'):
+            cost += largest * TEMP_BTREE_FACTOR
+    return cost
+
+
+def _row_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+    return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+
+
+def recommend(db_path: str, workload: List[str], profiles: Optional[List[str]] = None,
+              schema_path: str = str(SCHEMA_PATH)) -> Dict:
+    """
+    Score each profile against a workload and pick the cheapest.
+
+    The database is copied into memory, each profile is applied and
+    analyzed there, and every statement is costed from its query plan.
+    Profiles whose read cost is within 1% of the best are tie-broken by
+    fewer indexes, since each index slows loading.
+    """
+    require_sqlite(db_path)
+    source = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    scratch = sqlite3.connect(':memory:')
+    try:
+        source.backup(scratch)
+    finally:
+        source.close()
+
+    row_counts = _row_counts(scratch)
+    results = {}
+    for profile in profiles or list(INDEX_PROFILES):
+        apply_profile(scratch, profile, schema_path)
+        scratch.execute("ANALYZE")
+        statements = []
+        for sql in workload:
+            details = _explain(scratch, sql)
+            statements.append({
+                'sql': sql,
+                'plan': details,
+                'cost': plan_cost(details, _aliases(sql), row_counts),
+            })
+        results[profile] = {
+            'read_cost': sum(s['cost'] for s in statements),
+            'indexes': len(profile_indexes(profile, schema_path)),
+            'statements': statements,
+        }
+    scratch.close()
+
+    best_cost = min(r['read_cost'] for r in results.values())
+    candidates = [p for p, r in results.items() if r['read_cost'] <= best_cost * 1.01]
+    best = min(candidates, key=lambda p: results[p]['indexes'])
+    return {'database': db_path, 'statements': len(workload),
+            'recommended': best, 'profiles': results}
+
+
+def apply_to_file(db_path: str, profile: str):
+    """
+    Apply a profile to a database file and refresh its planner statistics.
+
+    A sealed file is unsealed while its indexes change and sealed again
+    afterwards (VACUUM, search index, mmap window), so readers never see
+    stale metadata. It must not be open in readers meanwhile.
+    """
+    from src.utils.search import has_search_index
+
+    metadata = read_metadata(db_path)
+    sealed = metadata.get('immutable') == '1'
+    conn = sqlite3.connect(db_path)
+    try:
+        if sealed:
+            logger.info(f"{db_path} is sealed; it is resealed after the profile is applied")
+            unseal(conn)
+            conn.commit()
+        apply_profile(conn, profile)
+        conn.execute("ANALYZE")
+        conn.commit()
+        if sealed:
+            seal_file(conn, db_path, int(metadata['page_size']), {'index_profile': profile},
+                      search_index=has_search_index(conn))
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Index profiles for generated databases')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rec = commands.add_parser('recommend', help='Recommend a profile for a query workload')
+    rec.add_argument('db_path', help='Database path')
+    rec.add_argument('workload', help="File of ';'-separated SELECT statements")
+    rec.add_argument('--apply', action='store_true', help='Apply the recommended profile')
+    rec.add_argument('--json', dest='report_path', help='Write the full report to this path')
+
+    app = commands.add_parser('apply', help='Apply a profile')
+    app.add_argument('db_path', help='Database path')
+    app.add_argument('profile', choices=list(INDEX_PROFILES))
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if not Path(args.db_path).exists():
+        print(f"Error: Database not found: {args.db_path}")
+        return 1
+
+    if args.command == 'apply':
+        apply_to_file(args.db_path, args.profile)
+        return 0
+
+    report = recommend(args.db_path, load_workload(args.workload))
+    for profile, result in report['profiles'].items():
+        marker = '→' if profile == report['recommended'] else ' '
+        print(f"{marker} {profile:<10} read cost {result['read_cost']:>14,.1f}   "
+              f"{result['indexes']:>3} indexes")
+    print(f"\nRecommended profile: {report['recommended']}")
+
+    if args.report_path:
+        with open(args.report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.report_path}")
+
+    if args.apply:
+        apply_to_file(args.db_path, report['recommended'])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
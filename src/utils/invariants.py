@@ -0,0 +1,245 @@
+"""Online invariant checks applied to each batch before it is written."""
+import dataclasses
+import json
+import logging
+from datetime import datetime
+from itertools import compress
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.config import Config
+from src.utils.schema_info import load_schema
+
+logger = logging.getLogger(__name__)
+
+MODES = ('fail', 'quarantine', 'off')
+
+
+class InvariantViolation(ValueError):
+    """Raised in fail-fast mode when a batch breaks an invariant."""
+
+
+class InvariantChecker:
+    """
+    Vectorized per-batch data-quality checks.
+
+    Batches are lists of model entities. Each check reads whole columns
+    and evaluates its invariant as a NumPy mask over them; lookups of
+    string keys against earlier batches (emails, team rosters,
+    quarantined ids) are hash-set probes mapped over the column. In
+    ``fail`` mode the first violating batch aborts the run; in
+    ``quarantine`` mode offending rows (and later rows referencing them
+    through a foreign key) are diverted to a JSONL file instead of being
+    written.
+    """
+
+    # Minimum tasks seen before the due-date distribution is compared
+    DRIFT_MIN_TASKS = 2000
+    # Largest allowed absolute difference from the configured fractions
+    DRIFT_TOLERANCE = 0.05
+
+    def __init__(self, mode: str = 'fail', quarantine_path: Optional[str] = None,
+                 end_date: Optional[datetime] = None,
+                 due_date_distribution: Optional[Dict[str, float]] = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown invariant mode '{mode}' (choose from: {', '.join(MODES)})")
+
+        self.mode = mode
+        self.quarantine_path = quarantine_path
+        if quarantine_path:
+            Path(quarantine_path).unlink(missing_ok=True)
+        self.end_date = np.datetime64(end_date or Config.SIMULATION_END_DATE, 'us')
+        self.due_date_distribution = due_date_distribution or Config.DUE_DATE_DISTRIBUTION
+
+        schema = load_schema()
+        self._primary_keys = {
+            table: next((c.name for c in info.columns if c.primary_key), None)
+            for table, info in schema.items()
+        }
+        self._foreign_keys = {
+            table: [fk.column for fk in info.foreign_keys]
+            for table, info in schema.items()
+        }
+
+        # State carried across batches
+        self._emails: Set[str] = set()
+        self._project_team: Dict[str, str] = {}
+        self._memberships: Set[Tuple[str, str]] = set()
+        self._quarantined_ids: Set[str] = set()
+        self._due_counts = {'total': 0, 'none': 0, 'overdue': 0}
+        self._drift_reported = False
+
+        self.violations: Dict[str, int] = {}
+        self.quarantined = 0
+
+    # ------------------------------------------------------------------
+    # Column helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _column(rows: List[Any], name: str) -> np.ndarray:
+        return np.fromiter(map(attrgetter(name), rows), dtype=object, count=len(rows))
+
+    @staticmethod
+    def _times(rows: List[Any], name: str) -> np.ndarray:
+        return np.array(list(map(attrgetter(name), rows)), dtype='datetime64[us]')
+
+    @staticmethod
+    def _flags(rows: List[Any], name: str) -> np.ndarray:
+        return np.fromiter(map(attrgetter(name), rows), dtype=bool, count=len(rows))
+
+    @staticmethod
+    def _member(values, known: set) -> np.ndarray:
+        """Mask of ``values`` found in ``known``, probed without a Python-level loop."""
+        values = list(values)
+        return np.fromiter(map(known.__contains__, values), dtype=bool, count=len(values))
+
+    # ------------------------------------------------------------------
+    # Row-level invariants
+    # ------------------------------------------------------------------
+
+    def _check_users(self, rows):
+        emails = self._column(rows, 'email')
+        _, first_index = np.unique(emails, return_index=True)
+        in_batch = np.ones(len(rows), dtype=bool)
+        in_batch[first_index] = False  # Every occurrence after the first is a duplicate
+        seen = self._member(emails, self._emails)
+
+        yield 'duplicate_email', in_batch | seen
+        yield 'created_after_end', self._times(rows, 'created_at') > self.end_date
+
+    def _check_projects(self, rows):
+        created_at = self._times(rows, 'created_at')
+        yield 'created_after_end', created_at > self.end_date
+
+    def _check_tasks(self, rows):
+        created_at = self._times(rows, 'created_at')
+        completed_at = self._times(rows, 'completed_at')
+        modified_at = self._times(rows, 'modified_at')
+        completed = self._flags(rows, 'completed')
+
+        yield 'created_after_end', created_at > self.end_date
+        yield 'completed_without_timestamp', completed & np.isnat(completed_at)
+        yield 'completed_before_created', completed_at < created_at
+        yield 'completed_after_end', completed_at > self.end_date
+        yield 'modified_before_created', modified_at < created_at
+
+        # (team, assignee) pairs probed against the membership set: the cost
+        # depends on the batch size, not on the size of the rosters
+        assignees = self._column(rows, 'assignee_id')
+        teams = self._column(rows, 'project_id')
+        teams = np.fromiter(map(self._project_team.get, teams), dtype=object, count=len(rows))
+        member = self._member(zip(teams, assignees), self._memberships)
+        yield 'assignee_outside_team', (teams != None) & (assignees != None) & ~member  # noqa: E711
+
+    def _check_task_activity(self, rows):
+        yield 'created_after_end', self._times(rows, 'created_at') > self.end_date
+
+    # ------------------------------------------------------------------
+    # State tracking and distribution drift
+    # ------------------------------------------------------------------
+
+    def _observe(self, table: str, rows: List[Any]):
+        """Record accepted rows needed by later checks."""
+        if table == 'users':
+            self._emails.update(map(attrgetter('email'), rows))
+        elif table == 'team_memberships':
+            self._memberships.update(zip(map(attrgetter('team_id'), rows),
+                                         map(attrgetter('user_id'), rows)))
+        elif table == 'projects':
+            self._project_team.update(zip(map(attrgetter('project_id'), rows),
+                                          map(attrgetter('team_id'), rows)))
+        elif table == 'tasks':
+            due = self._times(rows, 'due_date')
+            self._due_counts['total'] += len(rows)
+            self._due_counts['none'] += int(np.isnat(due).sum())
+            self._due_counts['overdue'] += int((due < self._times(rows, 'created_at')).sum())
+            self._check_due_date_drift()
+
+    def _check_due_date_drift(self):
+        total = self._due_counts['total']
+        if total < self.DRIFT_MIN_TASKS or self._drift_reported:
+            return
+
+        for bucket, key in (('no_due_date', 'none'), ('overdue', 'overdue')):
+            expected = self.due_date_distribution[bucket]
+            actual = self._due_counts[key] / total
+            if abs(actual - expected) > self.DRIFT_TOLERANCE:
+                message = (f"Due-date drift: {bucket} is {actual:.1%} after {total} tasks "
+                           f"(configured {expected:.1%})")
+                self.violations['due_date_drift'] = self.violations.get('due_date_drift', 0) + 1
+                if self.mode == 'fail':
+                    raise InvariantViolation(message)
+                logger.warning(message)
+                self._drift_reported = True
+
+    # ------------------------------------------------------------------
+    # Entry point
+    # ------------------------------------------------------------------
+
+    def check(self, table: str, rows: List[Any]) -> List[Any]:
+        """Validate a batch and return the rows that may be written."""
+        if self.mode == 'off' or not rows:
+            return rows
+
+        bad = np.zeros(len(rows), dtype=bool)
+        reasons: Dict[str, np.ndarray] = {}
+
+        checker = getattr(self, f"_check_{table}", None)
+        if checker is not None:
+            for name, mask in checker(rows):
+                if mask.any():
+                    reasons[name] = mask
+                    bad |= mask
+
+        # Rows referencing quarantined rows cannot be written either
+        if self._quarantined_ids:
+            for column in self._foreign_keys.get(table, []):
+                mask = self._member(map(attrgetter(column), rows), self._quarantined_ids)
+                if mask.any():
+                    reasons[f"references_quarantined_{column}"] = mask
+                    bad |= mask
+
+        for name, mask in reasons.items():
+            key = f"{table}.{name}"
+            self.violations[key] = self.violations.get(key, 0) + int(mask.sum())
+
+        if not bad.any():
+            self._observe(table, rows)
+            return rows
+
+        if self.mode == 'fail':
+            pk = self._primary_keys.get(table)
+            details = ', '.join(
+                f"{name} x{int(mask.sum())} (e.g. {getattr(rows[int(np.argmax(mask))], pk)})"
+                for name, mask in reasons.items()
+            )
+            raise InvariantViolation(f"Invariant violations in {table} batch: {details}")
+
+        good = list(compress(rows, (~bad).tolist()))
+        self._quarantine(table, rows, bad, reasons)
+        self._observe(table, good)
+        return good
+
+    def _quarantine(self, table: str, rows: List[Any], bad: np.ndarray,
+                    reasons: Dict[str, np.ndarray]):
+        pk = self._primary_keys.get(table)
+        indices = np.flatnonzero(bad)
+
+        if pk:
+            self._quarantined_ids.update(map(attrgetter(pk), compress(rows, bad.tolist())))
+        self.quarantined += len(indices)
+        logger.warning(f"Quarantined {len(indices)} of {len(rows)} {table} rows")
+
+        if self.quarantine_path:
+            with open(self.quarantine_path, 'a') as f:
+                for i in indices:
+                    record = {
+                        'table': table,
+                        'violations': [name for name, mask in reasons.items() if mask[i]],
+                        'row': dataclasses.asdict(rows[i]),
+                    }
+                    f.write(json.dumps(record, default=str) + '\n')
@@ -0,0 +1,125 @@
+"""Storage layouts: the GID-keyed schema.sql and a compact integer-keyed variant."""
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.utils.schema_info import SCHEMA_PATH, TableInfo, load_schema
+
+# 'standard' stores schema.sql as written; 'compact' uses integer keys
+LAYOUTS = ('standard', 'compact')
+
+# Column holding the original GID of each row in the compact layout
+GID_COLUMN = 'gid'
+
+
+def _single_primary_key(info: TableInfo) -> Optional[str]:
+    keys = info.primary_key
+    return keys[0] if len(keys) == 1 else None
+
+
+def _key_columns(info: TableInfo) -> List[str]:
+    """Primary and foreign key columns of a table, which become INTEGER."""
+    columns = [fk.column for fk in info.foreign_keys]
+    pk = _single_primary_key(info)
+    if pk:
+        columns.insert(0, pk)
+    return columns
+
+
+def compact_table_sql(info: TableInfo) -> str:
+    """
+    Rewrite a table definition for the compact layout.
+
+    Key columns keep their names but become INTEGER, so joins and the
+    schema.sql indexes work unchanged; a single-column primary key becomes
+    the rowid alias and the GID moves to a UNIQUE ``gid`` column. Tables
+    with a composite primary key are stored WITHOUT ROWID.
+    """
+    sql = info.sql
+    pk = _single_primary_key(info)
+
+    for column in _key_columns(info):
+        pattern = re.compile(rf"^(\s*){column}\s+TEXT\b(.*)$", re.MULTILINE)
+        if column == pk:
+            replacement = rf"\g<1>{column} INTEGER\g<2>\n\g<1>{GID_COLUMN} TEXT NOT NULL UNIQUE,"
+        else:
+            replacement = rf"\g<1>{column} INTEGER\g<2>"
+        sql, count = pattern.subn(replacement, sql, count=1)
+        if count != 1:
+            raise ValueError(f"Cannot rewrite key column {info.name}.{column} for the compact layout")
+
+    if pk is None and info.primary_key:
+        sql += ' WITHOUT ROWID'
+    return sql
+
+
+def compact_schema_sql(schema_path: str = str(SCHEMA_PATH)) -> str:
+    """Full DDL script of the compact layout, indexes included."""
+    statements = []
+    for info in load_schema(schema_path).values():
+        statements.append(compact_table_sql(info))
+        statements.extend(info.indexes)
+    return ';\n\n'.join(statements) + ';\n'
+
+
+class KeyMapper:
+    """
+    Assign integer keys on the write path of the compact layout.
+
+    Every row gets the next integer key of its table, its GID is moved to
+    the ``gid`` column, and foreign keys are translated through the GID
+    maps of the referenced tables. Maps are only kept for tables that are
+    referenced by a foreign key.
+    """
+
+    def __init__(self, tables: Dict[str, TableInfo]):
+        self.primary_keys = {name: _single_primary_key(info) for name, info in tables.items()}
+        self.foreign_keys = {
+            name: {fk.column: fk.ref_table for fk in info.foreign_keys}
+            for name, info in tables.items()
+        }
+        referenced = {ref for fks in self.foreign_keys.values() for ref in fks.values()}
+        self._ids: Dict[str, Dict[str, int]] = {table: {} for table in referenced}
+        self._next: Dict[str, int] = {table: 1 for table in tables}
+
+    def lookup(self, table: str, gid: str) -> Optional[int]:
+        """Integer key of a GID, for tables referenced by a foreign key."""
+        return self._ids.get(table, {}).get(gid)
+
+    def map_rows(self, table: str, columns: Sequence[str],
+                 rows: List[tuple]) -> Tuple[Tuple[str, ...], List[tuple]]:
+        """Translate encoded rows to the compact layout."""
+        pk = self.primary_keys.get(table)
+        pk_index = columns.index(pk) if pk in columns else None
+        foreign = [
+            (columns.index(column), column, ref_table)
+            for column, ref_table in self.foreign_keys.get(table, {}).items()
+            if column in columns
+        ]
+        ids = self._ids.get(table)
+
+        mapped = []
+        next_id = self._next[table]
+        for row in rows:
+            row = list(row)
+            for index, column, ref_table in foreign:
+                gid = row[index]
+                if gid is not None:
+                    try:
+                        row[index] = self._ids[ref_table][gid]
+                    except KeyError:
+                        raise ValueError(
+                            f"{table}.{column} references unknown {ref_table} row {gid}"
+                        ) from None
+            if pk_index is not None:
+                gid = row[pk_index]
+                row[pk_index] = next_id
+                row.append(gid)
+                if ids is not None:
+                    ids[gid] = next_id
+                next_id += 1
+            mapped.append(tuple(row))
+        self._next[table] = next_id
+
+        if pk_index is not None:
+            columns = tuple(columns) + (GID_COLUMN,)
+        return tuple(columns), mapped
@@ -3,10 +3,19 @@ import random
 
 logger = logging.getLogger(__name__)
 
-try:
-    import openai
-except ImportError:
-    openai = None
+_openai = False  # Not yet imported
+
+
+def _load_openai():
+    """Import the optional openai package on first use (None if missing)."""
+    global _openai
+    if _openai is False:
+        try:
+            import openai
+            _openai = openai
+        except ImportError:
+            _openai = None
+    return _openai
 
 
 class LLMGenerator:
@@ -20,7 +29,7 @@ class LLMGenerator:
         self.temperature = temperature
         self.rng = random.Random(42)
 
-        if openai is None:
+        if _load_openai() is None:
             logger.warning("OpenAI not available. Using fallback text generation.")
 
     # -------- TASK NAME --------
@@ -0,0 +1,331 @@
+"""Replay agent access patterns against the mock Asana API at a target rate.
+
+    python -m src.utils.load_replay output/asana_simulation.sqlite --qps 200 --duration 30
+    python -m src.utils.load_replay output/asana_simulation.sqlite --url http://127.0.0.1:8080
+
+Each arrival is one agent interaction from :data:`FLOWS`, a short chain
+of requests where later steps follow gids from earlier responses (open a
+board, then a section, then a task). Users, projects and tasks are
+drawn with a power-law skew, so a few hot entities get most traffic.
+
+Arrivals are open-loop: interaction ``i`` is due at ``start + i / rate``
+whether or not earlier ones finished. The latency of a first request is
+measured from its due time, so a server that falls behind shows up as
+queueing delay instead of silently lowering the offered load.
+
+Without ``--url`` the mock server runs in the same event loop on a free
+port, which keeps everything offline but also shares one core between
+client and server; run ``python -m src.utils.mock_api`` separately for
+server-only numbers. Keep-alive connections are pooled (``--connections``).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.utils.api_export import ApiResources
+from src.utils.database import open_readonly
+from src.utils.mock_api import API_PREFIX, MockAsanaApi
+
+logger = logging.getLogger(__name__)
+
+# Interaction -> relative frequency
+FLOWS = {
+    'my_tasks': 0.35,
+    'task_detail': 0.30,
+    'board': 0.25,
+    'browse': 0.10,
+}
+
+# Entities sampled from the database for each kind
+SAMPLE_SIZE = 5000
+
+
+class ReplayError(RuntimeError):
+    """A response the replay cannot continue from."""
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class EntityPool:
+    """Gids to request, drawn so that low indexes are hot."""
+
+    def __init__(self, db_path: str, rng: random.Random, skew: float = 2.0):
+        self.rng = rng
+        self.skew = skew
+        conn = open_readonly(db_path)
+        try:
+            resources = ApiResources(conn)
+
+            def sample(table: str, where: str = '') -> List[str]:
+                gids = [row[0] for row in conn.execute(
+                    f"SELECT {resources.gid(table)} FROM {table} {where}")]
+                rng.shuffle(gids)
+                return gids[:SAMPLE_SIZE]
+
+            self.workspaces = sample('organizations')
+            self.projects = sample('projects')
+            self.tasks = sample('tasks')
+            self.assignees = [
+                resources.refs('users')[row[0]]['gid'] for row in conn.execute(
+                    "SELECT DISTINCT assignee_id FROM tasks WHERE assignee_id IS NOT NULL")
+            ]
+            rng.shuffle(self.assignees)
+            del self.assignees[SAMPLE_SIZE:]
+            # A board interaction requests the tasks of every section
+            self.sections_per_project = conn.execute(
+                "SELECT COUNT(*) * 1.0 / COUNT(DISTINCT project_id) FROM sections").fetchone()[0] or 0.0
+        finally:
+            conn.close()
+        if not (self.workspaces and self.projects and self.tasks and self.assignees):
+            raise ReplayError("Database has no workspaces, projects, tasks or assignees to replay")
+
+    def pick(self, gids: List[str]) -> str:
+        # random() ** skew piles up near 0: skew=1 is uniform, larger is hotter
+        return gids[int(len(gids) * self.rng.random() ** self.skew)]
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def get(self, target: str) -> Tuple[int, bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            self.writer.write(f"GET {target} HTTP/1.1\r\nHost: {self.host}\r\n"
+                              "Accept: application/json\r\n\r\n".encode())
+            status_line = await self.reader.readline()
+            if not status_line:
+                raise ConnectionError("Server closed the connection")
+            status = int(status_line.split()[1])
+            length, close = 0, False
+            while True:
+                line = await self.reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                name = name.strip().lower()
+                if name == 'content-length':
+                    length = int(value)
+                elif name == 'connection':
+                    close = value.strip().lower() == 'close'
+            body = await self.reader.readexactly(length)
+        except BaseException:
+            self.close()
+            raise
+        if close:
+            self.close()
+        return status, body
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+
+class LoadReplay:
+    """Open-loop replay of :data:`FLOWS` with per-endpoint latency."""
+
+    def __init__(self, base_url: str, entities: EntityPool, connections: int = 8):
+        url = urlsplit(base_url)
+        self.prefix = url.path.rstrip('/') + API_PREFIX
+        self.entities = entities
+        self.rng = entities.rng
+        self.connections = [Connection(url.hostname, url.port or 80) for _ in range(connections)]
+        self.pool: "asyncio.Queue[Connection]" = asyncio.Queue()
+        for connection in self.connections:
+            self.pool.put_nowait(connection)
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def request(self, endpoint: str, path: str, due: Optional[float] = None) -> Any:
+        """GET ``path``; records latency under ``endpoint`` from ``due`` (default: now)."""
+        start = time.perf_counter() if due is None else due
+        connection = await self.pool.get()
+        try:
+            status, body = await connection.get(self.prefix + path)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            self.errors[endpoint] += 1
+            return None
+        finally:
+            self.pool.put_nowait(connection)
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        if status != 200:
+            self.errors[endpoint] += 1
+            return None
+        return json.loads(body)['data']
+
+    # ------------------------------------------------------------------
+    # Interactions
+    # ------------------------------------------------------------------
+
+    async def my_tasks(self, due: float):
+        """An agent lists its open tasks, then opens one."""
+        user = self.entities.pick(self.entities.assignees)
+        workspace = self.entities.pick(self.entities.workspaces)
+        tasks = await self.request(
+            'GET /tasks?assignee', f"/tasks?assignee={user}&workspace={workspace}"
+            "&completed_since=now&limit=50", due)
+        if tasks:
+            await self.request('GET /tasks/{gid}', f"/tasks/{self.rng.choice(tasks)['gid']}")
+
+    async def task_detail(self, due: float):
+        """A task and its story feed, fetched together."""
+        task = self.entities.pick(self.entities.tasks)
+        await asyncio.gather(
+            self.request('GET /tasks/{gid}', f"/tasks/{task}", due),
+            self.request('GET /tasks/{gid}/stories', f"/tasks/{task}/stories", due),
+        )
+
+    async def board(self, due: float):
+        """A project board: its sections, then the tasks of each."""
+        project = self.entities.pick(self.entities.projects)
+        sections = await self.request(
+            'GET /projects/{gid}/sections', f"/projects/{project}/sections", due)
+        if sections:
+            await asyncio.gather(*(
+                self.request('GET /sections/{gid}/tasks', f"/sections/{section['gid']}/tasks?limit=50")
+                for section in sections
+            ))
+
+    async def browse(self, due: float):
+        """Workspace navigation: projects of a workspace, then one project."""
+        workspace = self.entities.pick(self.entities.workspaces)
+        projects = await self.request(
+            'GET /workspaces/{gid}/projects', f"/workspaces/{workspace}/projects?limit=100", due)
+        if projects:
+            await self.request('GET /projects/{gid}', f"/projects/{self.rng.choice(projects)['gid']}")
+
+    # ------------------------------------------------------------------
+    # Driver
+    # ------------------------------------------------------------------
+
+    async def run(self, qps: float, duration: float) -> Dict[str, Any]:
+        """Offer ``qps`` requests per second for ``duration`` seconds; returns the report."""
+        # Interactions per second that offer the requested request rate
+        names, weights = list(FLOWS), list(FLOWS.values())
+        requests_per_flow = {'my_tasks': 2, 'task_detail': 2, 'browse': 2,
+                             'board': 1 + self.entities.sections_per_project}
+        mean_requests = sum(FLOWS[name] * requests_per_flow[name] for name in names) / sum(weights)
+        rate = qps / mean_requests
+
+        pending = set()
+        max_lag = 0.0
+        start = time.perf_counter()
+        count = int(rate * duration)
+        for i in range(count):
+            due = start + i / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                max_lag = max(max_lag, -delay)
+            flow = getattr(self, self.rng.choices(names, weights)[0])
+            task = asyncio.ensure_future(flow(due))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+        elapsed = time.perf_counter() - start
+
+        for connection in self.connections:
+            connection.close()
+        return self.report(qps, elapsed, count, max_lag)
+
+    def report(self, qps: float, elapsed: float, interactions: int, max_lag: float) -> Dict[str, Any]:
+        def summary(values: List[float], errors: int) -> Dict[str, Any]:
+            values = sorted(values)
+            return {
+                'requests': len(values),
+                'errors': errors,
+                'qps': round(len(values) / elapsed, 1) if elapsed else 0.0,
+                'p50_ms': round(percentile(values, 0.50) * 1000, 2),
+                'p90_ms': round(percentile(values, 0.90) * 1000, 2),
+                'p99_ms': round(percentile(values, 0.99) * 1000, 2),
+                'max_ms': round((values[-1] if values else 0.0) * 1000, 2),
+            }
+
+        every = [value for values in self.latencies.values() for value in values]
+        return {
+            'target_qps': qps,
+            'elapsed_seconds': round(elapsed, 2),
+            'interactions': interactions,
+            'max_schedule_lag_ms': round(max_lag * 1000, 2),
+            'overall': summary(every, sum(self.errors.values())),
+            'endpoints': {
+                endpoint: summary(self.latencies[endpoint], self.errors[endpoint])
+                for endpoint in sorted(set(self.latencies) | set(self.errors))
+            },
+        }
+
+
+async def replay(db_path: str, url: Optional[str] = None, qps: float = 100.0,
+                 duration: float = 10.0, connections: int = 8, skew: float = 2.0,
+                 seed: int = 42) -> Dict[str, Any]:
+    """Replay against ``url``, or against a mock server started in this event loop."""
+    entities = EntityPool(db_path, random.Random(seed), skew)
+    api = server = None
+    if url is None:
+        api = MockAsanaApi(db_path)
+        server = await api.start()
+        url = api.base_url
+    try:
+        return await LoadReplay(url, entities, connections).run(qps, duration)
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+            api.close()
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"Target {report['target_qps']} req/s for {report['elapsed_seconds']}s "
+          f"({report['interactions']} interactions, "
+          f"max schedule lag {report['max_schedule_lag_ms']} ms)")
+    print(f"{'endpoint':<34} {'requests':>8} {'errors':>6} {'req/s':>7} "
+          f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    rows = list(report['endpoints'].items()) + [('overall', report['overall'])]
+    for endpoint, stats in rows:
+        print(f"{endpoint:<34} {stats['requests']:>8} {stats['errors']:>6} {stats['qps']:>7} "
+              f"{stats['p50_ms']:>8} {stats['p90_ms']:>8} {stats['p99_ms']:>8} {stats['max_ms']:>8}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay agent traffic against the mock Asana API')
+    parser.add_argument('db_path', help='Database the requests are drawn from')
+    parser.add_argument('--url', help='Running mock API (default: start one in-process)')
+    parser.add_argument('--qps', type=float, default=100.0, help='Target requests per second')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds of load')
+    parser.add_argument('--connections', type=int, default=8, help='Keep-alive connections')
+    parser.add_argument('--skew', type=float, default=2.0,
+                        help='Popularity skew of entities (1 = uniform)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--json', help='Also write the report to this file')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    report = asyncio.run(replay(args.db_path, args.url, args.qps, args.duration,
+                                args.connections, args.skew, args.seed))
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    sys.exit(1 if report['overall']['errors'] else 0)
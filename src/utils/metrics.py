@@ -0,0 +1,181 @@
+"""Per-stage performance instrumentation for the generation pipeline."""
+import json
+import logging
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MB."""
+    if resource is None:
+        return None
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def worker_usage() -> Optional[tuple]:
+    """
+    CPU seconds and peak RSS (MB) of finished worker processes.
+
+    Covers children that have exited and been waited for, such as the
+    spawn pool of :func:`src.utils.tuning.map_in_workers` once it shuts down.
+    """
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime, usage.ru_maxrss / 1024
+
+
+def current_rss_mb() -> Optional[float]:
+    """Current resident set size of this process, in MB (Linux only)."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+def bytes_written() -> Optional[int]:
+    """Bytes this process has passed to write() so far (Linux only)."""
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                if line.startswith('wchar:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _delta(after, before):
+    return None if after is None or before is None else after - before
+
+
+@dataclass
+class StageMetrics:
+    """Measurements for one pipeline stage."""
+    name: str
+    wall_seconds: float
+    # This process plus the worker processes that finished during the stage
+    cpu_seconds: float
+    worker_cpu_seconds: float
+    rows: int
+    rows_per_sec: float
+    # Change in current RSS over the stage; the process peak never decreases,
+    # so it is reported for the whole run (and per stage only as context)
+    rss_delta_mb: Optional[float]
+    process_peak_rss_mb: Optional[float]
+    # Largest worker process so far (set for stages that ran workers)
+    worker_peak_rss_mb: Optional[float]
+    tracemalloc_peak_mb: Optional[float]
+    # Bytes passed to write() (database, journal, WAL and logs), and net
+    # growth of the database file in pages and bytes
+    bytes_written: Optional[int]
+    pages_grown: int
+    db_growth_bytes: int
+    commits: int
+
+
+class PerformanceRecorder:
+    """
+    Record wall/CPU time, rows, memory and database growth per stage.
+
+    CPU time includes worker processes the stage ran (see
+    :func:`worker_usage`). Rows and commits are read from the storage backend's counters, so
+    measuring a stage costs a handful of clock and PRAGMA calls.
+    """
+
+    def __init__(self, db, trace_memory: bool = False):
+        self.db = db
+        self.trace_memory = trace_memory
+        self.stages: List[StageMetrics] = []
+
+    def _db_snapshot(self) -> Dict[str, Any]:
+        return {
+            'rows': sum(self.db.row_counts.values()),
+            'commits': self.db.commits,
+            'size': self.db.size_bytes(),
+            'pages': self.db.page_count(),
+            'written': bytes_written(),
+            'rss': current_rss_mb(),
+            'workers': worker_usage(),
+        }
+
+    @contextmanager
+    def stage(self, name: str):
+        """Measure the enclosed block as one stage."""
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+        before = self._db_snapshot()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        yield
+
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        after = self._db_snapshot()
+        rows = after['rows'] - before['rows']
+
+        worker_cpu = 0.0
+        worker_peak = None
+        if after['workers'] is not None and before['workers'] is not None:
+            worker_cpu = after['workers'][0] - before['workers'][0]
+            if worker_cpu > 0:
+                worker_peak = after['workers'][1]
+
+        traced_peak = None
+        if self.trace_memory:
+            traced_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+
+        metrics = StageMetrics(
+            name=name,
+            wall_seconds=wall,
+            cpu_seconds=cpu + worker_cpu,
+            worker_cpu_seconds=worker_cpu,
+            rows=rows,
+            rows_per_sec=rows / wall if wall > 0 else 0.0,
+            rss_delta_mb=_delta(after['rss'], before['rss']),
+            process_peak_rss_mb=peak_rss_mb(),
+            worker_peak_rss_mb=worker_peak,
+            tracemalloc_peak_mb=traced_peak,
+            bytes_written=_delta(after['written'], before['written']),
+            pages_grown=after['pages'] - before['pages'],
+            db_growth_bytes=after['size'] - before['size'],
+            commits=after['commits'] - before['commits'],
+        )
+        self.stages.append(metrics)
+        logger.debug(f"Stage {name}: {wall:.2f}s, {rows} rows, "
+                     f"{cpu + worker_cpu:.2f}s CPU ({worker_cpu:.2f}s in workers)")
+
+    def report(self, **context: Any) -> Dict[str, Any]:
+        """Build the JSON-serializable report."""
+        return {
+            **context,
+            'total_wall_seconds': sum(s.wall_seconds for s in self.stages),
+            'total_cpu_seconds': sum(s.cpu_seconds for s in self.stages),
+            'total_rows': sum(s.rows for s in self.stages),
+            'process_peak_rss_mb': peak_rss_mb(),
+            'stages': [asdict(s) for s in self.stages],
+        }
+
+    def write(self, path: str, **context: Any):
+        """Write the report as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.report(**context), f, indent=2)
+        logger.info(f"Performance report written to {path}")
@@ -0,0 +1,299 @@
+"""Local mock of the Asana REST API serving a generated database.
+
+    python -m src.utils.mock_api output/asana_simulation.sqlite --port 8080
+
+Serves the read endpoints agent tooling uses for workspaces, projects,
+sections, tasks and stories under ``/api/1.0``, with the record shapes of
+:mod:`src.utils.api_export`. Responses follow the API's envelope:
+``{"data": ...}``, list pages of compact records with ``limit`` /
+``offset`` and a ``next_page`` link, and ``{"errors": [...]}`` with 400
+or 404.
+
+The server is plain asyncio HTTP/1.1 with keep-alive and needs no
+network access or extra packages. Queries run on the event loop against
+one read-only connection: they are index lookups well under a
+millisecond, cheaper than a hand-off to a thread.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import re
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from src.utils.api_export import REFERENCE_TYPES, ApiResources
+from src.utils.database import open_readonly
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/api/1.0'
+
+# Page size when a request gives no limit, and the API's maximum
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 100
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+
+class ApiError(Exception):
+    """A request the API rejects; becomes an ``errors`` response."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class MockAsanaApi:
+    """Request routing and handlers over one generated database."""
+
+    def __init__(self, db_path: str, base_url: str = ''):
+        self.conn = open_readonly(db_path)
+        self.resources = ApiResources(self.conn)
+        self.base_url = base_url
+        self.requests = 0
+        self.routes: List[Tuple[re.Pattern, Callable]] = [
+            (re.compile(pattern), handler) for pattern, handler in (
+                (r'/workspaces', self.get_workspaces),
+                (r'/workspaces/(\w+)', self.get_workspace),
+                (r'/workspaces/(\w+)/projects', self.get_workspace_projects),
+                (r'/projects/(\w+)', self.get_project),
+                (r'/projects/(\w+)/sections', self.get_project_sections),
+                (r'/projects/(\w+)/tasks', self.get_project_tasks),
+                (r'/sections/(\w+)', self.get_section),
+                (r'/sections/(\w+)/tasks', self.get_section_tasks),
+                (r'/tasks', self.get_tasks),
+                (r'/tasks/(\w+)', self.get_task),
+                (r'/tasks/(\w+)/stories', self.get_task_stories),
+            )
+        ]
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _key(self, table: str, gid: str) -> Any:
+        key = self.resources.key_for(table, gid)
+        if key is None:
+            raise ApiError(404, f"{REFERENCE_TYPES[table]}: Unknown object: {gid}")
+        return key
+
+    def _one(self, records, kind: str, gid: str) -> Dict[str, Any]:
+        record = next(records, None)
+        if record is None:
+            raise ApiError(404, f"{kind}: Unknown object: {gid}")
+        return record
+
+    @staticmethod
+    def _page_args(query: Dict[str, str]) -> Tuple[int, int]:
+        try:
+            limit = int(query.get('limit', DEFAULT_LIMIT))
+            offset = int(query.get('offset', 0))
+        except ValueError:
+            raise ApiError(400, "limit and offset must be integers") from None
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ApiError(400, f"limit: must be between 1 and {MAX_LIMIT}")
+        if offset < 0:
+            raise ApiError(400, "offset: must not be negative")
+        return limit, offset
+
+    def _page(self, path: str, query: Dict[str, str], fetch: Callable[[int, int], List]) -> Dict:
+        """Fetch one page (one extra row tells whether another page follows)."""
+        limit, offset = self._page_args(query)
+        rows = fetch(limit + 1, offset)
+        next_page = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_query = urlencode({**query, 'offset': offset + limit})
+            next_page = {'offset': str(offset + limit), 'path': f"{path}?{next_query}",
+                         'uri': f"{self.base_url}{API_PREFIX}{path}?{next_query}"}
+        return {'data': rows, 'next_page': next_page}
+
+    def _compact_page(self, path: str, query: Dict[str, str], table: str,
+                      where: str, params: tuple, order: str) -> Dict:
+        return self._page(path, query, lambda limit, offset: self.resources.compact(
+            table, where, params, order, limit, offset))
+
+    # ------------------------------------------------------------------
+    # Handlers: (path, query, *groups) -> response body
+    # ------------------------------------------------------------------
+
+    def get_workspaces(self, path, query):
+        return self._compact_page(path, query, 'organizations', '', (), 'x.organization_id')
+
+    def get_workspace(self, path, query, gid):
+        key = self._key('organizations', gid)
+        return {'data': self._one(self.resources.workspaces("o.organization_id = ?", (key,)),
+                                  'workspace', gid)}
+
+    def get_workspace_projects(self, path, query, gid):
+        key = self._key('organizations', gid)
+        archived = query.get('archived')
+        where, params = "x.organization_id = ?", (key,)
+        if archived in ('true', 'false'):
+            where, params = where + " AND x.is_archived = ?", params + (int(archived == 'true'),)
+        return self._compact_page(path, query, 'projects', where, params, 'x.project_id')
+
+    def get_project(self, path, query, gid):
+        key = self._key('projects', gid)
+        return {'data': self._one(self.resources.projects("p.project_id = ?", (key,)),
+                                  'project', gid)}
+
+    def get_project_sections(self, path, query, gid):
+        key = self._key('projects', gid)
+        return self._compact_page(path, query, 'sections', "x.project_id = ?", (key,), 'x.position')
+
+    def get_project_tasks(self, path, query, gid):
+        key = self._key('projects', gid)
+        return self._task_page(path, query, "x.project_id = ?", (key,))
+
+    def get_section(self, path, query, gid):
+        key = self._key('sections', gid)
+        return {'data': self._one(self.resources.sections("s.section_id = ?", (key,)),
+                                  'section', gid)}
+
+    def get_section_tasks(self, path, query, gid):
+        key = self._key('sections', gid)
+        return self._task_page(path, query, "x.section_id = ?", (key,))
+
+    def get_tasks(self, path, query):
+        """``GET /tasks`` needs a project, a section, or an assignee with a workspace."""
+        if 'project' in query:
+            where, params = "x.project_id = ?", (self._key('projects', query['project']),)
+        elif 'section' in query:
+            where, params = "x.section_id = ?", (self._key('sections', query['section']),)
+        elif 'assignee' in query and 'workspace' in query:
+            self._key('organizations', query['workspace'])
+            where, params = "x.assignee_id = ?", (self._key('users', query['assignee']),)
+        else:
+            raise ApiError(400, "Must specify exactly one of project, section, "
+                                "or assignee + workspace")
+        return self._task_page(path, query, where, params)
+
+    def _task_page(self, path, query, where: str, params: tuple):
+        # completed_since=now lists only incomplete tasks, as in the API
+        if 'completed_since' in query:
+            since = query['completed_since']
+            if since == 'now':
+                where += " AND x.completed = 0"
+            else:
+                where += " AND (x.completed = 0 OR x.completed_at >= ?)"
+                params += (since.rstrip('Z'),)
+        return self._compact_page(path, query, 'tasks', where, params, 'x.created_at, x.task_id')
+
+    def get_task(self, path, query, gid):
+        task_gid = self.resources.gid('tasks')
+        return {'data': self._one(self.resources.tasks(f"t.{task_gid} = ?", (gid,)), 'task', gid)}
+
+    def get_task_stories(self, path, query, gid):
+        task_gid = self.resources.gid('tasks')
+        if self.conn.execute(f"SELECT 1 FROM tasks WHERE {task_gid} = ?", (gid,)).fetchone() is None:
+            raise ApiError(404, f"task: Unknown object: {gid}")
+        stories = sorted(self.resources.stories(f"t.{task_gid} = ?", (gid,)),
+                         key=lambda story: story['created_at'])
+        return self._page(path, query, lambda limit, offset: stories[offset:offset + limit])
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def handle(self, method: str, target: str) -> Tuple[int, Dict[str, Any]]:
+        """Route one request; returns the status and the JSON body."""
+        self.requests += 1
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        path = url.path[len(API_PREFIX):] if url.path.startswith(API_PREFIX) else None
+
+        try:
+            if method != 'GET':
+                raise ApiError(405, f"Method {method} is not supported by the mock API")
+            if path is not None:
+                for pattern, handler in self.routes:
+                    match = pattern.fullmatch(path.rstrip('/') or '/')
+                    if match:
+                        return 200, handler(path, query, *match.groups())
+            raise ApiError(404, f"No matching route for request: {url.path}")
+        except ApiError as e:
+            return e.status, {'errors': [{'message': str(e)}]}
+
+    # ------------------------------------------------------------------
+    # HTTP/1.1
+    # ------------------------------------------------------------------
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get('content-length'):
+                    await reader.readexactly(int(headers['content-length']))
+
+                status, body = self.handle(method, target)
+                payload = json.dumps(body, separators=(',', ':')).encode()
+                keep_alive = (version == 'HTTP/1.1'
+                              and headers.get('connection', '').lower() != 'close')
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    "Content-Type: application/json; charset=UTF-8\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Client went away, or the server is shutting down
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> asyncio.AbstractServer:
+        """Start listening (``port=0`` picks a free port); returns the server."""
+        server = await asyncio.start_server(self._serve_connection, host, port)
+        bound_host, bound_port = server.sockets[0].getsockname()[:2]
+        self.base_url = self.base_url or f"http://{bound_host}:{bound_port}"
+        logger.info(f"Mock Asana API listening on {self.base_url}{API_PREFIX}")
+        return server
+
+    def close(self):
+        self.conn.close()
+
+
+async def _serve_forever(db_path: str, host: str, port: int):
+    api = MockAsanaApi(db_path)
+    server = await api.start(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        api.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve a generated database as a mock Asana API')
+    parser.add_argument('db_path', help='Database path')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve_forever(args.db_path, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    sys.exit(0)
@@ -0,0 +1,324 @@
+"""Read-only query layer for serving generated databases to concurrent workers.
+
+Connections are opened with :func:`open_readonly` (``mode=ro``, plus
+``immutable=1`` and memory mapping for sealed files) and shared through a
+thread-safe pool. Each connection keeps an LRU cache of prepared
+statements (``cached_statements``), so the fixed SQL of the typed access
+paths below is compiled once per connection. Results are NamedTuples.
+Aggregate views are point lookups when the database has summary tables
+(``--summaries``) and fall back to scanning ``tasks`` otherwise. Overdue
+counts are relative to the simulation end date, never the wall clock, so
+the same seed gives the same answers on any day.
+
+Measure latency under concurrent load with:
+
+    python -m src.utils.reader output/asana_simulation.sqlite --threads 8
+
+The access paths run in well under a millisecond, so with many threads in
+one process the tail is set by the GIL switch interval (5 ms), not by
+SQLite; latency-sensitive workers should each run in their own process
+with a small pool.
+"""
+import argparse
+import queue
+import random
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from src.config import Config
+from src.utils.database import END_DATE_KEY, METADATA_TABLE, open_readonly
+from src.utils.schema_info import load_schema
+from src.utils.search import TaskHit, has_search_index, search_tasks
+from src.utils.summaries import AS_OF_KEY, SUMMARY_TABLES
+
+# Prepared statements kept per connection
+DEFAULT_CACHED_STATEMENTS = 256
+
+
+class TaskSummary(NamedTuple):
+    task_id: Any
+    name: str
+    section_id: Any
+    assignee_id: Any
+    due_date: Optional[str]
+    completed: bool
+    priority: Optional[str]
+
+
+class BoardSection(NamedTuple):
+    section_id: Any
+    name: str
+    position: int
+    tasks: List[TaskSummary]
+
+
+class SectionCounts(NamedTuple):
+    section_id: Any
+    name: str
+    tasks: int
+    completed: int
+
+
+class UserLoad(NamedTuple):
+    user_id: Any
+    open_tasks: int
+    overdue_tasks: int
+    completed_tasks: int
+
+
+class ProjectOverview(NamedTuple):
+    project_id: Any
+    name: str
+    project_type: str
+    owner_id: Any
+    due_date: Optional[str]
+    tasks: int
+    completed: int
+    unassigned: int
+    overdue: int
+
+
+_TASK_COLUMNS = "t.task_id, t.name, t.section_id, t.assignee_id, t.due_date, t.completed, t.priority"
+
+
+def _task(row: tuple) -> TaskSummary:
+    return TaskSummary(row[0], row[1], row[2], row[3], row[4], bool(row[5]), row[6])
+
+
+class ConnectionPool:
+    """Fixed-size, thread-safe pool of read-only SQLite connections."""
+
+    def __init__(self, db_path: str, size: int = 4,
+                 cached_statements: int = DEFAULT_CACHED_STATEMENTS):
+        self.db_path = db_path
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        for _ in range(size):
+            conn = open_readonly(
+                db_path, check_same_thread=False, cached_statements=cached_statements
+            )
+            conn.execute("PRAGMA query_only = 1")
+            self._all.append(conn)
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, blocking until one is free."""
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        """Close every connection."""
+        for conn in self._all:
+            conn.close()
+        self._all.clear()
+
+
+class Reader:
+    """
+    Typed read access paths over a generated database.
+
+    Keys are passed and returned as stored: GIDs in the standard layout,
+    integers in the compact layout (use :meth:`key_for` to translate a GID).
+    """
+
+    def __init__(self, db_path: str, pool_size: int = 4,
+                 cached_statements: int = DEFAULT_CACHED_STATEMENTS):
+        self.pool = ConnectionPool(db_path, pool_size, cached_statements)
+        with self.pool.connection() as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(tasks)")]
+            tables = {row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'")}
+            metadata = {}
+            if METADATA_TABLE in tables:
+                metadata = dict(conn.execute(f"SELECT key, value FROM {METADATA_TABLE}").fetchall())
+            self.summaries_as_of = (
+                metadata.get(AS_OF_KEY) if set(SUMMARY_TABLES) <= tables else None
+            )
+            # The instant overdue is measured at when no as_of is given
+            self.reference_time = (self.summaries_as_of or metadata.get(END_DATE_KEY)
+                                   or Config.SIMULATION_END_DATE.isoformat())
+            self.searchable = has_search_index(conn)
+        self.compact = 'gid' in columns
+
+    def query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run any SELECT on a pooled connection."""
+        with self.pool.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def key_for(self, table: str, gid: str) -> Any:
+        """The stored key of a GID (the GID itself in the standard layout)."""
+        if not self.compact:
+            return gid
+        # Table names come from callers in code, never from user input; the
+        # integer key column is the rowid, which views do not expose
+        key = load_schema()[table].primary_key[0]
+        rows = self.query(f"SELECT {key} FROM {table} WHERE gid = ?", (gid,))
+        return rows[0][0] if rows else None
+
+    def tasks_for_assignee(self, assignee_id: Any, include_completed: bool = False,
+                           limit: int = 100) -> List[TaskSummary]:
+        """An assignee's tasks, soonest due first (tasks without a due date last)."""
+        if include_completed:
+            sql = (f"SELECT {_TASK_COLUMNS} FROM tasks t WHERE t.assignee_id = ? "
+                   "ORDER BY t.due_date IS NULL, t.due_date LIMIT ?")
+        else:
+            sql = (f"SELECT {_TASK_COLUMNS} FROM tasks t WHERE t.assignee_id = ? AND t.completed = 0 "
+                   "ORDER BY t.due_date IS NULL, t.due_date LIMIT ?")
+        return list(map(_task, self.query(sql, (assignee_id, limit))))
+
+    def section_board(self, project_id: Any) -> List[BoardSection]:
+        """A project's sections in board order, each with its tasks."""
+        rows = self.query(
+            f"SELECT s.section_id, s.name, s.position, {_TASK_COLUMNS} "
+            "FROM sections s LEFT JOIN tasks t ON t.section_id = s.section_id "
+            "WHERE s.project_id = ? ORDER BY s.position, t.created_at",
+            (project_id,)
+        )
+        board: List[BoardSection] = []
+        for row in rows:
+            if not board or board[-1].section_id != row[0]:
+                board.append(BoardSection(row[0], row[1], row[2], []))
+            if row[3] is not None:
+                board[-1].tasks.append(_task(row[3:]))
+        return board
+
+    def section_counts(self, project_id: Any) -> List[SectionCounts]:
+        """Task and completed counts of each section of a project, in board order."""
+        if self.summaries_as_of:
+            sql = ("SELECT s.section_id, s.name, COALESCE(m.tasks, 0), COALESCE(m.completed, 0) "
+                   "FROM sections s LEFT JOIN summary_section_tasks m ON m.section_id = s.section_id "
+                   "WHERE s.project_id = ? ORDER BY s.position")
+        else:
+            sql = ("SELECT s.section_id, s.name, COUNT(t.task_id), COALESCE(SUM(t.completed), 0) "
+                   "FROM sections s LEFT JOIN tasks t ON t.section_id = s.section_id "
+                   "WHERE s.project_id = ? GROUP BY s.section_id ORDER BY s.position")
+        return [SectionCounts(*row) for row in self.query(sql, (project_id,))]
+
+    def user_load(self, user_id: Any, as_of: Optional[datetime] = None) -> UserLoad:
+        """Open, overdue (at ``as_of``, by default the reference time) and completed task counts."""
+        if self.summaries_as_of and as_of is None:
+            rows = self.query(
+                "SELECT user_id, open_tasks, overdue_tasks, completed_tasks "
+                "FROM summary_user_load WHERE user_id = ?", (user_id,))
+            return UserLoad(*rows[0]) if rows else UserLoad(user_id, 0, 0, 0)
+
+        as_of = as_of.isoformat() if as_of else self.reference_time
+        rows = self.query(
+            "SELECT COALESCE(SUM(completed = 0), 0), "
+            "COALESCE(SUM(completed = 0 AND due_date < ?), 0), COALESCE(SUM(completed), 0) "
+            "FROM tasks WHERE assignee_id = ?", (as_of, user_id))
+        return UserLoad(user_id, *rows[0])
+
+    def project_overview(self, project_id: Any,
+                         as_of: Optional[datetime] = None) -> Optional[ProjectOverview]:
+        """
+        Project fields with task totals.
+
+        Overdue is relative to ``as_of``; by default that is the instant the
+        summary tables were built for, or the simulation end date when there
+        are none.
+        """
+        if self.summaries_as_of and as_of is None:
+            rows = self.query(
+                "SELECT p.project_id, p.name, p.project_type, p.owner_id, p.due_date, "
+                "COALESCE(m.tasks, 0), COALESCE(m.completed, 0), "
+                "COALESCE(m.unassigned, 0), COALESCE(m.overdue, 0) "
+                "FROM projects p LEFT JOIN summary_project_progress m ON m.project_id = p.project_id "
+                "WHERE p.project_id = ?",
+                (project_id,)
+            )
+            return ProjectOverview(*rows[0]) if rows else None
+
+        as_of = as_of.isoformat() if as_of else self.reference_time
+        rows = self.query(
+            "SELECT p.project_id, p.name, p.project_type, p.owner_id, p.due_date, "
+            "COUNT(t.task_id), COALESCE(SUM(t.completed), 0), "
+            "COALESCE(SUM(t.task_id IS NOT NULL AND t.assignee_id IS NULL), 0), "
+            "COALESCE(SUM(t.completed = 0 AND t.due_date < ?), 0) "
+            "FROM projects p LEFT JOIN tasks t ON t.project_id = p.project_id "
+            "WHERE p.project_id = ? GROUP BY p.project_id",
+            (as_of, project_id)
+        )
+        return ProjectOverview(*rows[0]) if rows else None
+
+    def search_tasks(self, text: str, limit: int = 20) -> List[TaskHit]:
+        """Keyword search over task names and descriptions, best match first."""
+        if not self.searchable:
+            raise RuntimeError("Database has no search index (generate with --search-index)")
+        with self.pool.connection() as conn:
+            return search_tasks(conn, text, limit)
+
+    def close(self):
+        """Close the connection pool."""
+        self.pool.close()
+
+
+def measure_latency(db_path: str, threads: int = 8, queries: int = 2000,
+                    seed: int = 42) -> Dict[str, float]:
+    """Run a mixed access-path workload from many threads; return latency percentiles in ms."""
+    reader = Reader(db_path, pool_size=threads)
+    assignees = [row[0] for row in reader.query(
+        "SELECT DISTINCT assignee_id FROM tasks WHERE assignee_id IS NOT NULL")]
+    projects = [row[0] for row in reader.query("SELECT project_id FROM projects")]
+
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def worker(worker_id: int):
+        rng = random.Random(seed + worker_id)
+        local = []
+        for _ in range(queries // threads):
+            choice = rng.random()
+            start = time.perf_counter()
+            if choice < 0.5:
+                reader.tasks_for_assignee(rng.choice(assignees))
+            elif choice < 0.8:
+                reader.section_board(rng.choice(projects))
+            else:
+                reader.project_overview(rng.choice(projects))
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    reader.close()
+
+    latencies.sort()
+    return {
+        'queries': len(latencies),
+        'qps': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': statistics.median(latencies),
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1],
+        'max_ms': latencies[-1],
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure read-layer latency under concurrent load')
+    parser.add_argument('db_path', help='Database path')
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent workers')
+    parser.add_argument('--queries', type=int, default=2000, help='Total queries')
+    args = parser.parse_args()
+
+    result = measure_latency(args.db_path, args.threads, args.queries)
+    print(f"{result['queries']} queries, {result['qps']:.0f} q/s, "
+          f"p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, "
+          f"max {result['max_ms']:.2f} ms")
+    sys.exit(0)
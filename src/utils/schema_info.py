@@ -0,0 +1,114 @@
+"""Introspection helpers for the tables declared in schema.sql."""
+import sqlite3
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SCHEMA_PATH = Path(__file__).parent.parent.parent / 'schema.sql'
+
+
+@dataclass
+class ColumnInfo:
+    name: str
+    decl_type: str
+    not_null: bool = False
+    primary_key: bool = False
+
+
+@dataclass
+class ForeignKeyInfo:
+    column: str
+    ref_table: str
+    ref_column: str
+
+
+@dataclass
+class TableInfo:
+    name: str
+    columns: List[ColumnInfo] = field(default_factory=list)
+    foreign_keys: List[ForeignKeyInfo] = field(default_factory=list)
+    sql: str = ''
+    indexes: List[str] = field(default_factory=list)
+
+    @property
+    def column_names(self) -> List[str]:
+        return [c.name for c in self.columns]
+
+    def column(self, name: str) -> Optional[ColumnInfo]:
+        for col in self.columns:
+            if col.name == name:
+                return col
+        return None
+
+    @property
+    def primary_key(self) -> List[str]:
+        return [c.name for c in self.columns if c.primary_key]
+
+
+def read_schema(conn: sqlite3.Connection) -> Dict[str, TableInfo]:
+    """
+    Return the table definitions of an open database, in declaration order.
+
+    Dictionary-encoded tables (see :mod:`src.utils.dictionary`) are
+    reported under their view name with TEXT columns, as their views
+    present them.
+    """
+    from src.utils.dictionary import DATA_SUFFIX, TEXT_TABLE, encoded_columns
+    encoded = encoded_columns(conn)
+
+    names = [
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY rowid"
+        )
+    ]
+
+    tables = {}
+    for name in names:
+        if encoded and name == TEXT_TABLE:
+            continue
+        logical = name[:-len(DATA_SUFFIX)] if name.endswith(DATA_SUFFIX) else name
+        if logical not in encoded:
+            logical = name
+        text_columns = encoded.get(logical, [])
+
+        info = TableInfo(name=logical)
+        for _, col, decl_type, not_null, _, pk in conn.execute(f"PRAGMA table_info({name})"):
+            decl_type = 'TEXT' if col in text_columns else decl_type.upper()
+            info.columns.append(ColumnInfo(col, decl_type, bool(not_null), pk > 0))
+        for row in conn.execute(f"PRAGMA foreign_key_list({name})"):
+            if row[2] != TEXT_TABLE:
+                info.foreign_keys.append(ForeignKeyInfo(row[3], row[2], row[4]))
+        info.sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone()[0]
+        info.indexes = [
+            row[0] for row in conn.execute(
+                "SELECT sql FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL ORDER BY rowid",
+                (name,)
+            )
+        ]
+        tables[logical] = info
+    return tables
+
+
+@lru_cache(maxsize=None)
+def load_schema(schema_path: str = str(SCHEMA_PATH)) -> Dict[str, TableInfo]:
+    """
+    Return table definitions from a schema file, in declaration order.
+
+    The DDL is executed against a throwaway in-memory SQLite database and
+    read back through PRAGMA, so the result always matches what SQLite
+    itself understands from the file.
+    """
+    with open(schema_path, 'r') as f:
+        schema_sql = f.read()
+
+    conn = sqlite3.connect(':memory:')
+    try:
+        conn.executescript(schema_sql)
+        return read_schema(conn)
+    finally:
+        conn.close()
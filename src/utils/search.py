@@ -0,0 +1,113 @@
+"""Full-text search over task names, descriptions and comments (SQLite FTS5).
+
+The indexes are external-content FTS5 tables: they store only the
+inverted index and read the text from ``tasks`` and ``comments``
+themselves, so the database does not hold the text twice. Each reads
+through a ``<fts>_content`` view that exposes the content rowid, which
+the views of dictionary-encoded tables do not.
+"""
+import logging
+import re
+import sqlite3
+from typing import Any, List, NamedTuple
+
+from src.utils.dictionary import DATA_SUFFIX, encoded_columns, select_sql
+
+logger = logging.getLogger(__name__)
+
+# FTS table -> (content table, indexed columns)
+FTS_TABLES = {
+    'tasks_fts': ('tasks', ['name', 'description']),
+    'comments_fts': ('comments', ['text']),
+}
+
+# BM25 column weights for tasks_fts: a hit in the name outranks the description
+TASK_NAME_WEIGHT = 10.0
+TASK_DESCRIPTION_WEIGHT = 1.0
+
+
+class TaskHit(NamedTuple):
+    task_id: Any
+    name: str
+    score: float
+
+
+class CommentHit(NamedTuple):
+    comment_id: Any
+    task_id: Any
+    snippet: str
+    score: float
+
+
+def build_search_index(conn: sqlite3.Connection):
+    """
+    Create and bulk-populate the FTS5 indexes, then merge them.
+
+    ``rebuild`` reads each content table in one pass, and ``optimize``
+    merges the resulting segments into a single b-tree per index.
+    """
+    encoded = encoded_columns(conn)
+    for fts, (source, columns) in FTS_TABLES.items():
+        conn.execute(f"DROP TABLE IF EXISTS {fts}")
+        conn.execute(f"DROP VIEW IF EXISTS {fts}_content")
+        if source in encoded:
+            names = [row[1] for row in conn.execute(f"PRAGMA table_info({source}{DATA_SUFFIX})")]
+            content = select_sql(source, names, encoded[source], rowid=True)
+        else:
+            content = f"SELECT rowid AS rowid, * FROM {source}"
+        conn.execute(f"CREATE VIEW {fts}_content AS {content}")
+        conn.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5("
+            f"{', '.join(columns)}, content='{fts}_content', content_rowid='rowid', "
+            "tokenize='porter unicode61')"
+        )
+        conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('optimize')")
+        conn.commit()
+        logger.info(f"Built full-text index {fts} over {source}({', '.join(columns)})")
+
+
+def has_search_index(conn: sqlite3.Connection) -> bool:
+    """Whether the database has the full-text indexes."""
+    names = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")}
+    return all({fts, f"{fts}_content"} <= names for fts in FTS_TABLES)
+
+
+def match_query(text: str, match_all: bool = True) -> str:
+    """
+    Turn free text into an FTS5 query.
+
+    Every word is quoted, so user input can never be parsed as FTS5
+    syntax; words are ANDed by default or ORed with ``match_all=False``.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        raise ValueError("Search text contains no words")
+    return (' ' if match_all else ' OR ').join(f'"{word}"' for word in words)
+
+
+def search_tasks(conn: sqlite3.Connection, text: str, limit: int = 20,
+                 match_all: bool = True) -> List[TaskHit]:
+    """Tasks matching ``text``, best BM25 score first."""
+    rows = conn.execute(
+        "SELECT t.task_id, t.name, "
+        f"bm25(tasks_fts, {TASK_NAME_WEIGHT}, {TASK_DESCRIPTION_WEIGHT}) AS score "
+        "FROM tasks_fts JOIN tasks_fts_content t ON t.rowid = tasks_fts.rowid "
+        "WHERE tasks_fts MATCH ? ORDER BY score LIMIT ?",
+        (match_query(text, match_all), limit)
+    ).fetchall()
+    return [TaskHit(*row) for row in rows]
+
+
+def search_comments(conn: sqlite3.Connection, text: str, limit: int = 20,
+                    match_all: bool = True) -> List[CommentHit]:
+    """Comments matching ``text``, best BM25 score first, with a highlighted snippet."""
+    rows = conn.execute(
+        "SELECT c.comment_id, c.task_id, "
+        "snippet(comments_fts, 0, '[', ']', '…', 12), bm25(comments_fts) AS score "
+        "FROM comments_fts JOIN comments_fts_content c ON c.rowid = comments_fts.rowid "
+        "WHERE comments_fts MATCH ? ORDER BY score LIMIT ?",
+        (match_query(text, match_all), limit)
+    ).fetchall()
+    return [CommentHit(*row) for row in rows]
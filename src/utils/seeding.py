@@ -0,0 +1,72 @@
+"""Order-independent, deterministic random streams."""
+import hashlib
+import random
+from typing import List, Tuple, Union
+
+Key = Union[int, str]
+
+
+def _key_to_int(key: Key) -> int:
+    """Stable non-negative integer for a stream key (unlike hash(), not salted)."""
+    if isinstance(key, int) and key >= 0:
+        return key
+    digest = hashlib.blake2b(str(key).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def numpy_seed(seed: int) -> Union[int, List[int]]:
+    """
+    ``seed`` in a form ``numpy.random.RandomState`` accepts.
+
+    RandomState takes at most 32 bits as an integer, so wider seeds are
+    passed as their 32-bit words instead of being truncated.
+    """
+    if seed < 2 ** 32:
+        return seed
+    words = []
+    while seed:
+        words.append(seed & 0xFFFFFFFF)
+        seed >>= 32
+    return words
+
+
+class SeedTree:
+    """
+    Tree of independent random streams derived from one root seed.
+
+    Each node is addressed by a path of keys, e.g.
+    ``SeedTree(42).child('tasks', project_id, section_id)``, and maps to a
+    ``numpy.random.SeedSequence`` with that path as its spawn key. Streams
+    therefore depend only on the root seed and their own path, never on
+    how many other streams were drawn before them, so stages can run in
+    any order or in separate processes and still produce identical data.
+    """
+
+    def __init__(self, root_seed: int, path: Tuple[int, ...] = ()):
+        self.root_seed = root_seed
+        self.path = path
+
+    def child(self, *keys: Key) -> 'SeedTree':
+        """Sub-tree addressed by the given keys."""
+        return SeedTree(self.root_seed, self.path + tuple(_key_to_int(k) for k in keys))
+
+    def seed_sequence(self):
+        """The ``numpy.random.SeedSequence`` for this node."""
+        # Imported on first use to keep module import cheap
+        from numpy.random import SeedSequence
+        return SeedSequence(self.root_seed, spawn_key=self.path)
+
+    def seed(self) -> int:
+        """
+        A 128-bit integer seed for APIs that take one.
+
+        ``random.Random`` uses every bit; 32 bits would make equal seeds
+        (and duplicate GIDs) likely across tens of thousands of streams.
+        Pass it through :func:`numpy_seed` for ``RandomState``.
+        """
+        words = self.seed_sequence().generate_state(4)
+        return sum(int(word) << (32 * i) for i, word in enumerate(words))
+
+    def random(self) -> random.Random:
+        """A ``random.Random`` seeded from this node."""
+        return random.Random(self.seed())
@@ -0,0 +1,113 @@
+"""Summary tables for common aggregate views, built from generation state."""
+import logging
+from datetime import datetime
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Summary table -> DDL; {key} is the key type of the storage layout
+SUMMARY_TABLES = {
+    'summary_section_tasks': (
+        "CREATE TABLE IF NOT EXISTS summary_section_tasks ("
+        "section_id {key} PRIMARY KEY, project_id {key} NOT NULL, "
+        "tasks INTEGER NOT NULL, completed INTEGER NOT NULL)"
+    ),
+    'summary_user_load': (
+        "CREATE TABLE IF NOT EXISTS summary_user_load ("
+        "user_id {key} PRIMARY KEY, open_tasks INTEGER NOT NULL, "
+        "overdue_tasks INTEGER NOT NULL, completed_tasks INTEGER NOT NULL)"
+    ),
+    'summary_project_progress': (
+        "CREATE TABLE IF NOT EXISTS summary_project_progress ("
+        "project_id {key} PRIMARY KEY, tasks INTEGER NOT NULL, completed INTEGER NOT NULL, "
+        "unassigned INTEGER NOT NULL, overdue INTEGER NOT NULL)"
+    ),
+}
+
+# Metadata key recording the instant "overdue" is measured against
+AS_OF_KEY = 'summaries_as_of'
+
+
+class SummaryBuilder:
+    """
+    Accumulate task aggregates on the write path.
+
+    :meth:`observe` is fed every accepted batch (after invariant checks),
+    so the summaries always describe exactly the rows that were written,
+    whichever stage or code path wrote them, and building them never
+    re-scans ``tasks``. Overdue means open with a due date before ``as_of``.
+    """
+
+    def __init__(self, as_of: datetime):
+        self.as_of = as_of
+        # section_id -> [project_id, tasks, completed]
+        self.sections: Dict[Any, List] = {}
+        # user_id -> [open, overdue, completed]
+        self.users: Dict[Any, List[int]] = {}
+        # project_id -> [tasks, completed, unassigned, overdue]
+        self.projects: Dict[Any, List[int]] = {}
+
+    def observe(self, table: str, rows: List[Any]):
+        """Fold a written batch into the aggregates."""
+        if table != 'tasks':
+            return
+
+        as_of = self.as_of
+        for task in rows:
+            overdue = (not task.completed and task.due_date is not None
+                       and task.due_date < as_of)
+
+            project = self.projects.setdefault(task.project_id, [0, 0, 0, 0])
+            project[0] += 1
+            project[1] += task.completed
+            project[2] += task.assignee_id is None
+            project[3] += overdue
+
+            if task.section_id is not None:
+                section = self.sections.setdefault(task.section_id, [task.project_id, 0, 0])
+                section[1] += 1
+                section[2] += task.completed
+
+            if task.assignee_id is not None:
+                user = self.users.setdefault(task.assignee_id, [0, 0, 0])
+                if task.completed:
+                    user[2] += 1
+                else:
+                    user[0] += 1
+                    user[1] += overdue
+
+    def write(self, db):
+        """Create (or refresh) the summary tables on a storage backend."""
+        # Compact-layout databases store integer keys
+        keys = getattr(db, 'keys', None)
+
+        def key(table: str, gid: Any) -> Any:
+            return keys.lookup(table, gid) if keys is not None else gid
+
+        rows = {
+            'summary_section_tasks': [
+                (key('sections', section_id), key('projects', project_id), tasks, completed)
+                for section_id, (project_id, tasks, completed) in self.sections.items()
+            ],
+            'summary_user_load': [
+                (key('users', user_id), *counts) for user_id, counts in self.users.items()
+            ],
+            'summary_project_progress': [
+                (key('projects', project_id), *counts)
+                for project_id, counts in self.projects.items()
+            ],
+        }
+
+        for table, ddl in SUMMARY_TABLES.items():
+            db.conn.execute(ddl.format(key='INTEGER' if keys is not None else 'TEXT'))
+            db.conn.execute(f"DELETE FROM {table}")
+            if rows[table]:
+                placeholders = ', '.join('?' for _ in rows[table][0])
+                db.conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows[table])
+        db.write_metadata({AS_OF_KEY: self.as_of.isoformat()})
+        db.commit()
+
+        logger.info(
+            f"Summary tables written: {len(self.sections)} sections, "
+            f"{len(self.users)} users, {len(self.projects)} projects"
+        )
@@ -1,16 +1,34 @@
 """Temporal utilities for date/time generation with consistency."""
 from datetime import datetime, timedelta
 from typing import Optional, Tuple, List
-import numpy as np
 
 
 class TemporalGenerator:
     """Generate temporally consistent dates and times."""
 
-    def __init__(self, start_date: datetime, end_date: datetime, seed: int = 42):
+    def __init__(self, start_date: datetime, end_date: datetime, seed: int = 42,
+                 calendar=None):
         self.start_date = start_date
         self.end_date = end_date
-        self.rng = np.random.RandomState(seed)
+        # BusinessCalendar; the configured default is built on first use
+        self._calendar = calendar
+
+        self.reseed(seed)
+
+    def reseed(self, seed: int):
+        """Restart the random stream from a new seed."""
+        # Imported on first use to keep module import cheap
+        import numpy as np
+        from src.utils.seeding import numpy_seed
+        self.rng = np.random.RandomState(numpy_seed(seed))
+
+    @property
+    def calendar(self):
+        """Working days and hours (see src.utils.business_calendar)."""
+        if self._calendar is None:
+            from src.utils.business_calendar import default_calendar
+            self._calendar = default_calendar()
+        return self._calendar
 
     # ------------------------------------------------------------------
     # Core helpers
@@ -41,13 +59,12 @@ class TemporalGenerator:
         end: datetime,
         avoid_weekends: bool = True
     ) -> datetime:
-        """Generate random date, optionally avoiding weekends."""
+        """Generate random date, optionally avoiding weekends and holidays."""
         date = self.random_date_in_range(start, end)
 
         if avoid_weekends and self.rng.random() < 0.85:
-            # Push forward to next weekday if needed
-            while date.weekday() >= 5:
-                date += timedelta(days=1)
+            # Push forward to the next working day if needed
+            date = self.calendar.next_business_datetime(date)
 
             # Never exceed simulation end
             if date > self.end_date:
@@ -158,8 +175,8 @@ class TemporalGenerator:
     # ------------------------------------------------------------------
 
     def generate_workday_time(self, date: datetime) -> datetime:
-        """Generate time during work hours (9 AM – 6 PM)."""
-        hour = self.rng.randint(9, 19)
+        """Generate a time during work hours (Config.WORK_HOURS distribution)."""
+        hour = self.calendar.work_hour(self.rng.random_sample())
         minute = self.rng.randint(0, 60)
 
         return date.replace(
@@ -169,6 +186,16 @@ class TemporalGenerator:
             microsecond=0
         )
 
+    def random_business_datetimes(self, start: datetime, end: datetime, size: int,
+                                  time_zones=None):
+        """
+        ``size`` working timestamps in one vectorized call (``datetime64[us]``).
+
+        See :meth:`BusinessCalendar.random_datetimes`; ``time_zones`` (one
+        or per timestamp) converts local work hours to UTC.
+        """
+        return self.calendar.random_datetimes(self.rng, start, end, size, time_zones)
+
     # ------------------------------------------------------------------
     # Sprints
     # ------------------------------------------------------------------
@@ -0,0 +1,92 @@
+"""Pick batch sizes and worker counts from the scale preset and host."""
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Approximate in-memory footprint of one generated task row, in bytes
+ROW_BYTES = 2048
+
+# Share of available RAM a single in-flight batch may use
+BATCH_MEMORY_FRACTION = 0.02
+
+MIN_CHUNK_ROWS = 1_000
+MAX_CHUNK_ROWS = 200_000
+
+# Batches per commit
+BATCHES_PER_COMMIT = 4
+
+
+@dataclass
+class BatchPlan:
+    """Batching and parallelism settings for a generation run."""
+    chunk_rows: int
+    commit_interval_rows: int
+    workers: int
+
+
+def available_memory_bytes() -> Optional[int]:
+    """Physical memory currently available, where the OS reports it."""
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def plan_batches(preset: dict, available_bytes: Optional[int] = None,
+                 cpu_count: Optional[int] = None) -> BatchPlan:
+    """
+    Derive a batch plan from a scale preset and the host resources.
+
+    Chunks are sized so one batch uses a small, fixed share of available
+    RAM; workers leave one core for the writer and are capped per preset.
+    """
+    available_bytes = available_bytes or available_memory_bytes() or 4 * 1024 ** 3
+    cpu_count = cpu_count or os.cpu_count() or 1
+
+    chunk_rows = int(available_bytes * BATCH_MEMORY_FRACTION / ROW_BYTES)
+    chunk_rows = max(MIN_CHUNK_ROWS, min(MAX_CHUNK_ROWS, chunk_rows))
+    workers = max(1, min(preset['max_workers'], cpu_count - 1))
+
+    plan = BatchPlan(
+        chunk_rows=chunk_rows,
+        commit_interval_rows=chunk_rows * BATCHES_PER_COMMIT,
+        workers=workers,
+    )
+    logger.info(
+        f"Batch plan: {plan.chunk_rows:,} rows/chunk, commit every "
+        f"{plan.commit_interval_rows:,} rows, {plan.workers} workers"
+    )
+    return plan
+
+
+def map_in_workers(fn: Callable, items: Iterable, workers: int,
+                   initializer: Optional[Callable] = None, initargs: tuple = ()) -> Iterator:
+    """
+    ``map(fn, items)`` across ``workers`` processes, results in input order.
+
+    With one worker this is the plain built-in map in this process.
+    Otherwise at most ``2 * workers`` items are in flight, so results never
+    pile up faster than the caller consumes them. Workers are spawned
+    rather than forked because the caller may have a writer thread
+    running; ``initializer`` runs once in each of them.
+    """
+    if workers <= 1:
+        yield from map(fn, items)
+        return
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -1,117 +1,262 @@
 """Validation utilities for checking data quality."""
+import argparse
+import json
 import sqlite3
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
 
-def validate_database(db_path: str):
+# Allow running as a script (python src/utils/validate.py) as well as with -m
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.utils.database import is_duckdb_file
+from src.utils.schema_info import load_schema, read_schema
+
+# Aggregate expressions evaluated in the single scan of each table.
+# Every table additionally gets a row count and one orphan counter per FK.
+TABLE_METRICS = {
+    'tasks': {
+        'invalid_completions': "SUM(completed = 1 AND completed_at < created_at)",
+        'modified_before_created': "SUM(modified_at < created_at)",
+        'placeholder_names': "SUM(name LIKE 'Task %' AND name GLOB 'Task [0-9]*')",
+        'assigned': "SUM(assignee_id IS NOT NULL)",
+        'completed': "SUM(completed = 1)",
+    },
+    'projects': {
+        'due_before_created': "SUM(due_date IS NOT NULL AND due_date < created_at)",
+    },
+}
+
+
+@dataclass
+class CheckResult:
+    """Outcome of a single validation check."""
+    name: str
+    table: str
+    passed: bool
+    message: str
+    value: Optional[float] = None
+    duration_ms: float = 0.0
+
+
+@dataclass
+class TableScan:
+    """Metrics gathered by the merged aggregate query of one table."""
+    table: str
+    metrics: Dict[str, int] = field(default_factory=dict)
+    duration_ms: float = 0.0
+
+
+@dataclass
+class Check:
+    """A pass/fail rule evaluated on the metrics of one table scan."""
+    name: str
+    table: str
+    evaluate: Callable[[Dict[str, int]], Tuple[bool, str, Optional[float]]]
+
+
+def _count_is_zero(metric: str, ok: str, fail: str):
+    def evaluate(m):
+        value = m[metric] or 0
+        if value == 0:
+            return True, ok, value
+        return False, fail.format(value), value
+    return evaluate
+
+
+def _rate_between(metric: str, low: float, high: float, label: str, expected: str):
+    def evaluate(m):
+        total = m['row_count']
+        rate = (m[metric] or 0) / total if total > 0 else 0
+        return low <= rate <= high, f"{label} is {rate:.2%} (expected: {expected})", rate
+    return evaluate
+
+
+BUILTIN_CHECKS = [
+    Check('temporal_consistency', 'tasks', _count_is_zero(
+        'invalid_completions',
+        "All completed tasks have completed_at >= created_at",
+        "{} tasks have completed_at < created_at")),
+    Check('modified_after_created', 'tasks', _count_is_zero(
+        'modified_before_created',
+        "All tasks have modified_at >= created_at",
+        "{} tasks have modified_at < created_at")),
+    Check('placeholder_names', 'tasks', _count_is_zero(
+        'placeholder_names',
+        "No placeholder task names found",
+        "{} tasks have placeholder names")),
+    Check('assignment_rate', 'tasks', _rate_between(
+        'assigned', 0.80, 0.90, "Task assignment rate", "85%")),
+    Check('completion_rate', 'tasks', _rate_between(
+        'completed', 0.50, 0.85, "Task completion rate", "50-85%")),
+    Check('project_due_dates', 'projects', _count_is_zero(
+        'due_before_created',
+        "All project due dates are on or after creation",
+        "{} projects are due before they were created")),
+]
+
+
+class ValidationEngine:
+    """
+    Validate a generated database with one aggregate scan per table.
+
+    Checks on the same table are merged into a single SELECT, foreign keys
+    are discovered from the database schema itself, and tables are scanned
+    concurrently on separate read-only connections.
+
+    DuckDB files (``--backend duckdb``) are scanned with the same SQL; their
+    foreign keys come from ``schema.sql``, which they are always built from.
+    """
+
+    def __init__(self, db_path: str, workers: int = 4,
+                 checks: Optional[List[Check]] = None):
+        self.db_path = db_path
+        self.workers = workers
+        self.checks = list(BUILTIN_CHECKS if checks is None else checks)
+        self.duckdb = is_duckdb_file(db_path)
+
+    def _connect(self):
+        if self.duckdb:
+            import duckdb
+            return duckdb.connect(self.db_path, read_only=True)
+        return sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+
+    def _discover(self) -> Dict[str, List[Tuple[str, str, str]]]:
+        """Return every table with its (column, ref_table, ref_column) foreign keys."""
+        conn = self._connect()
+        try:
+            if self.duckdb:
+                existing = {row[0] for row in conn.execute(
+                    "SELECT table_name FROM information_schema.tables").fetchall()}
+                return {
+                    table: [(fk.column, fk.ref_table, fk.ref_column) for fk in info.foreign_keys]
+                    for table, info in load_schema().items() if table in existing
+                }
+            # Logical tables, so dictionary-encoded ones are checked through their views
+            return {
+                table: [(fk.column, fk.ref_table, fk.ref_column) for fk in info.foreign_keys]
+                for table, info in read_schema(conn).items()
+            }
+        finally:
+            conn.close()
+
+    def _build_query(self, table: str, foreign_keys: List[Tuple[str, str, str]]) -> Tuple[str, List[str]]:
+        """Merge every metric of a table into one aggregate SELECT."""
+        names = ['row_count']
+        expressions = ['COUNT(*)']
+
+        for name, expression in TABLE_METRICS.get(table, {}).items():
+            names.append(name)
+            expressions.append(expression)
+
+        for column, ref_table, ref_column in foreign_keys:
+            names.append(f"orphan_{column}")
+            expressions.append(
+                f"SUM(t.{column} IS NOT NULL AND NOT EXISTS "
+                f"(SELECT 1 FROM {ref_table} r WHERE r.{ref_column} = t.{column}))"
+            )
+
+        return f"SELECT {', '.join(expressions)} FROM {table} t", names
+
+    def _scan(self, table: str, foreign_keys: List[Tuple[str, str, str]]) -> TableScan:
+        sql, names = self._build_query(table, foreign_keys)
+        conn = self._connect()
+        try:
+            start = time.perf_counter()
+            values = conn.execute(sql).fetchone()
+            duration_ms = (time.perf_counter() - start) * 1000
+        finally:
+            conn.close()
+        return TableScan(table, dict(zip(names, values)), duration_ms)
+
+    def run(self) -> Dict:
+        """Run all checks and return a machine-readable report."""
+        start = time.perf_counter()
+        schema = self._discover()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                table: pool.submit(self._scan, table, fks)
+                for table, fks in schema.items()
+            }
+            scans = {table: future.result() for table, future in futures.items()}
+
+        results = []
+        for check in self.checks:
+            scan = scans.get(check.table)
+            if scan is None:
+                results.append(CheckResult(check.name, check.table, False,
+                                           f"Table {check.table} not found"))
+                continue
+            passed, message, value = check.evaluate(scan.metrics)
+            results.append(CheckResult(check.name, check.table, passed, message,
+                                       value, scan.duration_ms))
+
+        for table, fks in schema.items():
+            scan = scans[table]
+            for column, ref_table, ref_column in fks:
+                orphans = scan.metrics[f"orphan_{column}"] or 0
+                if orphans == 0:
+                    message = f"All {table}.{column} values exist in {ref_table}.{ref_column}"
+                else:
+                    message = f"{orphans} {table}.{column} values have no matching {ref_table} row"
+                results.append(CheckResult(f"fk_{table}_{column}", table, orphans == 0,
+                                           message, orphans, scan.duration_ms))
+
+        return {
+            'database': self.db_path,
+            'passed': sum(r.passed for r in results),
+            'failed': sum(not r.passed for r in results),
+            'duration_ms': (time.perf_counter() - start) * 1000,
+            'tables': {
+                table: {'rows': scan.metrics['row_count'], 'duration_ms': scan.duration_ms}
+                for table, scan in scans.items()
+            },
+            'checks': [asdict(r) for r in results],
+        }
+
+
+def validate_database(db_path: str, workers: int = 4, report_path: Optional[str] = None):
     """Run validation checks on generated database."""
-    
+
     print("=" * 80)
     print("VALIDATION REPORT")
     print("=" * 80)
-    
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    checks_passed = 0
-    checks_failed = 0
-    
-    # Check 1: Temporal consistency - tasks
-    print("\n1. Checking temporal consistency (tasks)...")
-    cursor.execute("""
-        SELECT COUNT(*) FROM tasks 
-        WHERE completed = 1 AND completed_at < created_at
-    """)
-    invalid_completions = cursor.fetchone()[0]
-    
-    if invalid_completions == 0:
-        print("   ✓ PASS: All completed tasks have completed_at >= created_at")
-        checks_passed += 1
-    else:
-        print(f"   ✗ FAIL: {invalid_completions} tasks have completed_at < created_at")
-        checks_failed += 1
-        
-    # Check 2: Relational integrity - task assignments
-    print("\n2. Checking relational integrity (task assignments)...")
-    cursor.execute("""
-        SELECT COUNT(*) FROM tasks t
-        LEFT JOIN users u ON t.assignee_id = u.user_id
-        WHERE t.assignee_id IS NOT NULL AND u.user_id IS NULL
-    """)
-    orphaned_assignments = cursor.fetchone()[0]
-    
-    if orphaned_assignments == 0:
-        print("   ✓ PASS: All task assignees exist in users table")
-        checks_passed += 1
-    else:
-        print(f"   ✗ FAIL: {orphaned_assignments} tasks assigned to non-existent users")
-        checks_failed += 1
-        
-    # Check 3: Business logic - no "Task 1" patterns
-    print("\n3. Checking for placeholder task names...")
-    cursor.execute("""
-        SELECT COUNT(*) FROM tasks 
-        WHERE name LIKE 'Task %' AND name GLOB 'Task [0-9]*'
-    """)
-    placeholder_tasks = cursor.fetchone()[0]
-    
-    if placeholder_tasks == 0:
-        print("   ✓ PASS: No placeholder task names found")
-        checks_passed += 1
-    else:
-        print(f"   ✗ FAIL: {placeholder_tasks} tasks have placeholder names")
-        checks_failed += 1
-        
-    # Check 4: Distribution check - task assignment rate
-    print("\n4. Checking task assignment distribution...")
-    cursor.execute("SELECT COUNT(*) FROM tasks WHERE assignee_id IS NOT NULL")
-    assigned = cursor.fetchone()[0]
-    cursor.execute("SELECT COUNT(*) FROM tasks")
-    total = cursor.fetchone()[0]
-    
-    assignment_rate = assigned / total if total > 0 else 0
-    
-    if 0.80 <= assignment_rate <= 0.90:
-        print(f"   ✓ PASS: Task assignment rate is {assignment_rate:.2%} (expected: 85%)")
-        checks_passed += 1
-    else:
-        print(f"   ✗ FAIL: Task assignment rate is {assignment_rate:.2%} (expected: 85%)")
-        checks_failed += 1
-        
-    # Check 5: Completion rate reasonableness
-    print("\n5. Checking task completion distribution...")
-    cursor.execute("SELECT COUNT(*) FROM tasks WHERE completed = 1")
-    completed = cursor.fetchone()[0]
-    
-    completion_rate = completed / total if total > 0 else 0
-    
-    if 0.50 <= completion_rate <= 0.85:
-        print(f"   ✓ PASS: Task completion rate is {completion_rate:.2%} (expected: 50-85%)")
-        checks_passed += 1
-    else:
-        print(f"   ✗ FAIL: Task completion rate is {completion_rate:.2%} (expected: 50-85%)")
-        checks_failed += 1
-        
+
+    report = ValidationEngine(db_path, workers=workers).run()
+
+    for i, check in enumerate(report['checks'], 1):
+        status = "✓ PASS" if check['passed'] else "✗ FAIL"
+        print(f"\n{i}. {check['name']} ({check['table']}, {check['duration_ms']:.1f} ms)")
+        print(f"   {status}: {check['message']}")
+
     # Summary
     print("\n" + "=" * 80)
-    print(f"VALIDATION SUMMARY: {checks_passed} passed, {checks_failed} failed")
+    print(f"VALIDATION SUMMARY: {report['passed']} passed, {report['failed']} failed "
+          f"in {report['duration_ms']:.0f} ms")
     print("=" * 80)
-    
-    conn.close()
-    
-    return checks_failed == 0
+
+    if report_path:
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {report_path}")
+
+    return report['failed'] == 0
+
 
 if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print("Usage: python validate.py <database_path>")
-        sys.exit(1)
-        
-    db_path = sys.argv[1]
-    
-    if not Path(db_path).exists():
-        print(f"Error: Database not found: {db_path}")
+    parser = argparse.ArgumentParser(description='Validate a generated Asana database')
+    parser.add_argument('db_path', help='Database path')
+    parser.add_argument('--json', dest='report_path', help='Write a JSON report to this path')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent table scans')
+    args = parser.parse_args()
+
+    if not Path(args.db_path).exists():
+        print(f"Error: Database not found: {args.db_path}")
         sys.exit(1)
-        
-    success = validate_database(db_path)
-    sys.exit(0 if success else 1)
\ No newline at end of file
+
+    success = validate_database(args.db_path, workers=args.workers, report_path=args.report_path)
+    sys.exit(0 if success else 1)
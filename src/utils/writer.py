@@ -0,0 +1,150 @@
+"""Pipelined writes: a background thread drains row batches into the database.
+
+:class:`PipelinedBackend` wraps a storage backend. ``append_*`` and
+``commit`` calls are queued and return immediately, and a dedicated
+writer thread applies them in order, so generation continues while
+SQLite inserts and commits. SQLite releases the GIL while it steps
+statements, which is where the I/O and B-tree work happens.
+
+The queue is bounded: when the writer falls behind, the producer blocks
+(backpressure) instead of buffering without limit. Any other backend
+access first waits for the queue to drain, so the connection is only
+ever used by one thread at a time. A failure in the writer is re-raised
+on the producing thread as :class:`WriterError` at its next call.
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriterError(RuntimeError):
+    """The background writer failed; raised on the producing thread."""
+
+
+class PipelinedBackend:
+    """Storage backend proxy whose writes run on a background thread."""
+
+    def __init__(self, db, max_batches: int = 8):
+        self.db = db
+        # The writer thread uses the connection opened by the caller's thread
+        db.check_same_thread = False
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_batches)
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._reported = False
+
+        # Backpressure metrics
+        self.batches = 0
+        self.rows = 0
+        self.max_depth = 0
+        self.producer_blocked_seconds = 0.0
+        self.writer_busy_seconds = 0.0
+        self.writer_idle_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            idle_start = time.perf_counter()
+            item = self._queue.get()
+            busy_start = time.perf_counter()
+            self.writer_idle_seconds += busy_start - idle_start
+            try:
+                if item is _STOP:
+                    return
+                # After a failure, keep draining so the producer never blocks forever
+                if self._error is None:
+                    name, args = item
+                    getattr(self.db, name)(*args)
+            except BaseException as e:
+                self._error = e
+                logger.error(f"Background writer failed: {e}")
+            finally:
+                self.writer_busy_seconds += time.perf_counter() - busy_start
+                self._queue.task_done()
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            self._reported = True
+            raise WriterError(f"Background writer failed: {self._error}") from self._error
+
+    def _put(self, name: str, args: tuple):
+        self._raise_if_failed()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+            self._thread.start()
+
+        start = time.perf_counter()
+        self._queue.put((name, args))
+        self.producer_blocked_seconds += time.perf_counter() - start
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def flush(self):
+        """Wait until every queued call has been applied."""
+        if self._thread is not None:
+            self._queue.join()
+        self._raise_if_failed()
+
+    # ------------------------------------------------------------------
+    # Backend interface
+    # ------------------------------------------------------------------
+
+    def append(self, table: str, rows):
+        if rows:
+            self.batches += 1
+            self.rows += len(rows)
+            self._put('append', (table, rows))
+
+    def append_tuples(self, table: str, columns, rows):
+        if rows:
+            self.batches += 1
+            self.rows += len(rows)
+            self._put('append_tuples', (table, columns, rows))
+
+    def append_entities(self, table: str, entities):
+        """Queue model entities; they must not be modified after this call."""
+        if entities:
+            self.batches += 1
+            self.rows += len(entities)
+            self._put('append_entities', (table, entities))
+
+    def commit(self):
+        self._put('commit', ())
+
+    def close(self):
+        """Stop the writer thread and close the backend."""
+        try:
+            if self._thread is not None:
+                self._queue.put(_STOP)
+                self._thread.join()
+                self._thread = None
+            # Surface a failure nobody has seen yet
+            if self._error is not None and not self._reported:
+                self._raise_if_failed()
+        finally:
+            self.db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Backpressure metrics for the performance report."""
+        return {
+            'queue_capacity': self._queue.maxsize,
+            'batches': self.batches,
+            'rows': self.rows,
+            'max_queue_depth': self.max_depth,
+            'producer_blocked_seconds': round(self.producer_blocked_seconds, 3),
+            'writer_busy_seconds': round(self.writer_busy_seconds, 3),
+            'writer_idle_seconds': round(self.writer_idle_seconds, 3),
+        }
+
+    def __getattr__(self, name: str):
+        # Anything else (queries, counters, finalize steps) sees a drained queue
+        self.flush()
+        return getattr(self.db, name)
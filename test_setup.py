@@ -1,7 +1,56 @@
 """Quick test to verify setup is correct."""
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 
+# Cold-start budget for `import src.main`, in seconds
+IMPORT_TIME_BUDGET = float(os.getenv('IMPORT_TIME_BUDGET', 0.25))
+
+# Heavy or optional dependencies that must only load on first use
+LAZY_MODULES = ['numpy', 'requests', 'bs4', 'openai', 'pyarrow', 'duckdb']
+
+def _check(condition, message):
+    """Print one ✓/✗ line and return the condition."""
+    print(f"  {'✓' if condition else '✗'} {message}")
+    return bool(condition)
+
+# Small, fixed-window database shared by the behavior tests
+GENERATION_ENV = {
+    'SCALE_PRESET': 'small',
+    'COMPANY_SIZE': '1500',
+    'SIMULATION_START_DATE': '2023-07-01',
+    'SIMULATION_END_DATE': '2024-06-30',
+}
+
+_workdir = tempfile.TemporaryDirectory()
+
+@lru_cache(maxsize=None)
+def _generated_database():
+    """Generate (once) a small sealed database with summary tables; returns its path."""
+    db_path = str(Path(_workdir.name) / 'generated.sqlite')
+    result = subprocess.run(
+        [sys.executable, 'src/main.py', '--summaries'],
+        cwd=str(Path(__file__).parent), capture_output=True, text=True,
+        env={**os.environ, **GENERATION_ENV, 'DATABASE_PATH': db_path}
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return db_path
+
+def _run(test_fn):
+    """Run a test for the summary; failed assertions count as a failure."""
+    try:
+        return test_fn()
+    except AssertionError:
+        return False
+
 def test_imports():
     """Test that all required modules can be imported."""
     print("Testing imports...")
@@ -98,6 +147,297 @@ def test_basic_generation():
         print(f"  ✗ Generation failed: {e}")
         return False
 
+def test_import_time():
+    """Test that importing the entry point stays within the cold-start budget."""
+    print("\nTesting import time...")
+    
+    code = (
+        "import sys, time; start = time.perf_counter(); import src.main; "
+        "print(time.perf_counter() - start); "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    
+    # Best of three fresh interpreters
+    timings = []
+    loaded = []
+    for _ in range(3):
+        result = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=str(Path(__file__).parent), capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            print(f"  ✗ Import failed: {result.stderr.strip()}")
+        assert result.returncode == 0, result.stderr
+        lines = result.stdout.splitlines()
+        timings.append(float(lines[0]))
+        loaded = lines[1].split(',') if len(lines) > 1 and lines[1] else []
+        
+    best = min(timings)
+    passed = _check(best <= IMPORT_TIME_BUDGET,
+                    f"import src.main took {best * 1000:.0f} ms "
+                    f"(budget {IMPORT_TIME_BUDGET * 1000:.0f} ms)")
+    passed &= _check(not loaded, f"Loaded eagerly: {', '.join(loaded)}" if loaded
+                     else "No heavy dependencies loaded at import")
+    
+    assert passed
+    return passed
+
+def test_memory_budget_spill():
+    """Test that an in-memory build over its memory budget continues on disk."""
+    print("\nTesting memory budget spill...")
+    
+    from src.utils.database import Database
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / 'spill.sqlite')
+        db = Database(db_path, in_memory=True, memory_budget_mb=1)
+        db.connect()
+        db.initialize_schema('schema.sql')
+        
+        # Each batch is about 0.5 MB; the second commit crosses the budget
+        for batch in range(3):
+            db.append_tuples('organizations', ['organization_id', 'name', 'domain', 'created_at'],
+                             [(f"org-{batch}-{i}", 'x' * 500, f"org-{batch}-{i}.example.com",
+                               '2024-01-01T00:00:00') for i in range(1000)])
+            db.commit()
+        
+        passed = True
+        
+        passed &= _check(not db.in_memory, "Build moved to disk after exceeding the budget")
+        passed &= _check(Path(db_path).exists(), f"Spilled to {Path(db_path).name}")
+        count = db.query("SELECT COUNT(*) FROM organizations")[0][0]
+        passed &= _check(count == 3000, f"All {count} rows kept across the spill")
+        passed &= _check(db.get_stats()['organizations'] == 3000, "Row counter kept across the spill")
+        db.close()
+    
+    assert passed
+    return passed
+
+def test_validation_engine():
+    """Test that the merged per-table scans report what direct queries find."""
+    print("\nTesting validation engine...")
+    
+    from src.utils.validate import ValidationEngine
+    
+    db_path = _generated_database()
+    report = ValidationEngine(db_path, workers=4).run()
+    passed = _check(report['failed'] == 0, f"Generated database passes all {report['passed']} checks")
+    
+    conn = sqlite3.connect(db_path)
+    counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+              for table in report['tables']}
+    conn.close()
+    passed &= _check(all(report['tables'][t]['rows'] == counts[t] for t in counts),
+                     f"Row counts of {len(counts)} tables match COUNT(*)")
+    
+    # Break one foreign key and one date invariant in a copy
+    broken = str(Path(_workdir.name) / 'broken.sqlite')
+    shutil.copyfile(db_path, broken)
+    conn = sqlite3.connect(broken)
+    conn.execute("UPDATE tasks SET project_id = 'missing' "
+                 "WHERE rowid = (SELECT MIN(rowid) FROM tasks)")
+    conn.execute("UPDATE tasks SET completed = 1, completed_at = '2000-01-01T00:00:00' "
+                 "WHERE rowid = (SELECT MAX(rowid) FROM tasks)")
+    conn.commit()
+    conn.close()
+    
+    checks = {c['name']: c for c in ValidationEngine(broken, workers=4).run()['checks']}
+    failed = sorted(name for name, c in checks.items() if not c['passed'])
+    fk = checks['fk_tasks_project_id']
+    passed &= _check(not fk['passed'] and fk['value'] == 1, "Orphaned task project detected")
+    passed &= _check(len(failed) == 2, f"Exactly the broken invariants fail: {', '.join(failed)}")
+    
+    assert passed
+    return passed
+
+def test_invariant_quarantine():
+    """Test that quarantine mode diverts failing rows and the rows that reference them."""
+    print("\nTesting invariant quarantine...")
+    
+    from src.models.schema import Comment, Project, Task, Team, TeamMembership, User
+    from src.utils.invariants import InvariantChecker, InvariantViolation
+    
+    start = datetime(2024, 1, 1, 9)
+    end = datetime(2024, 6, 30)
+    team = Team(team_id='team-1')
+    users = [User(user_id=f"user-{i}", email=f"user{i}@example.com", created_at=start)
+             for i in range(3)]
+    duplicate = User(user_id='user-dup', email='user0@example.com', created_at=start)
+    project = Project(project_id='project-1', team_id=team.team_id, created_at=start)
+    good = Task(task_id='task-good', project_id=project.project_id, assignee_id='user-0',
+                created_at=start, modified_at=start)
+    bad = Task(task_id='task-bad', project_id=project.project_id, completed=True,
+               created_at=start, modified_at=start, completed_at=start - timedelta(days=1))
+    comments = [Comment(comment_id='comment-good', task_id=good.task_id, created_at=start),
+                Comment(comment_id='comment-cascade', task_id=bad.task_id, created_at=start)]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / 'quarantine.jsonl')
+        checker = InvariantChecker(mode='quarantine', quarantine_path=path, end_date=end)
+        kept = {
+            'users': checker.check('users', users + [duplicate]),
+            'team_memberships': checker.check('team_memberships', [
+                TeamMembership(team_id=team.team_id, user_id=u.user_id) for u in users]),
+            'projects': checker.check('projects', [project]),
+            'tasks': checker.check('tasks', [good, bad]),
+            'comments': checker.check('comments', comments),
+        }
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+    
+    keys = {'users': 'user_id', 'tasks': 'task_id', 'comments': 'comment_id'}
+    quarantined = {(r['table'], r['row'][keys[r['table']]]): r['violations'] for r in records}
+    passed = _check(len(kept['users']) == 3 and len(kept['tasks']) == 1 and len(kept['comments']) == 1,
+                    "Failing rows removed from their batches")
+    passed &= _check(quarantined.get(('users', 'user-dup')) == ['duplicate_email'],
+                     "Duplicate email written to the quarantine file")
+    passed &= _check(quarantined.get(('tasks', 'task-bad')) == ['completed_before_created'],
+                     "Task completed before creation written to the quarantine file")
+    passed &= _check(quarantined.get(('comments', 'comment-cascade')) == ['references_quarantined_task_id'],
+                     "Comment on the quarantined task cascaded")
+    passed &= _check(len(records) == 3 and checker.quarantined == 3,
+                     f"{len(records)} records, nothing else quarantined")
+    
+    checker = InvariantChecker(mode='fail', end_date=end)
+    try:
+        checker.check('tasks', [good, bad])
+        raised = False
+    except InvariantViolation as e:
+        raised = 'completed_before_created' in str(e)
+    passed &= _check(raised, "Fail mode raises InvariantViolation")
+    
+    assert passed
+    return passed
+
+def test_row_counters():
+    """Test that the maintained row counters equal COUNT(*), after generation and on append."""
+    print("\nTesting row counters...")
+    
+    from src.utils.database import STATS_TABLE, TABLES, Database
+    
+    conn = sqlite3.connect(_generated_database())
+    counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in TABLES}
+    stored = dict(conn.execute(f"SELECT table_name, row_count FROM {STATS_TABLE}").fetchall())
+    conn.close()
+    
+    mismatched = [t for t in TABLES if stored.get(t, 0) != counts[t]]
+    passed = _check(not mismatched, f"{STATS_TABLE} matches COUNT(*) for {len(TABLES)} tables"
+                    + (f" (differs: {', '.join(mismatched)})" if mismatched else ""))
+    passed &= _check(counts['tasks'] > 0, f"{counts['tasks']:,} tasks counted")
+    
+    db = Database(str(Path(_workdir.name) / 'counters.sqlite'))
+    db.connect()
+    db.initialize_schema('schema.sql')
+    columns = ['tag_id', 'organization_id', 'name', 'created_at']
+    db.append_tuples('tags', columns, [(f"tag-{i}", 'org', f"tag {i}", '2024-01-01T00:00:00') for i in range(5)])
+    db.commit()
+    db.append('tags', [dict(zip(columns, ('tag-5', 'org', 'tag 5', '2024-01-01T00:00:00')))])
+    db.commit()
+    
+    count = db.query("SELECT COUNT(*) FROM tags")[0][0]
+    stored = db.query(f"SELECT row_count FROM {STATS_TABLE} WHERE table_name = 'tags'")[0][0]
+    passed &= _check(db.get_stats()['tags'] == count == stored == 6,
+                     f"Appends keep get_stats() and {STATS_TABLE} equal to COUNT(*)")
+    passed &= _check(db.get_stats()['users'] == 0, "Untouched tables count zero")
+    db.close()
+    
+    assert passed
+    return passed
+
+def test_reader():
+    """Test that pooled reads and summary-table lookups match direct queries."""
+    print("\nTesting read layer...")
+    
+    from src.utils.reader import Reader, SectionCounts
+    
+    db_path = _generated_database()
+    reader = Reader(db_path, pool_size=2)
+    conn = sqlite3.connect(db_path)
+    try:
+        passed = _check(reader.summaries_as_of is not None, "Summary tables found")
+        as_of = datetime.fromisoformat(reader.summaries_as_of)
+        projects = [row[0] for row in conn.execute("SELECT project_id FROM projects")]
+        users = [row[0] for row in conn.execute("SELECT user_id FROM users")]
+        
+        # Summary lookups against the aggregate queries they replace
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            overviews = list(pool.map(reader.project_overview, projects))
+            loads = list(pool.map(reader.user_load, users))
+        passed &= _check(overviews == [reader.project_overview(p, as_of=as_of) for p in projects],
+                         f"project_overview matches for {len(projects)} projects")
+        passed &= _check(loads == [reader.user_load(u, as_of=as_of) for u in users],
+                         f"user_load matches for {len(users)} users")
+        
+        sql = ("SELECT s.section_id, s.name, COUNT(t.task_id), COALESCE(SUM(t.completed), 0) "
+               "FROM sections s LEFT JOIN tasks t ON t.section_id = s.section_id "
+               "WHERE s.project_id = ? GROUP BY s.section_id ORDER BY s.position")
+        direct = {p: [SectionCounts(*row) for row in conn.execute(sql, (p,))] for p in projects}
+        passed &= _check(all(reader.section_counts(p) == direct[p] for p in projects),
+                         "section_counts matches GROUP BY")
+        
+        # Access paths against plain queries
+        open_tasks = {u: {row[0] for row in conn.execute(
+            "SELECT task_id FROM tasks WHERE assignee_id = ? AND completed = 0", (u,))} for u in users}
+        listed = {u: {t.task_id for t in reader.tasks_for_assignee(u, limit=10_000)} for u in users}
+        passed &= _check(listed == open_tasks, "tasks_for_assignee returns each user's open tasks")
+        on_boards = sum(len(s.tasks) for p in projects for s in reader.section_board(p))
+        in_sections = conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE section_id IS NOT NULL").fetchone()[0]
+        passed &= _check(on_boards == in_sections, "section_board covers every task in a section")
+    finally:
+        conn.close()
+        reader.close()
+    
+    assert passed
+    return passed
+
+def test_snapshot_reset():
+    """Test that a snapshot reset restores the database byte for byte and clones are writable."""
+    print("\nTesting episode snapshots...")
+    
+    from src.utils.database import open_readonly, read_metadata
+    from src.utils.snapshots import HAS_DESERIALIZE, Snapshot
+    
+    db_path = _generated_database()
+    snapshot = Snapshot(db_path)
+    try:
+        conn = snapshot.clone()
+        before = conn.serialize() if HAS_DESERIALIZE else list(conn.iterdump())
+        tasks = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        
+        # An episode that writes to several tables
+        conn.execute("DELETE FROM comments")
+        conn.execute("UPDATE tasks SET name = 'changed'")
+        conn.execute("INSERT INTO tags (tag_id, organization_id, name, created_at) "
+                     "VALUES ('tag-episode', 'org', 'episode', '2024-01-01T00:00:00')")
+        conn.commit()
+        
+        snapshot.reset(conn)
+        after = conn.serialize() if HAS_DESERIALIZE else list(conn.iterdump())
+        passed = _check(after == before, "Reset restores the database byte for byte")
+        changed = conn.execute("SELECT COUNT(*) FROM tasks WHERE name = 'changed'").fetchone()[0]
+        passed &= _check(changed == 0 and tasks > 0, "Episode writes are gone after reset")
+        conn.close()
+        
+        target = str(Path(_workdir.name) / 'clone.sqlite')
+        method = snapshot.clone_to(target)
+        passed &= _check(read_metadata(db_path).get('immutable') == '1'
+                         and read_metadata(target).get('immutable') == '0',
+                         f"File clone ({method}) of the sealed database is not marked immutable")
+        writer = sqlite3.connect(target)
+        writer.execute("DELETE FROM tasks")
+        writer.commit()
+        writer.close()
+        reader = open_readonly(target)
+        passed &= _check(reader.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 0,
+                         "open_readonly sees writes to the clone")
+        reader.close()
+    finally:
+        snapshot.close()
+    
+    assert passed
+    return passed
+
 def main():
     """Run all tests."""
     print("=" * 60)
@@ -109,6 +449,13 @@ def main():
     results.append(("File Structure", test_file_structure()))
     results.append(("Imports", test_imports()))
     results.append(("Basic Generation", test_basic_generation()))
+    results.append(("Import Time", _run(test_import_time)))
+    results.append(("Memory Budget Spill", _run(test_memory_budget_spill)))
+    results.append(("Validation Engine", _run(test_validation_engine)))
+    results.append(("Invariant Quarantine", _run(test_invariant_quarantine)))
+    results.append(("Row Counters", _run(test_row_counters)))
+    results.append(("Read Layer", _run(test_reader)))
+    results.append(("Episode Snapshots", _run(test_snapshot_reset)))
     
     print("\n" + "=" * 60)
     print("TEST SUMMARY")